@@ -1,8 +1,56 @@
+import asyncio
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from app.core.llm_router import generate
+from app.analysis.clause_segmenter import segment_clauses
+from app.analysis.clause_tree import ClauseTree, build_clause_tree, find_section_references
 
 logger = logging.getLogger(__name__)
 
+# Characters of contract text sent to the model (LazyDocument.prefix() budget)
+CHAT_CHAR_BUDGET = 15000
+# Characters of each section the question names ("Clause 7.2(b)"), sent on top
+# of the budget so sections past the cut-off are still answerable
+CHAT_SECTION_CHAR_BUDGET = 3000
+# Clause trees kept for follow-up questions, keyed by a hash of the contract text
+CHAT_TREE_CACHE_SIZE = 16
+
+_tree_lock = threading.Lock()
+_trees: "OrderedDict[str, ClauseTree]" = OrderedDict()
+
+def _clause_tree(contract_text: str) -> ClauseTree:
+    """Clause tree of the contract; a chat asks many questions about one contract, so it is built once."""
+    key = hashlib.sha256(contract_text.encode("utf-8")).hexdigest()
+    with _tree_lock:
+        tree = _trees.get(key)
+        if tree is not None:
+            _trees.move_to_end(key)
+            return tree
+    tree = build_clause_tree(segment_clauses(contract_text))
+    with _tree_lock:
+        _trees[key] = tree
+        while len(_trees) > CHAT_TREE_CACHE_SIZE:
+            _trees.popitem(last=False)
+    return tree
+
+def _referenced_sections(contract_text: str, user_question: str) -> str:
+    """
+    Text of the sections the question cites, looked up in the clause tree's index.
+    Segments the contract on a miss: call it off the event loop.
+    """
+    references = find_section_references(user_question)
+    if not references:
+        return ""
+    tree = _clause_tree(contract_text)
+    sections = []
+    for reference in references:
+        node = tree.find(reference)  # A missing sub-clause ("7.2(z)") falls back to its section
+        if node is not None:
+            sections.append(f"[Section {node.number}]\n{node.text[:CHAT_SECTION_CHAR_BUDGET]}")
+    return "\n\n".join(sections)
+
 async def chat_about_contract(contract_text: str, user_question: str) -> dict:
     """
     Enhanced legal chatbot that can reason about ANY Indian contract type.
@@ -29,14 +77,21 @@ async def chat_about_contract(contract_text: str, user_question: str) -> dict:
     """
     
     # Truncate to fit context window
-    truncated_text = contract_text[:15000]
+    truncated_text = contract_text[:CHAT_CHAR_BUDGET]
+    
+    # Sections cited by number in the question, wherever they are in the contract
+    referenced = await asyncio.to_thread(_referenced_sections, contract_text, user_question)
+    referenced_block = f"""
+    REFERENCED SECTIONS:
+    {referenced}
+    """ if referenced else ""
     
     chat_prompt = f"""
     {SYSTEM_PROMPT}
     
     CONTRACT TEXT:
     {truncated_text}
-    
+    {referenced_block}
     USER QUESTION:
     {user_question}
     """
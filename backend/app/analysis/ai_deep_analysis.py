@@ -1,6 +1,9 @@
 from app.core.llm_router import generate
 import json
 
+# Characters of contract text sent to the model (LazyDocument.prefix() budget)
+DEEP_ANALYSIS_CHAR_BUDGET = 30000
+
 async def deep_analyze_contract(contract_text: str, rule_engine_flags: list) -> dict:
     """
     AI-powered deep contract analysis for contract types not well 
@@ -10,7 +13,7 @@ async def deep_analyze_contract(contract_text: str, rule_engine_flags: list) ->
     """
     
     # Truncate if needed
-    text = contract_text[:30000]
+    text = contract_text[:DEEP_ANALYSIS_CHAR_BUDGET]
     
     # Build context from existing flags
     existing_flags_text = ""
@@ -8,6 +8,9 @@ from app.core.llm_router import generate
 # SET TO True ONLY WHEN YOU WANT TO DEMO THE REAL AI
 USE_GEMINI_FOR_SUMMARY = True 
 
+# Characters of contract text sent to the model (LazyDocument.prefix() budget)
+SUMMARY_CHAR_BUDGET = 10000
+
 # --- PROMPTS ---
 SUMMARY_PROMPT = """
 You are a senior Indian Legal Expert. 
@@ -47,7 +50,7 @@ async def generate_summary(text: str) -> Dict:
 
     # --- REAL LLM LOGIC
     print("LLM Router: Requesting REAL Summary via Sarvam...")
-    safe_text = text[:10000] 
+    safe_text = text[:SUMMARY_CHAR_BUDGET] 
 
     try:
         prompt = SUMMARY_PROMPT.format(text=safe_text)
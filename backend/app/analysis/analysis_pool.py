@@ -0,0 +1,229 @@
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+from app.analysis.clause_segmenter import SEGMENT_PARALLEL_MIN_CHARS, segment_blocks, segment_clauses
+from app.analysis.document_buffer import DocumentBuffer
+from app.analysis.jurisdiction import detect_jurisdiction
+from app.analysis.pool_context import pool_context
+from app.analysis.prepared_document import PreparedDocument
+from app.analysis.rules.engine import build_engine_result, evaluate_clauses, evaluate_each_clause
+from app.analysis.rules.models import RuleEngineResult
+from app.analysis.rules.rule_pack import RULE_PACKS, PartialEvaluation, RulePack
+from app.analysis.schemas import Clause, JurisdictionResult, TextBlock
+from app.core.metrics import StageSample, collecting, record_samples
+
+# --- ANALYSIS POOL CONFIGURATION ---
+# Segmentation and the rule engine are CPU-bound, so /segment and /evaluate run
+# them on this process pool and await the result; the event loop keeps serving
+# other requests meanwhile. Contracts of more than ANALYSIS_SHARD_CLAUSES clauses
+# are evaluated in contiguous shards spread over the workers and merged in order
+# (document-wide rules, like obligation asymmetry, on counts summed over shards).
+# 0 workers runs the same steps on a thread of the server process instead.
+ANALYSIS_POOL_WORKERS = int(os.getenv("ANALYSIS_POOL_WORKERS", str(os.cpu_count() or 1)))
+ANALYSIS_SHARD_CLAUSES = int(os.getenv("ANALYSIS_SHARD_CLAUSES", "1000"))
+
+# (clause_id, clause_type, start, end): how clauses travel between processes
+ClauseRow = Tuple[str, str, int, int]
+# (clause_id, clause_type, text): scattered clauses, which share no window of the text
+ClauseText = Tuple[str, str, str]
+
+def _segment(prepared: PreparedDocument, blocks: Optional[List[TextBlock]], workers: Optional[int]) -> List[Clause]:
+    """Block-driven segmentation when the client sent blocks, text heuristics otherwise."""
+    if blocks:
+        return segment_blocks(blocks)
+    return segment_clauses(prepared, workers=workers)
+
+def _rows(clauses: List[Clause]) -> List[ClauseRow]:
+    return [(clause.clause_id, clause.clause_type, clause.start, clause.end) for clause in clauses]
+
+def _analyze_task(
+    text: str,
+    blocks: Optional[List[TextBlock]],
+    pack: Optional[RulePack],
+    evaluate_max_clauses: int,
+    skip_unsupported: bool = False
+) -> Tuple[JurisdictionResult, List[ClauseRow], Optional[bool], Optional[PartialEvaluation], List[StageSample]]:
+    """
+    Pool worker: jurisdiction and segmentation, plus the rule engine's clause
+    pass when `pack` is given and the contract has at most
+    `evaluate_max_clauses` clauses (larger ones are sharded by the caller).
+    Returns the clauses as rows and the buffer's `canonical`, so the server
+    rebuilds them over its own copy of the text, and the stage timings.
+    """
+    with collecting() as stages:
+        prepared = PreparedDocument(text)
+        jurisdiction = detect_jurisdiction(prepared)
+        if skip_unsupported and not (jurisdiction.supported or jurisdiction.jurisdiction == "Unknown"):
+            return jurisdiction, [], None, None, stages.samples
+        # One process per task: never fan out again from inside the pool
+        clauses = _segment(prepared, blocks, workers=1)
+        partial = None
+        if pack is not None and len(clauses) <= evaluate_max_clauses:
+            partial = evaluate_clauses(clauses, None if blocks else prepared, pack)
+    canonical = clauses[0].document.canonical if clauses else None
+    return jurisdiction, _rows(clauses), canonical, partial, stages.samples
+
+def _evaluate_shard_task(window: str, base: int, canonical: Optional[bool], rows: List[ClauseRow],
+                         pack: RulePack) -> Tuple[PartialEvaluation, List[StageSample]]:
+    """Pool worker: the rule engine's clause pass over one shard, a window of the document text."""
+    with collecting() as stages:
+        document = DocumentBuffer(window, canonical=canonical, base=base)
+        clauses = [Clause.span(clause_id, clause_type, document, start, end) for clause_id, clause_type, start, end in rows]
+        return evaluate_clauses(clauses, None, pack), stages.samples
+
+def _evaluate_each_task(items: List[ClauseText], pack: RulePack) -> Tuple[List[PartialEvaluation], List[StageSample]]:
+    """Pool worker: evaluate_each_clause() over clauses shipped with their text (revisions' changed clauses)."""
+    with collecting() as stages:
+        clauses = [Clause(clause_id=clause_id, clause_type=clause_type, text=text) for clause_id, clause_type, text in items]
+        return evaluate_each_clause(clauses, None, pack), stages.samples
+
+def _segment_in_process(text: str) -> Tuple[JurisdictionResult, List[ClauseRow], Optional[bool]]:
+    # Very long texts: segment_clauses() shards them over the segmentation pool itself
+    prepared = PreparedDocument(text)
+    jurisdiction = detect_jurisdiction(prepared)
+    clauses = segment_clauses(prepared)
+    return jurisdiction, _rows(clauses), prepared.buffer.canonical
+
+def _warm_worker() -> int:
+    # Importing this module (segmenter, rule engine, rule pack) is the worker's start-up cost
+    RULE_PACKS.current()
+    return os.getpid()
+
+def _shard_rows(rows: list, shards: int) -> list:
+    size = -(-len(rows) // shards)
+    return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+class AnalysisPool:
+    """
+    Process pool for the CPU-bound analysis pipeline (jurisdiction ->
+    segmentation -> rule engine). Results are identical to running the
+    pipeline in-process: clauses come back as offsets and are rebuilt over
+    the server's copy of the text, and shards merge in document order.
+    """
+
+    def __init__(self, workers: int, shard_clauses: int):
+        self.workers = workers
+        self.shard_clauses = shard_clauses
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned, not forked: the server's other threads may hold locks right now
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=pool_context())
+            return self._executor
+
+    def start(self):
+        """Creates the pool and starts its workers; called once at server startup."""
+        if self.workers <= 0:
+            return
+        executor = self._get_executor()
+        for future in [executor.submit(_warm_worker) for _ in range(self.workers)]:
+            future.result()
+
+    async def _run(self, fn, *args):
+        if self.workers <= 0:
+            return await asyncio.to_thread(fn, *args)
+        executor = self._get_executor()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(fn, *args))
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); the next request gets a fresh pool
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False)
+            raise
+
+    @staticmethod
+    def _clauses(source: str, rows: List[ClauseRow], canonical: Optional[bool]) -> List[Clause]:
+        # Over a buffer of the text the worker segmented: the contract, or its joined blocks
+        document = DocumentBuffer(source, canonical)
+        return [Clause.span(clause_id, clause_type, document, start, end) for clause_id, clause_type, start, end in rows]
+
+    @classmethod
+    def _finish(cls, source: str, rows: List[ClauseRow], canonical: Optional[bool], pack: RulePack,
+                partials: List[PartialEvaluation]) -> Tuple[List[Clause], RuleEngineResult]:
+        clauses = cls._clauses(source, rows, canonical)
+        return clauses, build_engine_result(clauses, pack, partials)
+
+    async def segment(self, text: str, blocks: Optional[List[TextBlock]] = None,
+                      skip_unsupported: bool = False) -> Tuple[JurisdictionResult, List[Clause]]:
+        """
+        Jurisdiction and clauses of a contract. With `skip_unsupported`, a
+        contract under a foreign jurisdiction is not segmented (no clauses).
+        """
+        if not blocks and len(text) >= SEGMENT_PARALLEL_MIN_CHARS:
+            jurisdiction, rows, canonical = await asyncio.to_thread(_segment_in_process, text)
+        else:
+            jurisdiction, rows, canonical, _, stages = await self._run(
+                _analyze_task, text, blocks, None, 0, skip_unsupported
+            )
+            record_samples(stages)
+        if skip_unsupported and not (jurisdiction.supported or jurisdiction.jurisdiction == "Unknown"):
+            return jurisdiction, []
+        source = "\n".join(block.text for block in blocks) if blocks else text
+        return jurisdiction, await asyncio.to_thread(self._clauses, source, rows, canonical)
+
+    async def evaluate(self, text: str, blocks: Optional[List[TextBlock]] = None,
+                       pack: Optional[RulePack] = None) -> Tuple[JurisdictionResult, List[Clause], RuleEngineResult]:
+        """
+        The /evaluate pipeline off the event loop: jurisdiction, clauses and
+        the rule engine result. Small contracts take one pool task; larger ones
+        are segmented first and then evaluated in shards.
+        """
+        if pack is None:
+            pack = RULE_PACKS.current()  # Taken once: every shard runs the same pack
+        partial = None
+        if not blocks and len(text) >= SEGMENT_PARALLEL_MIN_CHARS:
+            jurisdiction, rows, canonical = await asyncio.to_thread(_segment_in_process, text)
+        else:
+            jurisdiction, rows, canonical, partial, stages = await self._run(
+                _analyze_task, text, blocks, pack, self.shard_clauses
+            )
+            record_samples(stages)
+        source = "\n".join(block.text for block in blocks) if blocks else text
+
+        if partial is not None:
+            partials = [partial]
+        elif not rows:
+            partials = []
+        else:
+            shards = _shard_rows(rows, max(1, min(self.workers, -(-len(rows) // self.shard_clauses))))
+            partials = []
+            for partial, stages in await asyncio.gather(*(
+                self._run(_evaluate_shard_task, source[shard[0][2]:shard[-1][3]], shard[0][2], canonical, shard, pack)
+                for shard in shards
+            )):
+                partials.append(partial)
+                record_samples(stages)
+        # Rebuilding clauses and merging flags is per-clause work too: kept off the loop
+        clauses, result = await asyncio.to_thread(self._finish, source, rows, canonical, pack, partials)
+        return jurisdiction, clauses, result
+
+    async def evaluate_each(self, clauses: List[Clause], pack: RulePack) -> List[PartialEvaluation]:
+        """
+        evaluate_each_clause() off the event loop: one PartialEvaluation per
+        clause, in order. Clauses are spread over the workers in shards of
+        about `shard_clauses`, like evaluate().
+        """
+        if not clauses:
+            return []
+        items = [(clause.clause_id, clause.clause_type, clause.text) for clause in clauses]
+        shards = _shard_rows(items, max(1, min(self.workers, -(-len(items) // self.shard_clauses))))
+        partials = []
+        for shard_partials, stages in await asyncio.gather(*(
+            self._run(_evaluate_each_task, shard, pack) for shard in shards
+        )):
+            partials.extend(shard_partials)
+            record_samples(stages)
+        return partials
+
+# Shared by /segment and /evaluate in this process
+analysis_pool = AnalysisPool(ANALYSIS_POOL_WORKERS, ANALYSIS_SHARD_CLAUSES)
@@ -0,0 +1,145 @@
+import re
+from collections import Counter
+from typing import List, Optional
+
+import pdfplumber
+
+from app.analysis import docx_stream
+from app.analysis.clause_segmenter import is_heading_line
+from app.analysis.schemas import TextBlock, HEADING, PARAGRAPH, TABLE_CELL
+from app.analysis.text_extractor import DOCX_INCLUDE_HEADERS, ExtractionSource, _open_stream, _resolve_ext
+
+# Structure-preserving extraction: typed blocks (heading / paragraph / table cell)
+# with style and font-size hints, for segment_blocks().
+#
+# Headings come from layout where the document has it (DOCX heading styles /
+# outline levels, PDF lines set larger or bolder than the body text). Documents
+# with no layout headings at all fall back to the segmenter's text heuristic.
+
+# PDF line counts as a heading when its font is this much larger than the body font
+HEADING_SIZE_RATIO = 1.15
+# Headings are short; longer lines are body text whatever their font
+HEADING_MAX_CHARS = 100
+# Consecutive PDF lines merge into one paragraph unless the vertical gap exceeds
+# this fraction of the line height
+PARAGRAPH_GAP_RATIO = 0.8
+
+_SUBSET_PREFIX = re.compile(r"^[A-Z]{6}\+")  # Embedded font subsets: "ABCDEF+Arial-Bold"
+
+def _apply_text_headings(blocks: List[TextBlock]):
+    """Fallback for documents without layout headings: the segmenter's PASS 1 rule."""
+    for block in blocks:
+        if block.kind == PARAGRAPH and is_heading_line(block.text):
+            block.kind = HEADING
+
+def _docx_blocks(source: ExtractionSource) -> List[TextBlock]:
+    blocks: List[TextBlock] = []
+    has_layout_headings = False
+    for block in docx_stream.iter_docx_styled_blocks(source, include_headers=DOCX_INCLUDE_HEADERS):
+        text = block.text.strip()
+        if not text:
+            continue
+        if block.kind == docx_stream.TABLE_CELL:
+            kind = TABLE_CELL
+        elif block.kind == docx_stream.PARAGRAPH and block.outline_level is not None:
+            kind = HEADING
+            has_layout_headings = True
+        else:
+            kind = PARAGRAPH  # Body paragraphs, footnotes, headers
+        blocks.append(TextBlock(kind=kind, text=text, style=block.style, font_size=block.font_size))
+
+    if not has_layout_headings:
+        _apply_text_headings(blocks)
+    return blocks
+
+def _pdf_lines(source: ExtractionSource) -> List[dict]:
+    """Text lines with their dominant font, size, boldness and position, in page order."""
+    lines = []
+    with pdfplumber.open(_open_stream(source)) as pdf:
+        for number, page in enumerate(pdf.pages, 1):
+            for line in page.extract_text_lines(strip=True, return_chars=True):
+                chars = [c for c in line["chars"] if c["text"].strip()]
+                if not chars:
+                    continue
+                size, _ = Counter(round(c["size"], 1) for c in chars).most_common(1)[0]
+                font, _ = Counter(_SUBSET_PREFIX.sub("", c["fontname"]) for c in chars).most_common(1)[0]
+                lines.append({
+                    "page": number,
+                    "text": line["text"],
+                    "size": size,
+                    "font": font,
+                    "bold": all("bold" in c["fontname"].lower() for c in chars),
+                    "chars": len(chars),
+                    "top": line["top"],
+                    "bottom": line["bottom"]
+                })
+            page.close()  # Drops pdfplumber's per-page object cache
+    return lines
+
+def _pdf_blocks(source: ExtractionSource) -> List[TextBlock]:
+    lines = _pdf_lines(source)
+    if not lines:
+        return []
+
+    # Body font = the size / weight most characters are set in
+    size_counts, bold_chars = Counter(), 0
+    for line in lines:
+        size_counts[line["size"]] += line["chars"]
+        bold_chars += line["chars"] if line["bold"] else 0
+    body_size, _ = size_counts.most_common(1)[0]
+    body_is_bold = bold_chars * 2 > sum(size_counts.values())
+
+    blocks: List[TextBlock] = []
+    has_layout_headings = False
+    previous: Optional[dict] = None
+    for line in lines:
+        is_heading = len(line["text"]) < HEADING_MAX_CHARS and (
+            line["size"] >= body_size * HEADING_SIZE_RATIO or (line["bold"] and not body_is_bold)
+        )
+        if is_heading:
+            has_layout_headings = True
+            blocks.append(TextBlock(kind=HEADING, text=line["text"], style=line["font"],
+                                    font_size=line["size"], page=line["page"]))
+            previous = None
+            continue
+
+        # Continues the previous paragraph: same page, same font, small vertical gap
+        last = blocks[-1] if blocks else None
+        if (previous is not None and last is not None and last.kind == PARAGRAPH
+                and previous["page"] == line["page"] and previous["size"] == line["size"]
+                and line["top"] - previous["bottom"] <= PARAGRAPH_GAP_RATIO * (line["bottom"] - line["top"])):
+            last.text += "\n" + line["text"]
+        else:
+            blocks.append(TextBlock(kind=PARAGRAPH, text=line["text"], style=line["font"],
+                                    font_size=line["size"], page=line["page"]))
+        previous = line
+
+    if not has_layout_headings:
+        # Uniformly set PDF: split merged paragraphs back into lines for the text rule
+        blocks = [
+            TextBlock(kind=PARAGRAPH, text=text, style=block.style, font_size=block.font_size, page=block.page)
+            for block in blocks for text in block.text.split("\n")
+        ]
+        _apply_text_headings(blocks)
+    return blocks
+
+def extract_blocks(source: ExtractionSource, file_ext: Optional[str] = None) -> List[TextBlock]:
+    """
+    Extracts a PDF or DOCX as typed blocks in reading order.
+
+    PDF blocks always use pdfplumber, since pdfium's text path carries no font
+    metadata; prefer extract_text() when only the plain text is needed.
+
+    Raises:
+        ValueError: If file type is unsupported or no text is found.
+    """
+    ext = _resolve_ext(source, file_ext)
+    try:
+        blocks = _pdf_blocks(source) if ext == ".pdf" else _docx_blocks(source)
+    except Exception as e:
+        kind = "PDF" if ext == ".pdf" else "DOCX"
+        raise ValueError(f"Failed to process {kind}: {str(e)}")
+
+    if not blocks:
+        raise ValueError("No extractable text found")
+    return blocks
@@ -1,79 +1,263 @@
+import os
 import re
-from typing import List, Dict
-from app.analysis.schemas import Clause
-from app.analysis.clause_taxonomy import CLAUSE_KEYWORDS
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, List, Dict, Optional, Tuple, Union
+from app.analysis.schemas import Clause, TextBlock, HEADING
+from app.analysis.document_buffer import DocumentBuffer
+from app.analysis.prepared_document import PreparedDocument
+from app.analysis.clause_taxonomy import CLAUSE_MATCHER
+from app.analysis.pool_context import pool_context
+from app.core.metrics import timed
 
-def segment_clauses(text: str) -> List[Clause]:
+# regex for common contract headings: "1. Term", "ARTICLE I", "Section 2.1"
+# Or strict ALL CAPS line of short length
+HEADING_REGEX = re.compile(r"^(ARTICLE|SECTION|CLAUSE)?\s*[0-9]+(\.[0-9]+)*\.?\s+([A-Z\s]+)$", re.IGNORECASE)
+
+# --- PARALLEL SEGMENTATION CONFIGURATION ---
+# Very long documents (master agreement + annexures) are split at heading lines
+# into shards and segmented in a process pool. Shorter ones stay serial, since
+# shipping the shards to the workers costs more than it saves.
+SEGMENT_WORKERS = int(os.getenv("SEGMENT_WORKERS", str(os.cpu_count() or 1)))
+SEGMENT_PARALLEL_MIN_CHARS = int(os.getenv("SEGMENT_PARALLEL_MIN_CHARS", "2000000"))
+
+# Worker count -> pool. In the server only SEGMENT_WORKERS is ever used,
+# created at startup by start_segment_pool().
+_segment_pools: Dict[int, ProcessPoolExecutor] = {}
+_segment_pools_lock = threading.Lock()
+
+def is_heading_line(line: str) -> bool:
+    """PASS 1 heading test, for a stripped, non-empty line."""
+    # Heuristic: Short line + All Uppercase (at least 4 chars) usually a header
+    if line.isupper() and len(line) < 100 and len(line) > 3:
+        return True
+    return bool(HEADING_REGEX.match(line))
+
+def _heading_clause_type(line_lower: str) -> str:
+    """PASS 2 rule: first category (in taxonomy order) with a keyword in the heading."""
+    return CLAUSE_MATCHER.first_category(line_lower) or "Unclassified"
+
+def _scan_clause_type(line_lower: str) -> str:
+    """PASS 3 rule: last category (in taxonomy order) with a keyword in the line."""
+    return CLAUSE_MATCHER.last_category(line_lower) or "Unclassified"
+
+def _iter_clauses(
+    items: Iterable[Tuple[bool, int, int, str]],
+    document_for: Callable[[int, int], DocumentBuffer]
+) -> Iterator[Clause]:
     """
-    3-Pass Clause Segmentation Engine.
-    Deterministic, rule-based approach.
+    Groups (is_heading, start, end, line) items into clauses: each heading starts
+    a new clause, and closes (yields) the previous one. Clauses are spans of the
+    buffer document_for(start, end) returns; no line or clause text is kept.
     """
-    lines = text.split('\n')
-    clauses: List[Clause] = []
-    
-    current_clause_lines = []
+    current_clause_start = current_clause_end = None
     current_clause_type = "Unclassified"
     current_clause_index = 1
-    
-    # regex for common contract headings: "1. Term", "ARTICLE I", "Section 2.1"
-    # Or strict ALL CAPS line of short length
-    heading_regex = re.compile(r"^(ARTICLE|SECTION|CLAUSE)?\s*[0-9]+(\.[0-9]+)*\.?\s+([A-Z\s]+)$", re.IGNORECASE)
-
-    def flush_clause():
-        nonlocal current_clause_lines, current_clause_type, current_clause_index
-        if current_clause_lines:
-            full_text = "\n".join(current_clause_lines).strip()
-            if full_text:
-                clauses.append(Clause(
-                    clause_id=str(current_clause_index),
-                    clause_type=current_clause_type,
-                    text=full_text
-                ))
-                current_clause_index += 1
-            current_clause_lines = []
-            current_clause_type = "Unclassified"
 
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # PASS 1: Heading Detection
-        is_heading = False
-        # Heuristic: Short line + All Uppercase (at least 4 chars) usually a header
-        if line.isupper() and len(line) < 100 and len(line) > 3:
-            is_heading = True
-        elif heading_regex.match(line):
-            is_heading = True
-            
+    def make_clause() -> Clause:
+        return Clause.span(
+            str(current_clause_index), current_clause_type,
+            document_for(current_clause_start, current_clause_end),
+            current_clause_start, current_clause_end
+        )
+
+    for is_heading, start, end, line in items:
         if is_heading:
-            flush_clause()
-            current_clause_lines.append(line)
+            if current_clause_start is not None:
+                yield make_clause()
+                current_clause_index += 1
+            current_clause_start, current_clause_end = start, end
             
             # PASS 2: Keyword Anchoring (Immediate Type Assignment)
-            found_type = "Unclassified"
-            line_lower = line.lower()
-            for c_type, keywords in CLAUSE_KEYWORDS.items():
-                for kw in keywords:
-                    if kw in line_lower:
-                        found_type = c_type
-                        break
-                if found_type != "Unclassified":
-                    break
-            current_clause_type = found_type
+            current_clause_type = _heading_clause_type(line.lower())
             
         else:
             # PASS 3: Fallback Grouping (Scanning)
-            # If we are in the middle of a clause, append.
+            # If we are in the middle of a clause, extend it.
             # ALSO check keywords if type is still Unclassified (Lazy Classification)
-            current_clause_lines.append(line)
+            if current_clause_start is None:
+                current_clause_start = start
+            current_clause_end = end
             
             if current_clause_type == "Unclassified":
-                for c_type, keywords in CLAUSE_KEYWORDS.items():
-                    for kw in keywords:
-                        if kw in line.lower():
-                            current_clause_type = c_type
-                            break
+                current_clause_type = _scan_clause_type(line.lower())
+
+    if current_clause_start is not None:
+        yield make_clause() # Flush last buffer
+
+class _LineStream:
+    """
+    Lines of a chunked document ("".join(chunks)) with their offsets, holding
+    only the raw lines that the clause being built still needs.
+    """
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = chunks
+        self._held: Deque[Tuple[int, str]] = deque()  # (offset, raw line)
 
-    flush_clause() # Flush last buffer
+    def __iter__(self) -> Iterator[Tuple[int, int, str]]:
+        pos = 0
+        partial = ""  # A line split across chunks
+        for chunk in self._chunks:
+            lines = (partial + chunk).split("\n")
+            partial = lines.pop()
+            for raw in lines:
+                yield from self._line(pos, raw)
+                pos += len(raw) + 1
+        if partial:
+            yield from self._line(pos, partial)
+
+    def _line(self, pos: int, raw: str) -> Iterator[Tuple[int, int, str]]:
+        self._held.append((pos, raw))
+        stripped = raw.strip()
+        if stripped:
+            start = pos + raw.index(stripped[0])
+            yield start, start + len(stripped), stripped
+
+    def window(self, start: int, end: int) -> DocumentBuffer:
+        """Buffer over the held lines covering [start, end); releases those before `end`."""
+        held = self._held
+        while held and held[0][0] + len(held[0][1]) < start:
+            held.popleft()
+        base = held[0][0]
+        lines = []
+        while held and held[0][0] < end:
+            lines.append(held.popleft()[1])
+        return DocumentBuffer("\n".join(lines), base=base)
+
+@timed("segmentation")
+def segment_clauses(
+    text: Union[str, PreparedDocument],
+    workers: Optional[int] = None,
+    min_parallel_chars: Optional[int] = None
+) -> List[Clause]:
+    """
+    3-Pass Clause Segmentation Engine.
+    Deterministic, rule-based approach.
+    Clauses are offsets into `text` itself (see DocumentBuffer). Given a
+    PreparedDocument, they are spans of its buffer, so the rule layers can
+    slice their lowered text from it.
+
+    Args:
+        workers (int, optional): Processes for sharded segmentation of very
+            long texts. Defaults to SEGMENT_WORKERS.
+        min_parallel_chars (int, optional): Text length at which segmentation
+            goes parallel. Defaults to SEGMENT_PARALLEL_MIN_CHARS.
+    Output is identical for the serial and parallel paths.
+    """
+    if isinstance(text, PreparedDocument):
+        document, text = text.buffer, text.text
+    else:
+        document = DocumentBuffer(text)
+    workers = SEGMENT_WORKERS if workers is None else workers
+    min_parallel_chars = SEGMENT_PARALLEL_MIN_CHARS if min_parallel_chars is None else min_parallel_chars
+    if workers > 1 and len(text) >= min_parallel_chars:
+        bounds = _shard_bounds(text, workers)
+        if len(bounds) > 1:
+            return _segment_sharded(document, bounds, workers)
+
+    def items():
+        for start, end, line in document.iter_lines():
+            # PASS 1: Heading Detection
+            yield is_heading_line(line), start, end, line
+
+    return list(_iter_clauses(items(), lambda start, end: document))
+
+def _shard_bounds(text: str, shards: int) -> List[int]:
+    """
+    Start offsets of up to `shards` roughly equal shards. Every shard after the
+    first starts on a heading line, where serial segmentation starts a new
+    clause regardless of what came before, so shards segment independently.
+    """
+    bounds = [0]
+    for i in range(1, shards):
+        pos = text.find("\n", max(len(text) * i // shards, bounds[-1])) + 1
+        while pos > 0:
+            line_end = text.find("\n", pos)
+            line = text[pos:line_end if line_end != -1 else len(text)].strip()
+            if line and is_heading_line(line):
+                bounds.append(pos)
+                break
+            pos = line_end + 1  # 0 (stop) after the last line
+    return bounds
+
+def _segment_shard(shard: str) -> List[Tuple[str, int, int]]:
+    """Pool worker: (clause_type, start, end) of the shard's clauses, relative to the shard."""
+    clauses = segment_clauses(shard, workers=1)
+    return [(clause.clause_type, clause.start, clause.end) for clause in clauses]
+
+def _get_segment_pool(workers: int) -> ProcessPoolExecutor:
+    """Lazily creates the shared segmentation pool for a worker count."""
+    with _segment_pools_lock:
+        pool = _segment_pools.get(workers)
+        if pool is None:
+            # Spawned, not forked: the server's other threads may hold locks right now
+            pool = _segment_pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=pool_context())
+        return pool
+
+def start_segment_pool(workers: int = SEGMENT_WORKERS):
+    """Creates the shard segmentation pool and starts its workers; called once at server startup."""
+    if workers <= 1:
+        return
+    pool = _get_segment_pool(workers)
+    for future in [pool.submit(_segment_shard, "") for _ in range(workers)]:
+        future.result()
+
+def _segment_sharded(document: DocumentBuffer, bounds: List[int], workers: int) -> List[Clause]:
+    """Segments the shards in the pool and renumbers their clauses as one document."""
+    text = document.text
+    # Each shard stops before the "\n" that precedes the next shard's heading
+    ends = [bound - 1 for bound in bounds[1:]] + [len(text)]
+    shards = [text[start:end] for start, end in zip(bounds, ends)]
+    results = _get_segment_pool(workers).map(_segment_shard, shards)
+
+    clauses: List[Clause] = []
+    for base, shard_clauses in zip(bounds, results):
+        for clause_type, start, end in shard_clauses:
+            clauses.append(Clause.span(str(len(clauses) + 1), clause_type, document, base + start, base + end))
     return clauses
+
+def segment_clauses_iter(chunks: Iterable[str]) -> Iterator[Clause]:
+    """
+    Incremental segment_clauses(): consumes the document as chunks (lines with
+    their "\\n", pages from iter_page_chunks(), or any split of the text) and
+    yields each clause as soon as the next heading closes it.
+
+    Offsets are into "".join(chunks), and the clauses equal segment_clauses() on
+    that string. Each clause holds a buffer over its own lines only, so memory
+    stays flat however long the document is.
+    """
+    lines = _LineStream(chunks)
+
+    def items():
+        for start, end, line in lines:
+            # PASS 1: Heading Detection
+            yield is_heading_line(line), start, end, line
+
+    return _iter_clauses(items(), lines.window)
+
+@timed("segmentation")
+def segment_blocks(blocks: List[TextBlock]) -> List[Clause]:
+    """
+    Segmentation over typed blocks from extract_blocks(). Headings come from the
+    document's own structure (styles, font sizes), so PASS 1 is skipped; PASS 2
+    and 3 are unchanged. Table cells are grouped like paragraphs.
+    Clause offsets point into the block texts joined by "\n".
+    """
+    document = DocumentBuffer("\n".join(block.text for block in blocks))
+
+    def items():
+        offset = 0
+        for block in blocks:
+            block_start, block_end = offset, offset + len(block.text)
+            offset = block_end + 1
+            if block.kind == HEADING:
+                lines = list(document.iter_lines(block_start, block_end))
+                if lines:
+                    yield True, lines[0][0], lines[-1][1], block.text.strip()
+                continue
+            for start, end, line in document.iter_lines(block_start, block_end):
+                yield False, start, end, line
+
+    return list(_iter_clauses(items(), lambda start, end: document))
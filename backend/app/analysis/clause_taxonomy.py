@@ -1,6 +1,8 @@
 # Static Dictionary of Clause Keywords
 # This file is the "Legal Vocabulary" - deterministic and rule-based.
 
+from app.analysis.keyword_matcher import KeywordMatcher
+
 CLAUSE_KEYWORDS = {
     "Termination": ["terminate", "termination", "notice period", "termination for convenience", "termination for cause"],
     "Indemnification": ["indemnify", "indemnification", "hold harmless", "indemnity", "make good"],
@@ -14,3 +16,6 @@ CLAUSE_KEYWORDS = {
     "Payment Terms": ["payment", "invoice", "fees", "compensation", "billing"],
     "Term": ["term of agreement", "effective date", "duration", "initial term", "renewal"]
 }
+
+# Compiled once at import: classifies a line in a single scan (see KeywordMatcher)
+CLAUSE_MATCHER = KeywordMatcher(CLAUSE_KEYWORDS)
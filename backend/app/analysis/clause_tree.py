@@ -0,0 +1,241 @@
+import re
+from typing import Dict, Iterator, List, Optional
+
+from app.analysis.clause_segmenter import is_heading_line
+from app.analysis.document_buffer import DocumentBuffer
+from app.analysis.schemas import Clause, SectionRef
+
+# Clause hierarchy over segment_clauses() output:
+#   article ("ARTICLE IV", "4.") -> section ("4.2") -> sub-clause ("4.2(b)", "4.2(b)(ii)")
+# with an index from normalized section number to node, so "Clause 7.2(b)" in a
+# question or cross-reference resolves without scanning clause texts.
+
+# Numbered heading: "ARTICLE IV ...", "Section 7.2 ...", "7.2(b) ...", "3. ..."
+HEADING_NUMBER = re.compile(
+    r"^(?:(?P<kind>article|section|clause|part|schedule|annexure)\s+)?"
+    r"(?P<number>[0-9]+(?:\.[0-9]+)*|[ivxlc]+\b)\.?\s*"
+    r"(?P<subs>(?:\((?:[a-z]{1,4}|[0-9]{1,2})\)\s*)*)",
+    re.IGNORECASE
+)
+# Sub-clause marker at the start of a body line: "(b) ...", "(iv) ...", "(2) ..."
+SUBCLAUSE_MARKER = re.compile(r"^\((?P<marker>[a-z]{1,4}|[0-9]{1,2})\)\s", re.IGNORECASE)
+# A section reference in free text: "Clause 7.2(b)", "section 4", "Article IV", "cl. 3.1"
+SECTION_REFERENCE = re.compile(
+    r"\b(?:article|section|clause|cl\.|para(?:graph)?|schedule|annexure)\s*"
+    r"(?P<ref>[0-9]+(?:\.[0-9]+)*|[ivxlc]+\b)\s*(?P<subs>(?:\(\s*(?:[a-z]{1,4}|[0-9]{1,2})\s*\)\s*)*)",
+    re.IGNORECASE
+)
+
+# Sub-clause nodes are titled by their first line, cut to this length
+TITLE_MAX_CHARS = 100
+
+_ROMAN_VALUES = {"i": 1, "v": 5, "x": 10, "l": 50, "c": 100}
+_ROMAN = re.compile(r"^(?=[ivxlc]+$)c{0,3}(xc|xl|l?x{0,3})(ix|iv|v?i{0,3})$")
+_SUBS = re.compile(r"\(\s*([a-z]{1,4}|[0-9]{1,2})\s*\)", re.IGNORECASE)
+
+def _roman_to_int(numeral: str) -> int:
+    total, previous = 0, 0
+    for ch in reversed(numeral):
+        value = _ROMAN_VALUES[ch]
+        total += value if value >= previous else -value
+        previous = max(previous, value)
+    return total
+
+def normalize_section_number(number: str, subs: str = "") -> Optional[str]:
+    """
+    Canonical index key: "IV" -> "4", "7.2", "7.2 ( B )" -> "7.2(b)".
+    Returns None for text that is not a section number.
+    """
+    number = number.strip().lower().rstrip(".")
+    if not number:
+        return None
+    if not number[0].isdigit():
+        if not _ROMAN.match(number):
+            return None
+        number = str(_roman_to_int(number))
+    return number + "".join(f"({sub.lower()})" for sub in _SUBS.findall(subs))
+
+def find_section_references(text: str) -> List[str]:
+    """Normalized section numbers referenced in free text, in order, without repeats."""
+    found: List[str] = []
+    for match in SECTION_REFERENCE.finditer(text):
+        key = normalize_section_number(match.group("ref"), match.group("subs"))
+        if key and key not in found:
+            found.append(key)
+    return found
+
+class ClauseNode:
+    """
+    One article / section / sub-clause. Spans the node's own text plus all of its
+    descendants ([start, end) in the document), so a subtree can be handed to a
+    later stage on its own.
+    """
+
+    __slots__ = ("number", "title", "start", "end", "clause", "document", "parent", "children")
+
+    def __init__(self, number: Optional[str], title: str, start: int, end: int,
+                 clause: Optional[Clause], document: Optional[DocumentBuffer], parent: Optional["ClauseNode"]):
+        self.number = number
+        self.title = title
+        self.start = start
+        self.end = end
+        self.clause = clause  # The segmenter clause this node is (None for sub-clauses and the root)
+        self.document = document
+        self.parent = parent
+        self.children: List["ClauseNode"] = []
+
+    @property
+    def text(self) -> str:
+        return self.document.span_text(self.start, self.end) if self.document is not None else ""
+
+    def iter_nodes(self) -> Iterator["ClauseNode"]:
+        """This node and its descendants, in document order."""
+        yield self
+        for child in self.children:
+            yield from child.iter_nodes()
+
+    def clauses(self) -> List[Clause]:
+        """The segmenter clauses in this subtree, e.g. to run the risk engine on one article."""
+        return [node.clause for node in self.iter_nodes() if node.clause is not None]
+
+    def __repr__(self) -> str:
+        return f"ClauseNode({self.number or self.title!r}, {self.start}:{self.end}, {len(self.children)} children)"
+
+class ClauseTree:
+    """Clause hierarchy plus an O(1) index from section number to node."""
+
+    def __init__(self, root: ClauseNode, index: Dict[str, ClauseNode]):
+        self.root = root
+        self.index = index
+
+    def find(self, reference: str) -> Optional[ClauseNode]:
+        """
+        Node for a reference like "7.2(b)", "Clause 7.2 (b)" or "Article IV".
+        Falls back to the closest enclosing section ("7.2(z)" -> "7.2").
+        """
+        match = SECTION_REFERENCE.search(reference)
+        if match:
+            key = normalize_section_number(match.group("ref"), match.group("subs"))
+        else:
+            match = HEADING_NUMBER.match(reference.strip())
+            key = normalize_section_number(match.group("number"), match.group("subs")) if match else None
+        while key:
+            node = self.index.get(key)
+            if node is not None:
+                return node
+            key = _parent_key(key)
+        return None
+
+    def section_refs(self) -> List[SectionRef]:
+        """The index as API objects, in document order."""
+        refs = []
+        for node in self.root.iter_nodes():
+            if node.number is None:
+                continue
+            owner = node
+            while owner.clause is None and owner.parent is not None:
+                owner = owner.parent
+            refs.append(SectionRef(
+                number=node.number,
+                title=node.title,
+                clause_id=owner.clause.clause_id if owner.clause is not None else None,
+                start=node.start,
+                end=node.end
+            ))
+        return refs
+
+def _parent_key(key: str) -> Optional[str]:
+    """"7.2(b)(ii)" -> "7.2(b)" -> "7.2" -> "7" -> None."""
+    if key.endswith(")"):
+        return key[:key.rindex("(")]
+    if "." in key:
+        return key[:key.rindex(".")]
+    return None
+
+def _is_next_letter(marker: str, previous: Optional[str]) -> bool:
+    return previous is not None and len(marker) == 1 and len(previous) == 1 and ord(marker) == ord(previous) + 1
+
+def _add_subclauses(node: ClauseNode, clause: Clause, index: Dict[str, ClauseNode]):
+    """
+    Sub-clause nodes for "(a)" / "(i)" markers at the start of the clause's body
+    lines. Roman markers nest under the current letter unless they continue the
+    letter sequence ("(h)" then "(i)").
+    """
+    document = clause.document
+    if document is None or node.number is None:
+        return
+    letter: Optional[ClauseNode] = None
+    for start, end, line in document.iter_lines(clause.start, clause.end):
+        if start == clause.start:
+            continue  # The heading line itself
+        match = SUBCLAUSE_MARKER.match(line)
+        if not match:
+            if letter is not None:
+                letter.end = end
+                if letter.children:
+                    letter.children[-1].end = end
+            continue
+        marker = match.group("marker").lower()
+        is_roman = bool(_ROMAN.match(marker))
+        previous_letter = letter.number.rsplit("(", 1)[1][:-1] if letter is not None else None
+        if letter is not None and is_roman and not _is_next_letter(marker, previous_letter):
+            parent = letter
+        else:
+            parent = node
+        child = ClauseNode(f"{parent.number}({marker})", line[:TITLE_MAX_CHARS], start, end, None, document, parent)
+        parent.children.append(child)
+        index.setdefault(child.number, child)
+        if parent is node:
+            letter = child
+        else:
+            letter.end = end
+
+def build_clause_tree(clauses: List[Clause]) -> ClauseTree:
+    """
+    Builds the article -> section -> sub-clause tree over segment_clauses() output.
+
+    A numbered heading nests under the nearest earlier node whose number is a
+    prefix of it ("7.2" under "7" / "ARTICLE VII"); unnumbered headings and
+    preamble text are top-level. The first node for a number wins in the index.
+    """
+    document = clauses[0].document if clauses else None
+    root = ClauseNode(None, "", 0, 0, None, document, None)
+    index: Dict[str, ClauseNode] = {}
+    stack: List[ClauseNode] = [root]  # Open ancestors of the next node
+
+    for clause in clauses:
+        title = clause.text.split("\n", 1)[0]
+        match = HEADING_NUMBER.match(title) if is_heading_line(title) else None
+        number = normalize_section_number(match.group("number"), match.group("subs")) if match else None
+        if number and not match.group("kind") and not match.group("number")[0].isdigit() \
+                and title[match.end("number"):match.end("number") + 1] != ".":
+            number = None  # Bare roman numerals need a dot ("IV. TERM"), else "MIX ..." would count
+
+        if number is None:
+            parent = root
+            stack = [root]
+        else:
+            while len(stack) > 1 and not _is_ancestor(stack[-1].number, number):
+                stack.pop()
+            parent = stack[-1]
+
+        node = ClauseNode(number, title, clause.start, clause.end, clause, clause.document, parent)
+        parent.children.append(node)
+        if number is not None:
+            index.setdefault(number, node)
+            stack.append(node)
+            _add_subclauses(node, clause, index)
+
+    # Subtree spans cover all descendants
+    for node in reversed(list(root.iter_nodes())):
+        if node.children:
+            node.end = max(node.end, node.children[-1].end)
+            if node is root:
+                node.start = node.children[0].start
+    return ClauseTree(root, index)
+
+def _is_ancestor(ancestor: Optional[str], number: str) -> bool:
+    """"7" is an ancestor of "7.2" and "7.2(b)"; "7" is not one of "70.1"."""
+    if ancestor is None:
+        return False
+    return number.startswith(ancestor) and number[len(ancestor):len(ancestor) + 1] in (".", "(")
@@ -0,0 +1,84 @@
+import re
+from typing import Iterator, Optional, Tuple
+
+# Whitespace around a line break (trailing spaces, blank lines, indentation)
+_LINE_BREAK_RUN = re.compile(r"\s*\n\s*")
+_PADDED_LINE_BREAK = re.compile(r"\s\n|\n\s")
+# Characters split into lines at a time by iter_lines()
+LINE_WINDOW = 64 * 1024
+
+class DocumentBuffer:
+    """
+    The one copy of a contract's text that clauses and flags point into.
+
+    Clauses hold (start, end) offsets instead of their own strings; text views
+    are built on access and dropped by the caller, so a request holds the
+    document once instead of once per processing stage.
+    """
+
+    __slots__ = ("text", "canonical", "base")
+
+    def __init__(self, text: str, canonical: Optional[bool] = None, base: int = 0):
+        self.text = text
+        # base: document offset of text[0], for a buffer over a window of a
+        # longer document (see segment_clauses_iter). Both span_text() and
+        # iter_lines() take and return document offsets.
+        self.base = base
+        # canonical: every line is already stripped and non-empty, so spans are
+        # returned as plain slices. None = not known yet; a full iter_lines()
+        # pass or the first multi-line span_text() settles it.
+        self.canonical = canonical
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def iter_lines(self, start: int = 0, end: int = None) -> Iterator[Tuple[int, int, str]]:
+        """
+        Yields (start, end, line) for every non-empty line in [start, end), with
+        offsets of the stripped line. Lines split on "\\n" like str.split("\\n").
+        """
+        text = self.text
+        pos = max(start, self.base)
+        # Local positions in text (offsets are document offsets, see base)
+        window_start = pos - self.base
+        end = len(text) if end is None else min(end - self.base, len(text))
+        whole = window_start == 0 and end == len(text)
+        canonical = True
+        # str.split() runs in C; windows of LINE_WINDOW chars bound the transient
+        # line list instead of splitting the whole document at once
+        while window_start <= end:
+            window_end = text.find("\n", min(window_start + LINE_WINDOW, end), end)
+            if window_end == -1:
+                window_end = end
+            for line in text[window_start:window_end].split("\n"):
+                stripped = line.strip()
+                if stripped:
+                    if len(stripped) == len(line):
+                        yield pos, pos + len(line), stripped
+                    else:
+                        canonical = False
+                        # Leading whitespace never equals the first stripped character
+                        line_start = pos + line.index(stripped[0])
+                        yield line_start, line_start + len(stripped), stripped
+                else:
+                    canonical = False
+                pos += len(line) + 1
+            window_start = window_end + 1
+        if whole and self.canonical is None:
+            # Blank lines at either end don't affect slices, so re-check those documents
+            self.canonical = canonical or _PADDED_LINE_BREAK.search(text.strip()) is None
+
+    def span_text(self, start: int, end: int) -> str:
+        """
+        Text of a span as segmentation presents it: stripped non-empty lines
+        joined by "\\n". Single-line and canonical spans are a plain slice.
+        """
+        raw = self.text[start - self.base:end - self.base]
+        if "\n" not in raw:
+            return raw
+        if self.canonical is None:
+            self.canonical = _PADDED_LINE_BREAK.search(self.text.strip()) is None
+        if self.canonical:
+            return raw
+        # Spans start and end on stripped lines, so this equals joining the stripped lines
+        return _LINE_BREAK_RUN.sub("\n", raw)
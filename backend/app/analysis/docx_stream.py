@@ -0,0 +1,315 @@
+import io
+import re
+import zipfile
+from collections import namedtuple
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple, Union
+from lxml import etree
+
+# Streaming DOCX reader.
+# python-docx's Document() builds the whole XML tree (hundreds of MB for large
+# DMS exports) and doc.paragraphs skips tables entirely. This walks
+# word/document.xml with lxml iterparse, yields blocks in document order and
+# discards each element once read, so memory stays flat regardless of size.
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_W = "{%s}" % W_NS
+
+P = _W + "p"
+R = _W + "r"
+HYPERLINK = _W + "hyperlink"
+TC = _W + "tc"
+TR = _W + "tr"
+TBL = _W + "tbl"
+T = _W + "t"
+TAB = _W + "tab"
+PTAB = _W + "ptab"
+BR = _W + "br"
+CR = _W + "cr"
+NO_BREAK_HYPHEN = _W + "noBreakHyphen"
+FOOTNOTE = _W + "footnote"
+TYPE_ATTR = _W + "type"
+
+# Parts come from uploads: never resolve entities or fetch DTDs (XXE), as python-docx's oxml parser
+_SAFE_PARSING = dict(resolve_entities=False, no_network=True, load_dtd=False)
+_SAFE_PARSER = etree.XMLParser(**_SAFE_PARSING)
+PPR = _W + "pPr"
+RPR = _W + "rPr"
+PSTYLE = _W + "pStyle"
+OUTLINE_LVL = _W + "outlineLvl"
+SZ = _W + "sz"
+VAL = _W + "val"
+STYLE = _W + "style"
+STYLE_ID = _W + "styleId"
+NAME = _W + "name"
+BASED_ON = _W + "basedOn"
+DOC_DEFAULTS = _W + "docDefaults"
+DEFAULT_ATTR = _W + "default"
+
+# Block kinds, in the order they can appear
+PARAGRAPH = "paragraph"
+TABLE_CELL = "table_cell"
+FOOTNOTE_BLOCK = "footnote"
+HEADER_BLOCK = "header"
+
+_HEADER_PART = re.compile(r"^word/(header|footer)\d*\.xml$")
+
+DocxSource = Union[str, bytes, BinaryIO]
+
+# One block with its formatting hints. style is the paragraph style name,
+# font_size is in points, outline_level is 0-8 for headings (None for body text).
+DocxBlock = namedtuple("DocxBlock", ["kind", "text", "style", "font_size", "outline_level"])
+
+# styleId -> (name, outline_level, font_size), with basedOn inheritance resolved.
+# The None key is the default paragraph style (paragraphs without w:pStyle).
+StyleTable = Dict[str, Tuple[str, Optional[int], Optional[float]]]
+
+def _run_text(run) -> str:
+    """Same text rules as python-docx's Run.text."""
+    parts = []
+    for el in run:
+        tag = el.tag
+        if tag == T:
+            parts.append(el.text or "")
+        elif tag == TAB or tag == PTAB:
+            parts.append("\t")
+        elif tag == CR:
+            parts.append("\n")
+        elif tag == BR:
+            # Page / column breaks carry no text
+            if el.get(TYPE_ATTR, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag == NO_BREAK_HYPHEN:
+            parts.append("-")
+    return "".join(parts)
+
+def _paragraph_text(p) -> str:
+    """Same text rules as python-docx's Paragraph.text (runs and hyperlinked runs)."""
+    parts = []
+    for child in p:
+        if child.tag == R:
+            parts.append(_run_text(child))
+        elif child.tag == HYPERLINK:
+            parts.extend(_run_text(run) for run in child.iterchildren(R))
+    return "".join(parts)
+
+def _val(el, path: str) -> Optional[str]:
+    found = el.find(path)
+    return found.get(VAL) if found is not None else None
+
+def _half_points(value: Optional[str]) -> Optional[float]:
+    """w:sz is in half-points."""
+    try:
+        return int(value) / 2 if value is not None else None
+    except ValueError:
+        return None
+
+def _outline_level(value: Optional[str]) -> Optional[int]:
+    try:
+        level = int(value) if value is not None else None
+    except ValueError:
+        return None
+    # Level 9 is Word's explicit "body text"
+    return level if level is not None and level < 9 else None
+
+def _paragraph_format(p) -> Tuple[Optional[str], Optional[int], Optional[float]]:
+    """(style id, direct outline level, largest direct run size) of a paragraph."""
+    style_id = outline = None
+    ppr = p.find(PPR)
+    if ppr is not None:
+        style_id = _val(ppr, PSTYLE)
+        outline = _outline_level(_val(ppr, OUTLINE_LVL))
+
+    size = None
+    for run in p.iter(R):
+        run_size = _half_points(_val(run, f"{RPR}/{SZ}"))
+        if run_size is not None and (size is None or run_size > size):
+            size = run_size
+    return style_id, outline, size
+
+def _load_styles(package: zipfile.ZipFile, names) -> Tuple[StyleTable, Optional[float]]:
+    """Paragraph styles and the document default font size, from word/styles.xml."""
+    if "word/styles.xml" not in names:
+        return {}, None
+    # styles.xml is small (tens of KB) even for huge documents
+    root = etree.fromstring(package.read("word/styles.xml"), _SAFE_PARSER)
+    default_size = _half_points(_val(root, f"{DOC_DEFAULTS}/{_W}rPrDefault/{RPR}/{SZ}"))
+
+    raw, default_id = {}, None
+    for style in root.iterchildren(STYLE):
+        if style.get(TYPE_ATTR) != "paragraph":
+            continue
+        if style.get(DEFAULT_ATTR) in ("1", "true"):
+            default_id = style.get(STYLE_ID)
+        raw[style.get(STYLE_ID)] = (
+            _val(style, NAME) or style.get(STYLE_ID),
+            _val(style, BASED_ON),
+            _outline_level(_val(style, f"{PPR}/{OUTLINE_LVL}")),
+            _half_points(_val(style, f"{RPR}/{SZ}"))
+        )
+
+    table: StyleTable = {}
+    for style_id, (name, based_on, outline, size) in raw.items():
+        parent, depth = based_on, 0
+        while parent in raw and (outline is None or size is None) and depth < 20:
+            _, parent_based_on, parent_outline, parent_size = raw[parent]
+            outline = parent_outline if outline is None else outline
+            size = parent_size if size is None else size
+            parent, depth = parent_based_on, depth + 1
+
+        # Built-in heading styles sometimes omit outlineLvl
+        match = re.match(r"^heading (\d)$", name.lower())
+        if outline is None and match:
+            outline = int(match.group(1)) - 1
+        elif outline is None and name.lower() == "title":
+            outline = 0
+        table[style_id] = (name, outline, size)
+
+    if default_id in table:
+        table[None] = table[default_id]
+    return table, default_size
+
+def _discard(el):
+    """Frees an element and every already-processed sibling before it."""
+    el.clear()
+    parent = el.getparent()
+    if parent is not None:
+        while el.getprevious() is not None:
+            del parent[0]
+
+def _iter_part_blocks(stream, paragraph_kind: str) -> Iterator[Tuple[str, str, Optional[tuple]]]:
+    """
+    Yields (kind, text, format) for one XML part; format is _paragraph_format()
+    for paragraphs outside tables, None for table cells. Paragraphs outside tables are yielded as
+    `paragraph_kind`; each table cell is one TABLE_CELL block (its paragraphs
+    joined by newlines, like python-docx's _Cell.text). Nested tables yield their
+    own cells.
+    """
+    cell_stack = []  # Paragraph texts of each open (possibly nested) table cell
+
+    for event, el in etree.iterparse(stream, events=("start", "end"), tag=(P, TC, TR, TBL), **_SAFE_PARSING):
+        tag = el.tag
+        if event == "start":
+            if tag == TC:
+                cell_stack.append([])
+            continue
+
+        if tag == P:
+            text = _paragraph_text(el)
+            if cell_stack:
+                cell_stack[-1].append(text)
+                el.clear()
+            else:
+                yield paragraph_kind, text, _paragraph_format(el)
+                _discard(el)
+
+        elif tag == TC:
+            yield TABLE_CELL, "\n".join(cell_stack.pop()), None
+            _discard(el)
+
+        else:  # TR / TBL
+            _discard(el)
+
+def _open_zip(source: DocxSource) -> zipfile.ZipFile:
+    if isinstance(source, bytes):
+        return zipfile.ZipFile(io.BytesIO(source))
+    if not isinstance(source, str):
+        source.seek(0)
+    return zipfile.ZipFile(source)
+
+def iter_docx_blocks(
+    source: DocxSource,
+    include_footnotes: bool = True,
+    include_headers: bool = False
+) -> Iterator[Tuple[str, str]]:
+    """
+    Streams a .docx as (kind, text) blocks in document order, with constant memory.
+    See iter_docx_styled_blocks() for ordering and errors.
+    """
+    for block in iter_docx_styled_blocks(source, include_footnotes, include_headers):
+        yield block.kind, block.text
+
+def iter_docx_styled_blocks(
+    source: DocxSource,
+    include_footnotes: bool = True,
+    include_headers: bool = False
+) -> Iterator[DocxBlock]:
+    """
+    Streams a .docx as DocxBlocks (text plus style / font size / outline level)
+    in document order, with constant memory.
+
+    Order: body paragraphs and table cells as they appear, then footnotes, then
+    (optionally) headers/footers. Headers are off by default: they repeat on every
+    page and would show up as spurious clauses downstream.
+
+    Raises:
+        ValueError: If the file is not a valid DOCX package.
+    """
+    try:
+        package = _open_zip(source)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Not a valid DOCX file: {e}")
+
+    with package:
+        names = set(package.namelist())
+        if "word/document.xml" not in names:
+            raise ValueError("Not a valid DOCX file: word/document.xml missing")
+        styles, default_size = _load_styles(package, names)
+
+        def styled(kind, text, fmt):
+            if fmt is None:
+                return DocxBlock(kind, text, None, None, None)
+            style_id, outline, size = fmt
+            name, style_outline, style_size = styles.get(style_id, (style_id, None, None))
+            return DocxBlock(
+                kind, text, name,
+                size if size is not None else (style_size if style_size is not None else default_size),
+                outline if outline is not None else style_outline
+            )
+
+        with package.open("word/document.xml") as stream:
+            for kind, text, fmt in _iter_part_blocks(stream, PARAGRAPH):
+                yield styled(kind, text, fmt)
+
+        if include_footnotes and "word/footnotes.xml" in names:
+            with package.open("word/footnotes.xml") as stream:
+                for text in _iter_footnote_blocks(stream):
+                    yield DocxBlock(FOOTNOTE_BLOCK, text, None, None, None)
+
+        if include_headers:
+            seen = set()
+            for name in sorted(n for n in names if _HEADER_PART.match(n)):
+                with package.open(name) as stream:
+                    for kind, text, _ in _iter_part_blocks(stream, HEADER_BLOCK):
+                        # Same header text is usually repeated per section
+                        if text.strip() and text not in seen:
+                            seen.add(text)
+                            yield DocxBlock(kind, text, None, None, None)
+
+def _iter_footnote_blocks(stream) -> Iterator[str]:
+    """Footnote paragraphs, skipping Word's separator / continuation pseudo-notes."""
+    skip_depth = 0
+    for event, el in etree.iterparse(stream, events=("start", "end"), tag=(FOOTNOTE, P), **_SAFE_PARSING):
+        if el.tag == FOOTNOTE:
+            if event == "start":
+                if el.get(TYPE_ATTR) in ("separator", "continuationSeparator", "continuationNotice"):
+                    skip_depth += 1
+            else:
+                if el.get(TYPE_ATTR) in ("separator", "continuationSeparator", "continuationNotice"):
+                    skip_depth -= 1
+                _discard(el)
+        elif event == "end" and not skip_depth:
+            yield _paragraph_text(el)
+
+def docx_text(source: DocxSource, include_footnotes: bool = True, include_headers: bool = False) -> str:
+    """Non-empty blocks, stripped and newline-joined (the shape extract_text returns)."""
+    texts = (text.strip() for _, text in iter_docx_blocks(source, include_footnotes, include_headers))
+    return "\n".join(text for text in texts if text)
+
+def docx_paragraph_text(source: DocxSource) -> str:
+    """
+    Body paragraphs only, stripped and newline-joined, like python-docx's
+    doc.paragraphs: the text extract_text() returned before table cells and
+    footnotes were read. Proofs stored back then hash this text.
+    """
+    texts = (text.strip() for kind, text in iter_docx_blocks(source, include_footnotes=False) if kind == PARAGRAPH)
+    return "\n".join(text for text in texts if text)
@@ -0,0 +1,168 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.analysis.text_extractor import EXTRACTION_SIGNATURE, extract_text
+from app.analysis.uploads import BufferedUpload
+
+# --- EXTRACTION CACHE CONFIGURATION ---
+# Extracted text is stored on disk, keyed by the SHA-256 of the raw upload bytes,
+# so re-uploading the same file (analyze -> verify -> page refresh) skips parsing.
+EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", os.path.join("tmp", "extraction_cache"))
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# Partial writes ("*.tmp") younger than this may still be in flight (another
+# worker process sharing the directory) and are left alone on start-up
+EXTRACTION_CACHE_TMP_GRACE_SECONDS = 600
+
+class ExtractionCache:
+    """
+    Disk-backed LRU of extracted text.
+    Entry files are named "<sha256><ext>.v<EXTRACTION_SIGNATURE>.txt"; entries written
+    by another extractor version or extraction configuration (PDF backend, DOCX
+    options) are never read and are purged on start-up.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, version: str = EXTRACTION_SIGNATURE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = version
+        self.suffix = f".v{version}.txt"
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def _load_index(self):
+        """Rebuilds the LRU order from file mtimes (hits touch the file)."""
+        found = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not name.endswith(self.suffix):
+                # Stale extractor version, or a partial write abandoned long ago
+                try:
+                    if name.endswith(".tmp") and time.time() - os.stat(path).st_mtime < EXTRACTION_CACHE_TMP_GRACE_SECONDS:
+                        continue
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # Evicted by another process meanwhile
+            found.append((stat.st_mtime, name[:-len(self.suffix)], stat.st_size))
+
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+        try:
+            path = self._path(key)
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)  # Keeps LRU order across restarts
+        except OSError:
+            with self._lock:
+                size = self._entries.pop(key, 0)
+                self._total_bytes -= size
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return text
+
+    def put(self, key: str, text: str):
+        data = text.encode("utf-8")
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)  # Atomic: readers never see a partial entry
+        except OSError as e:
+            print(f"Extraction cache write failed: {e}")
+            return
+
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": True,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "version": self.version
+            }
+
+_cache: Optional[ExtractionCache] = None
+_cache_lock = threading.Lock()
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """The process-wide cache, built once even when extraction threads ask for it together."""
+    global _cache
+    if _cache is None and EXTRACTION_CACHE_ENABLED:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ExtractionCache(EXTRACTION_CACHE_DIR, EXTRACTION_CACHE_MAX_BYTES)
+    return _cache
+
+def cache_stats() -> dict:
+    cache = get_extraction_cache()
+    return cache.stats() if cache else {"enabled": False}
+
+def extract_upload(upload: BufferedUpload) -> Tuple[str, bool]:
+    """
+    Cache-aware extract_text() for a buffered upload.
+
+    Returns:
+        (text, cache_hit)
+    """
+    cache = get_extraction_cache()
+    key = f"{upload.sha256}{upload.file_ext}"
+
+    if cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached, True
+
+    text = extract_text(upload.source, file_ext=upload.file_ext)
+
+    if cache:
+        cache.put(key, text)
+    return text, False
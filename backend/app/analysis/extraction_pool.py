@@ -0,0 +1,170 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+# --- EXTRACTION POOL CONFIGURATION ---
+# Blocking extraction never runs on the event loop. It runs on this dedicated,
+# bounded executor; once workers + queue are saturated, new work is rejected
+# immediately (HTTP 503 + Retry-After) instead of piling up.
+EXTRACTION_POOL_WORKERS = int(os.getenv("EXTRACTION_POOL_WORKERS", "4"))
+EXTRACTION_QUEUE_LIMIT = int(os.getenv("EXTRACTION_QUEUE_LIMIT", "16"))
+EXTRACTION_RETRY_AFTER_SECONDS = int(os.getenv("EXTRACTION_RETRY_AFTER_SECONDS", "5"))
+
+class ExtractionQueueFull(Exception):
+    """Raised when the extraction pool cannot admit more work."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Extraction queue is full. Please retry shortly.")
+        self.retry_after = retry_after
+
+class ExtractionSlot:
+    """
+    One admitted unit of work on the pool (see ExtractionPool.reserve()): a
+    request, a stream or a batch. Its steps run through run() and are never
+    rejected. The slot counts against the pool's capacity until it is released
+    and its last step has finished in its thread, even if the awaiting request
+    was cancelled first.
+    """
+
+    def __init__(self, pool: "ExtractionPool"):
+        self._pool = pool
+        self._pending = 0  # Steps submitted and not finished (guarded by the pool's lock)
+        self._released = False
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """Runs a blocking callable on the pool and awaits its result."""
+        return await self._pool._submit(self, fn, args, kwargs)
+
+    def release(self):
+        """Gives the slot back once its running steps finish. Idempotent."""
+        self._pool._release(self)
+
+    def __enter__(self) -> "ExtractionSlot":
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+class ExtractionPool:
+    """
+    Bounded thread pool with admission control and queue/wait/run metrics.
+    At most `workers` + `queue_limit` slots are held at once (a slot per request,
+    stream or batch, see reserve()); anything beyond is rejected.
+    """
+
+    def __init__(self, workers: int, queue_limit: int, retry_after: int = EXTRACTION_RETRY_AFTER_SECONDS):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extraction")
+        self._lock = threading.Lock()
+        self._admitted = 0  # Slots held: reserved, or released with steps still running
+        self._pending = 0  # Steps submitted and not finished (queued + running)
+        self._running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.run_seconds_total = 0.0
+        self.run_seconds_max = 0.0
+
+    def reserve(self) -> ExtractionSlot:
+        """
+        Admits a unit of work now, before its steps are submitted (e.g. a
+        stream's pages). Use as a context manager, or call release().
+
+        Raises:
+            ExtractionQueueFull: If every slot is held.
+        """
+        with self._lock:
+            if self._admitted >= self.workers + self.queue_limit:
+                self.rejected += 1
+                raise ExtractionQueueFull(self.retry_after)
+            self._admitted += 1
+        return ExtractionSlot(self)
+
+    def _release(self, slot: ExtractionSlot):
+        with self._lock:
+            if slot._released:
+                return
+            slot._released = True
+            if not slot._pending:
+                self._admitted -= 1
+
+    def _step_done(self, slot: ExtractionSlot):
+        # Future callback: the step finished in its thread, or was cancelled before starting
+        with self._lock:
+            slot._pending -= 1
+            self._pending -= 1
+            if slot._released and not slot._pending:
+                self._admitted -= 1
+
+    def _execute(self, admitted_at: float, fn: Callable, args: tuple, kwargs: dict):
+        started = time.perf_counter()
+        wait = started - admitted_at
+        with self._lock:
+            self._running += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._running -= 1
+                self.run_seconds_total += elapsed
+                self.run_seconds_max = max(self.run_seconds_max, elapsed)
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+    async def _submit(self, slot: ExtractionSlot, fn: Callable, args: tuple, kwargs: dict):
+        with self._lock:
+            if slot._released:
+                raise RuntimeError("Extraction slot already released")
+            slot._pending += 1
+            self._pending += 1
+        future = self._executor.submit(self._execute, time.perf_counter(), fn, args, kwargs)
+        future.add_done_callback(lambda _: self._step_done(slot))
+        # Cancelling the await cancels a queued step; a running one finishes in its thread
+        return await asyncio.wrap_future(future)
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """
+        Runs a blocking callable on the pool in a slot of its own and awaits its result.
+
+        Raises:
+            ExtractionQueueFull: If every slot is held.
+        """
+        with self.reserve() as slot:
+            return await slot.run(fn, *args, **kwargs)
+
+    def stats(self) -> dict:
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "running": self._running,
+                "slots_held": self._admitted,
+                "queue_depth": max(0, self._pending - self._running),
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "wait_seconds_avg": round(self.wait_seconds_total / finished, 4) if finished else 0.0,
+                "wait_seconds_max": round(self.wait_seconds_max, 4),
+                "run_seconds_avg": round(self.run_seconds_total / finished, 4) if finished else 0.0,
+                "run_seconds_max": round(self.run_seconds_max, 4)
+            }
+
+# Shared by every extraction endpoint in this process
+extraction_pool = ExtractionPool(EXTRACTION_POOL_WORKERS, EXTRACTION_QUEUE_LIMIT)
@@ -1,40 +1,185 @@
-from app.analysis.schemas import JurisdictionResult
+import re
+from typing import Dict, List, Tuple, Union
 
-def detect_jurisdiction(text: str) -> JurisdictionResult:
+from app.analysis.keyword_matcher import trie_pattern
+from app.analysis.prepared_document import PreparedDocument
+from app.analysis.legal_knowledge.gazetteer import INDIA_NAMES, INDIAN_STATES, INDIAN_CITIES, FOREIGN_JURISDICTIONS
+from app.analysis.schemas import JurisdictionMatch, JurisdictionResult
+from app.core.metrics import timed
+
+# Phrases that introduce a governing-law clause
+GOVERNING_LAW_PHRASES = [
+    "governed by", "laws of", "law of", "jurisdiction", "governing law", "applicable law",
+    "construed in accordance with"
+]
+# Phrases that introduce the court (or arbitral seat) that hears disputes
+COURT_PHRASES = [
+    "courts of", "courts at", "courts in", "court of", "court at", "court in",
+    "seat of arbitration", "seat of the arbitration", "venue of arbitration", "venue of the arbitration"
+]
+# A place counts for a phrase when it starts within this many characters after it
+# ("governed by the laws of the Republic of India", "courts at Mumbai, Maharashtra")
+PLACE_WINDOW_CHARS = 120
+
+# Match kinds
+GOVERNING_LAW = "governing_law"
+COURT = "court"
+INDIA = "india"
+STATE = "state"
+CITY = "city"
+FOREIGN = "foreign"
+
+# lowercase place name -> (kind, display name)
+PLACES: Dict[str, Tuple[str, str]] = {}
+for _name in INDIA_NAMES:
+    PLACES[_name] = (INDIA, "India")
+for _kind, _names in ((STATE, INDIAN_STATES), (CITY, INDIAN_CITIES), (FOREIGN, FOREIGN_JURISDICTIONS)):
+    for _name, _display in _names.items():
+        PLACES[_name] = (_kind, _display)
+
+class JurisdictionScanner:
+    """
+    Governing-law / court phrase and gazetteer place scanner, compiled once.
+
+    The whole contract is only touched by C-level substring search for a few
+    anchor words (every phrase starts with one). Compiled regexes then run at
+    those anchors and in the short window after each phrase, where the place
+    names are; CPython's `re` scans far slower per character than `str.find`.
+    """
+
+    def __init__(self, law_phrases: List[str], court_phrases: List[str], places: Dict[str, Tuple[str, str]]):
+        self._kinds = {phrase: GOVERNING_LAW for phrase in law_phrases}
+        self._kinds.update({phrase: COURT for phrase in court_phrases})
+        self._anchors = sorted({phrase.split()[0] for phrase in self._kinds})
+        # Anchors that are prefixes of others ("law" / "laws") need only one search
+        self._anchors = [a for a in self._anchors if not any(a != b and a.startswith(b) for b in self._anchors)]
+        self._phrase = re.compile(trie_pattern(self._kinds))
+        self._places = places
+        self._place = re.compile(r"\b(?:" + trie_pattern(places) + r")\b")
+
+    def _iter_phrases(self, text_lower: str):
+        """(start, end, kind) of every phrase, in document order."""
+        found = []
+        match_phrase = self._phrase.match
+        find = text_lower.find
+        for anchor in self._anchors:
+            pos = find(anchor)
+            while pos != -1:
+                if pos == 0 or not text_lower[pos - 1].isalnum():
+                    match = match_phrase(text_lower, pos)
+                    if match:
+                        found.append((pos, match.end(), self._kinds[match.group()]))
+                pos = find(anchor, pos + 1)
+        found.sort()
+        return found
+
+    def scan(self, text_lower: str) -> List[Tuple[tuple, List[tuple]]]:
+        """
+        Every governing-law / court phrase in document order, each with the
+        places named after it in the same sentence, within PLACE_WINDOW_CHARS:
+        [((start, end, kind), [(start, end, kind, display name), ...]), ...]
+        """
+        places = self._places
+        finditer = self._place.finditer
+        find = text_lower.find
+        groups = []
+        for start, end, kind in self._iter_phrases(text_lower):
+            # The window stops at the end of the sentence ("... applicable law. Pune office")
+            window_end = find(".", end, end + PLACE_WINDOW_CHARS)
+            if window_end == -1:
+                window_end = end + PLACE_WINDOW_CHARS
+            named = [(m.start(), m.end()) + places[m.group()] for m in finditer(text_lower, end, window_end)]
+            groups.append(((start, end, kind), named))
+        return groups
+
+# Compiled once at import
+JURISDICTION_SCANNER = JurisdictionScanner(GOVERNING_LAW_PHRASES, COURT_PHRASES, PLACES)
+
+def _indian_place_anywhere(text_lower: str) -> bool:
+    """Fallback for governing law clauses that name no place: any Indian place name in the text."""
+    for name, (kind, _) in PLACES.items():
+        if kind == FOREIGN:
+            continue
+        pos = text_lower.find(name)
+        while pos != -1:
+            after = pos + len(name)
+            if (pos == 0 or not text_lower[pos - 1].isalnum()) and \
+                    (after == len(text_lower) or not text_lower[after].isalnum()):
+                return True
+            pos = text_lower.find(name, pos + 1)
+    return False
+
+@timed("jurisdiction")
+def detect_jurisdiction(text: Union[str, PreparedDocument]) -> JurisdictionResult:
     """
     Scans the text for governing law clauses.
     Strict India-Only Guardrail.
+
+    The governing law is the place named right after a governing-law phrase
+    ("governed by the laws of India"); the court is the city right after a court
+    phrase ("courts at Mumbai"). Place names elsewhere in the contract ("Made in
+    India", a party's address) only count when no phrase names a place.
     """
-    text_lower = text.lower()
-    
+    prepared = PreparedDocument.of(text)
+    text, text_lower = prepared.text, prepared.lower
+    groups = JURISDICTION_SCANNER.scan(text_lower)
+
     # Check for governing law indicators
-    has_governing_law = "governed by" in text_lower or "laws of" in text_lower or "jurisdiction" in text_lower
-    
-    if not has_governing_law:
+    if not groups:
         return JurisdictionResult(
             jurisdiction="Unknown",
             supported=False,
             message="No governing law clause detected. Proceed with caution."
         )
 
-    # Check for India
-    # We look for explicit mentions of India in the context of laws
-    # Simplistic heuristic: if "india" appears near "laws" or "governed"
-    # For robust v1, we just check if "india" exists in the text roughly? 
-    # No, that's too broad. "Made in India" vs "Laws of India".
-    # Better: regex or window search?
-    # Let's stick to the prompt's simplicity first: "Extract country/state".
-    
-    if "india" in text_lower or "delhi" in text_lower or "mumbai" in text_lower or "bangalore" in text_lower:
+    # Places named by governing-law phrases first, then by court phrases
+    governing: List[tuple] = []
+    court_places: List[tuple] = []
+    relevant: Dict[int, tuple] = {}  # Phrases that name a place, and those places, by start
+    for phrase, places in groups:
+        if places:
+            (governing if phrase[2] == GOVERNING_LAW else court_places).extend(places)
+            relevant[phrase[0]] = phrase
+            relevant.update((place[0], place) for place in places)
+    governing.extend(court_places)
+    matches = [
+        JurisdictionMatch(kind=found[2], text=text[found[0]:found[1]], start=found[0], end=found[1])
+        for _, found in sorted(relevant.items())
+    ]
+
+    if governing:
+        place = governing[0]
+        if place[2] == FOREIGN:
+            return JurisdictionResult(
+                jurisdiction="Foreign/Unknown",
+                supported=False,
+                message=f"Governing law / forum: {place[3]}. LexChain currently supports Indian contracts only.",
+                matches=matches
+            )
+        court = next((p[3] for p in court_places if p[2] == CITY), None) \
+            or next((p[3] for p in governing if p[2] == CITY), None)
         return JurisdictionResult(
             jurisdiction="India",
             supported=True,
-            message="Jurisdiction: India"
+            message="Jurisdiction: India",
+            state=next((p[3] for p in governing if p[2] == STATE), None),
+            court=court,
+            matches=matches
         )
-        
+
+    # No phrase names a place: fall back to Indian place names anywhere
+    if _indian_place_anywhere(text_lower):
+        return JurisdictionResult(
+            jurisdiction="India",
+            supported=True,
+            message="Jurisdiction: India (inferred: the governing law clause names no place)",
+            matches=matches
+        )
+
     # If law detected but not India
     return JurisdictionResult(
         jurisdiction="Foreign/Unknown",
         supported=False,
-        message="LexChain currently supports Indian contracts only."
+        message="LexChain currently supports Indian contracts only.",
+        matches=matches
     )
@@ -0,0 +1,117 @@
+import re
+from collections import namedtuple
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# One keyword occurrence: text[start:end] == keyword, which belongs to `category`
+KeywordHit = namedtuple("KeywordHit", ["start", "end", "keyword", "category"])
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """
+    Regex for a set of literal words, shaped as a prefix trie:
+    "term|terminate|termination" -> "term(?:inat(?:e|ion))?".
+    The engine follows one branch per character instead of trying every word,
+    and being greedy it returns the longest word starting at a position.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # End-of-word marker
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+class KeywordMatcher:
+    """
+    Multi-pattern substring matcher over a {category: [keywords]} taxonomy,
+    compiled once. Matching has the same semantics as `keyword in text` for
+    every keyword, but finds all of them in one left-to-right scan of the text.
+
+    Text must already be lowercased; keywords are lowercased at compile time.
+    Categories keep the taxonomy's order, which the segmenter's first/last
+    match rules depend on.
+    """
+
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        self.categories: List[str] = list(taxonomy)
+        rank = {category: i for i, category in enumerate(self.categories)}
+
+        # keyword -> categories listing it (a keyword may sit in several)
+        owners: Dict[str, List[str]] = {}
+        for category, keywords in taxonomy.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword and category not in owners.setdefault(keyword, []):
+                    owners[keyword].append(category)
+
+        # The scan reports the longest keyword at each position; shorter
+        # keywords that are prefixes of it matched there too.
+        self._at_position: Dict[str, List[tuple]] = {}
+        self._rank_span: Dict[str, tuple] = {}
+        for keyword in owners:
+            found = [(kw, category) for kw in sorted(owners, key=len) if keyword.startswith(kw)
+                     for category in owners[kw]]
+            ranks = [rank[category] for _, category in found]
+            self._at_position[keyword] = found
+            self._rank_span[keyword] = (min(ranks), max(ranks))
+
+        self._search = re.compile(trie_pattern(owners)).search if owners else None
+
+    def _iter_matches(self, text: str, start: int, end: int):
+        """(position, longest keyword there) for every position where a keyword starts."""
+        if self._search is None:
+            return
+        match = self._search(text, start, end)
+        while match:
+            position = match.start()
+            yield position, match.group()
+            # Resume one character later, so overlapping keywords are found too
+            match = self._search(text, position + 1, end)
+
+    def iter_hits(self, text: str, start: int = 0, end: Optional[int] = None) -> Iterator[KeywordHit]:
+        """All keyword occurrences in text[start:end], by position (shorter keyword first at a tie)."""
+        end = len(text) if end is None else end
+        for position, longest in self._iter_matches(text, start, end):
+            for keyword, category in self._at_position[longest]:
+                yield KeywordHit(position, position + len(keyword), keyword, category)
+
+    def find_categories(self, text: str) -> List[str]:
+        """Every category with a keyword in the text, in taxonomy order (multi-label)."""
+        found = {hit.category for hit in self.iter_hits(text)}
+        return [category for category in self.categories if category in found]
+
+    def first_category(self, text: str) -> Optional[str]:
+        """The earliest category in taxonomy order with a keyword in the text."""
+        search = self._search
+        match = search(text) if search else None
+        best = None
+        while match:
+            low = self._rank_span[match.group()][0]
+            if best is None or low < best:
+                best = low
+                if best == 0:
+                    break
+            match = search(text, match.start() + 1)
+        return self.categories[best] if best is not None else None
+
+    def last_category(self, text: str) -> Optional[str]:
+        """The latest category in taxonomy order with a keyword in the text."""
+        search = self._search
+        match = search(text) if search else None
+        best = None
+        last = len(self.categories) - 1
+        while match:
+            high = self._rank_span[match.group()][1]
+            if best is None or high > best:
+                best = high
+                if best == last:
+                    break
+            match = search(text, match.start() + 1)
+        return self.categories[best] if best is not None else None
@@ -0,0 +1,185 @@
+import itertools
+import threading
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from app.analysis.clause_segmenter import is_heading_line, segment_clauses_iter
+from app.analysis.schemas import Clause
+from app.analysis.text_extractor import ExtractionSource, iter_page_chunks, iter_pages, join_pages, page_count
+
+class LazyDocument:
+    """
+    A contract whose pages are extracted on demand, in page order.
+
+    Stages that only need part of the document (AI prompts capped at N chars,
+    sections under given headings) stop parsing as soon as they have enough.
+    The full text is only built when `.text` is read. DOCX has no pages, so it
+    is a single page (see iter_pages()).
+
+    Blocking: call from the extraction pool, not the event loop.
+    """
+
+    def __init__(self, source: ExtractionSource, file_ext: Optional[str] = None, backend: Optional[str] = None):
+        self._source = source
+        self._file_ext = file_ext
+        self._backend = backend
+        self._pages: List[str] = []
+        self._page_iter: Optional[Iterator[str]] = None
+        # The iter_pages() generator behind _page_iter (which may be an islice of it)
+        self._page_source: Optional[Iterator[str]] = None
+        self._exhausted = False
+        self._page_count: Optional[int] = None
+        self._text: Optional[str] = None
+        self._lock = threading.Lock()  # Generators cannot be resumed from two threads
+
+    @classmethod
+    def from_text(cls, text: str) -> "LazyDocument":
+        """Wraps already-extracted text (e.g. an extraction cache hit) as a one-page document."""
+        doc = cls(None)
+        doc._pages = [text]
+        doc._exhausted = True
+        doc._page_count = 1
+        return doc
+
+    @property
+    def page_count(self) -> int:
+        if self._page_count is None:
+            self._page_count = page_count(self._source, self._file_ext, self._backend)
+        return self._page_count
+
+    @property
+    def pages_extracted(self) -> int:
+        return len(self._pages)
+
+    @property
+    def is_complete(self) -> bool:
+        return self._exhausted
+
+    def _extract_next(self) -> bool:
+        """Extracts one more page. Returns False once the document is exhausted."""
+        if self._exhausted:
+            return False
+        if self._page_iter is None:
+            pages = self._page_source = iter_pages(self._source, self._file_ext, self._backend)
+            # Resumes after close(): skip pages already held
+            self._page_iter = itertools.islice(pages, len(self._pages), None) if self._pages else pages
+        page_text = next(self._page_iter, None)
+        if page_text is None:
+            self._exhausted = True
+            self._page_iter = self._page_source = None
+            return False
+        self._pages.append(page_text)
+        return True
+
+    def page(self, index: int) -> str:
+        """Text of page `index` (0-based), extracting up to it if needed."""
+        with self._lock:
+            while len(self._pages) <= index and self._extract_next():
+                pass
+        if index >= len(self._pages):
+            raise IndexError(f"Page {index} out of range ({len(self._pages)} pages)")
+        return self._pages[index]
+
+    def prefix(self, max_chars: int) -> str:
+        """
+        The first `max_chars` characters of `.text`, extracting only the pages
+        needed to cover them.
+        """
+        with self._lock:
+            if self._text is not None:
+                return self._text[:max_chars]
+
+            # Same joining as join_pages(), kept open-ended while pages remain
+            head = "".join(page_text + "\n" for page_text in self._pages if page_text).lstrip()
+            while len(head) < max_chars and self._extract_next():
+                page_text = self._pages[-1]
+                if page_text:
+                    head = (head + page_text + "\n").lstrip()
+
+            if self._exhausted:
+                return join_pages(self._pages)[:max_chars]
+            return head[:max_chars]
+
+    def pages_containing(self, headings: Iterable[str], follow_pages: int = 1) -> List[Tuple[int, str]]:
+        """
+        Finds the first page on which each heading appears (matched case-insensitively
+        against heading lines) and returns it plus `follow_pages` pages after it,
+        since sections run on. Stops extracting once every heading is covered.
+
+        Returns:
+            [(page_number, page_text)] in page order; page numbers are 1-based.
+        """
+        wanted = {h.strip().lower() for h in headings if h.strip()}
+        selected = set()
+        last_needed = -1  # Highest page index still to be fetched for found headings
+
+        with self._lock:
+            index = 0
+            while wanted or index <= last_needed:
+                if index >= len(self._pages) and not self._extract_next():
+                    break
+                page_text = self._pages[index]
+
+                found = set()
+                for line in page_text.split("\n"):
+                    line = line.strip()
+                    if is_heading_line(line):
+                        line_lower = line.lower()
+                        found.update(h for h in wanted if h in line_lower)
+                if found:
+                    wanted -= found
+                    last_needed = max(last_needed, index + follow_pages)
+                    selected.add(index)
+                elif index <= last_needed:
+                    selected.add(index)
+                index += 1
+
+        return [(i + 1, self._pages[i]) for i in sorted(selected)]
+
+    def iter_clauses(self) -> Iterator[Clause]:
+        """
+        Segments the document while its pages are being extracted: each clause is
+        yielded once the next heading closes it (see segment_clauses_iter()).
+        Offsets are into `.text`.
+        """
+        def pages():
+            index = 0
+            while True:
+                with self._lock:
+                    if index >= len(self._pages) and not self._extract_next():
+                        return
+                    page_text = self._pages[index]
+                yield page_text
+                index += 1
+
+        return segment_clauses_iter(iter_page_chunks(pages()))
+
+    @property
+    def text(self) -> str:
+        """
+        The full text, identical to extract_text() on the same source.
+
+        Raises:
+            ValueError: If no text could be extracted.
+        """
+        with self._lock:
+            if self._text is None:
+                while self._extract_next():
+                    pass
+                text = join_pages(self._pages)
+                if not text:
+                    raise ValueError("No extractable text found")
+                self._text = text
+            return self._text
+
+    def close(self):
+        """Releases the open PDF handle if extraction stopped part-way (later reads resume)."""
+        if self._page_source is not None:
+            # The generator, not _page_iter: an islice has no close()
+            self._page_source.close()
+        self._page_iter = self._page_source = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,134 @@
+# Static Gazetteer: Indian place names and court seats for jurisdiction detection.
+# Lowercase; variants map to one canonical display name.
+
+# "indian" for the adjective ("construed in accordance with Indian law")
+INDIA_NAMES = ["india", "indian", "republic of india", "union of india", "bharat"]
+
+# States and Union Territories
+INDIAN_STATES = {
+    "andhra pradesh": "Andhra Pradesh",
+    "arunachal pradesh": "Arunachal Pradesh",
+    "assam": "Assam",
+    "bihar": "Bihar",
+    "chhattisgarh": "Chhattisgarh",
+    "goa": "Goa",
+    "gujarat": "Gujarat",
+    "haryana": "Haryana",
+    "himachal pradesh": "Himachal Pradesh",
+    "jharkhand": "Jharkhand",
+    "karnataka": "Karnataka",
+    "kerala": "Kerala",
+    "madhya pradesh": "Madhya Pradesh",
+    "maharashtra": "Maharashtra",
+    "manipur": "Manipur",
+    "meghalaya": "Meghalaya",
+    "mizoram": "Mizoram",
+    "nagaland": "Nagaland",
+    "odisha": "Odisha",
+    "orissa": "Odisha",
+    "punjab": "Punjab",
+    "rajasthan": "Rajasthan",
+    "sikkim": "Sikkim",
+    "tamil nadu": "Tamil Nadu",
+    "telangana": "Telangana",
+    "tripura": "Tripura",
+    "uttar pradesh": "Uttar Pradesh",
+    "uttarakhand": "Uttarakhand",
+    "west bengal": "West Bengal",
+    "andaman and nicobar islands": "Andaman and Nicobar Islands",
+    "chandigarh": "Chandigarh",
+    "dadra and nagar haveli and daman and diu": "Dadra and Nagar Haveli and Daman and Diu",
+    "jammu and kashmir": "Jammu and Kashmir",
+    "ladakh": "Ladakh",
+    "lakshadweep": "Lakshadweep",
+    "puducherry": "Puducherry",
+    "pondicherry": "Puducherry",
+}
+
+# Cities with a High Court bench or a major commercial court, and common aliases
+INDIAN_CITIES = {
+    "new delhi": "New Delhi",
+    "delhi": "New Delhi",
+    "mumbai": "Mumbai",
+    "bombay": "Mumbai",
+    "bengaluru": "Bengaluru",
+    "bangalore": "Bengaluru",
+    "chennai": "Chennai",
+    "madras": "Chennai",
+    "kolkata": "Kolkata",
+    "calcutta": "Kolkata",
+    "hyderabad": "Hyderabad",
+    "secunderabad": "Hyderabad",
+    "pune": "Pune",
+    "ahmedabad": "Ahmedabad",
+    "gurugram": "Gurugram",
+    "gurgaon": "Gurugram",
+    "noida": "Noida",
+    "jaipur": "Jaipur",
+    "jodhpur": "Jodhpur",
+    "lucknow": "Lucknow",
+    "allahabad": "Prayagraj",
+    "prayagraj": "Prayagraj",
+    "patna": "Patna",
+    "bhopal": "Bhopal",
+    "jabalpur": "Jabalpur",
+    "indore": "Indore",
+    "nagpur": "Nagpur",
+    "aurangabad": "Aurangabad",
+    "panaji": "Panaji",
+    "ernakulam": "Ernakulam",
+    "kochi": "Kochi",
+    "cochin": "Kochi",
+    "thiruvananthapuram": "Thiruvananthapuram",
+    "cuttack": "Cuttack",
+    "bhubaneswar": "Bhubaneswar",
+    "guwahati": "Guwahati",
+    "shimla": "Shimla",
+    "ranchi": "Ranchi",
+    "raipur": "Raipur",
+    "bilaspur": "Bilaspur",
+    "dehradun": "Dehradun",
+    "nainital": "Nainital",
+    "srinagar": "Srinagar",
+    "jammu": "Jammu",
+    "amaravati": "Amaravati",
+    "visakhapatnam": "Visakhapatnam",
+    "coimbatore": "Coimbatore",
+    "madurai": "Madurai",
+    "mysuru": "Mysuru",
+    "mysore": "Mysuru",
+    "dharwad": "Dharwad",
+    "kalaburagi": "Kalaburagi",
+    "gangtok": "Gangtok",
+    "imphal": "Imphal",
+    "shillong": "Shillong",
+    "agartala": "Agartala",
+    "kohima": "Kohima",
+    "aizawl": "Aizawl",
+    "itanagar": "Itanagar",
+    "port blair": "Port Blair",
+}
+
+# Non-Indian governing laws / seats that make a contract unsupported
+FOREIGN_JURISDICTIONS = {
+    "singapore": "Singapore",
+    "england and wales": "England and Wales",
+    "england": "England and Wales",
+    "london": "London",
+    "united kingdom": "United Kingdom",
+    "new york": "New York",
+    "delaware": "Delaware",
+    "california": "California",
+    "united states": "United States",
+    "usa": "United States",
+    "dubai": "Dubai",
+    "united arab emirates": "United Arab Emirates",
+    "hong kong": "Hong Kong",
+    "paris": "Paris",
+    "france": "France",
+    "switzerland": "Switzerland",
+    "geneva": "Geneva",
+    "germany": "Germany",
+    "netherlands": "Netherlands",
+    "mauritius": "Mauritius",
+}
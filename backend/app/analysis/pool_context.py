@@ -0,0 +1,15 @@
+import multiprocessing
+import os
+
+# --- PROCESS POOL CONFIGURATION ---
+# How worker processes of the extraction, segmentation and analysis pools start.
+# Never "fork": the server forks from threads while other threads hold locks
+# (_PDFIUM_LOCK, stdout's), and a forked child inherits them locked forever.
+# "spawn" (default) or "forkserver" start workers from a clean interpreter.
+POOL_START_METHOD = os.getenv("POOL_START_METHOD", "spawn")
+
+def pool_context():
+    """Multiprocessing context for the app's ProcessPoolExecutors."""
+    if POOL_START_METHOD == "fork":
+        raise ValueError("POOL_START_METHOD=fork is not supported: use spawn or forkserver")
+    return multiprocessing.get_context(POOL_START_METHOD)
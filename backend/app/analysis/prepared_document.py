@@ -0,0 +1,110 @@
+import re
+from typing import List, Optional, Set, Tuple
+
+from app.analysis.document_buffer import DocumentBuffer, _LINE_BREAK_RUN
+from app.analysis.schemas import Clause
+
+_TOKEN = re.compile(r"\S+")
+
+class PreparedDocument:
+    """
+    A contract's text with the derived forms every analysis stage needs, built
+    once per request: the DocumentBuffer that clauses point into and the
+    lowercased text.
+
+    The jurisdiction detector scans `lower`, segment_clauses() builds its
+    clauses over `buffer`, and the rule layers read PreparedClause views whose
+    lowered text is a slice of `lower` instead of a fresh span + str.lower().
+    """
+
+    __slots__ = ("text", "buffer", "_lower")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.buffer = DocumentBuffer(text)
+        self._lower: Optional[str] = None
+
+    @classmethod
+    def of(cls, source) -> "PreparedDocument":
+        """`source` as a PreparedDocument: passed through if it already is one."""
+        return source if isinstance(source, PreparedDocument) else cls(source)
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    def span_lower(self, start: int, end: int) -> str:
+        """Lowercased DocumentBuffer.span_text(start, end), sliced from `lower`."""
+        lower = self.lower
+        if len(lower) != len(self.text):
+            # A few characters lowercase to two ("İ"), so offsets into `lower` drift
+            return self.buffer.span_text(start, end).lower()
+        raw = lower[start:end]
+        if "\n" not in raw:
+            return raw
+        buffer = self.buffer
+        if buffer.canonical is None:
+            buffer.span_text(start, end)  # Settles canonical
+        return raw if buffer.canonical else _LINE_BREAK_RUN.sub("\n", raw)
+
+    def prepare(self, clauses: List[Clause]) -> List["PreparedClause"]:
+        """Rule-layer views of `clauses`; spans of this document's buffer share `lower`."""
+        prepared = []
+        for clause in clauses:
+            if clause.document is self.buffer:
+                lower = self.span_lower(clause.start, clause.end)
+            else:
+                lower = clause.text_lower  # Block-built or explicit-text clauses
+            prepared.append(PreparedClause(clause, lower))
+        return prepared
+
+class PreparedClause:
+    """
+    A clause as the rule layers read it: lowercased text computed once, plus
+    word count, token offsets and whitespace-normalized text, each computed on
+    first use and then kept. `hits` is the set of rule phrases in the clause,
+    filled in by the risk engine (see PhraseMatcher).
+    """
+
+    __slots__ = ("clause", "clause_id", "text_lower", "hits", "_word_count", "_tokens", "_normalized")
+
+    def __init__(self, clause: Clause, text_lower: str):
+        self.clause = clause
+        self.clause_id = clause.clause_id
+        self.text_lower = text_lower
+        self.hits: Set[str] = set()
+        self._word_count: Optional[int] = None
+        self._tokens: Optional[List[Tuple[int, int]]] = None
+        self._normalized: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        return self.clause.text
+
+    @property
+    def word_count(self) -> int:
+        """Whitespace-separated words; only the count is kept, not the word list."""
+        if self._word_count is None:
+            self._word_count = len(self.text_lower.split())
+        return self._word_count
+
+    @word_count.setter
+    def word_count(self, count: int):
+        # For callers that split the text anyway (the risk engine)
+        self._word_count = count
+
+    @property
+    def tokens(self) -> List[Tuple[int, int]]:
+        """(start, end) of each word, relative to the clause text."""
+        if self._tokens is None:
+            self._tokens = [match.span() for match in _TOKEN.finditer(self.text_lower)]
+        return self._tokens
+
+    @property
+    def normalized(self) -> str:
+        """Lowered text with every whitespace run collapsed to one space."""
+        if self._normalized is None:
+            self._normalized = " ".join(self.text_lower.split())
+        return self._normalized
@@ -0,0 +1,224 @@
+import asyncio
+import contextlib
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.analysis.rules.engine import build_engine_result, evaluate_each_clause
+from app.analysis.rules.models import Flag, FlagRecord, RevisionDiff, RuleEngineResult
+from app.analysis.rules.rule_pack import PartialEvaluation, RulePack
+from app.analysis.schemas import Clause
+from app.core.metrics import record_rule_stats
+
+# --- REVISION STORE CONFIGURATION ---
+# /evaluate with a contract_id keeps the contract's last revision here: per-clause
+# rule results (keyed by a hash of the clause text) and flag advisories. The next
+# revision re-runs only clauses whose text changed through the rule layers and the
+# advisory LLM. In-memory LRU of the most recently evaluated contracts.
+REVISION_STORE_MAX_CONTRACTS = int(os.getenv("REVISION_STORE_MAX_CONTRACTS", "500"))
+
+# One clause's rule results: its flags per layer as (title, description, risk code), and
+# the document rules' counts over it. Independent of the clause's id and position.
+ClauseResult = Tuple[Dict[int, List[Tuple[str, str, int]]], List[Tuple[int, int]]]
+# (layer, title, description, clause hash or None for document flags)
+FlagKey = Tuple[int, str, str, Optional[str]]
+
+def clause_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class Revision:
+    """One evaluated revision of a contract, as the next revision reuses it."""
+
+    __slots__ = ("number", "pack_digest", "clause_results", "flags", "advisories", "_clause_hashes")
+
+    def __init__(self, number: int, pack_digest: str, clause_results: Dict[str, ClauseResult],
+                 flags: Dict[FlagKey, Tuple[Optional[str], str]], advisories: Dict[Tuple[str, str], Tuple[str, str]],
+                 clause_hashes: Dict[str, str]):
+        self.number = number
+        self.pack_digest = pack_digest
+        self.clause_results = clause_results
+        # flag key -> (clause_id, risk), to report flags that no longer fire
+        self.flags = flags
+        # (clause hash, flag title) -> (ai_advisory, ai_confidence)
+        self.advisories = advisories
+        self._clause_hashes = clause_hashes  # clause_id -> hash, in this revision
+
+    def flag_clause_hash(self, flag: Flag) -> Optional[str]:
+        return self._clause_hashes.get(flag.clause_id) if flag.clause_id is not None else None
+
+    def advisory(self, flag: Flag) -> Optional[Tuple[str, str]]:
+        """The advisory this flag's clause already got under the same title, if unchanged since."""
+        key = self.flag_clause_hash(flag)
+        return self.advisories.get((key, flag.title)) if key else None
+
+    def record_advisories(self, result: RuleEngineResult):
+        """Keeps the advisories of this revision's flags (after AI enrichment) for the next one."""
+        advisories = {}
+        for layer in result.layer_results:
+            for flag in layer.flags:
+                key = self.flag_clause_hash(flag)
+                if key and flag.ai_advisory is not None:
+                    advisories[(key, flag.title)] = (flag.ai_advisory, flag.ai_confidence)
+        self.advisories = advisories
+
+def _clause_result(partial: PartialEvaluation) -> ClauseResult:
+    flags = {layer: [(flag.title, flag.description, flag.risk) for flag in layer_flags]
+             for layer, layer_flags in partial.flags.items() if layer_flags}
+    return flags, partial.counts
+
+def _partial(digest: str, clause_id: str, result: ClauseResult) -> PartialEvaluation:
+    flags, counts = result
+    return PartialEvaluation(digest, {
+        layer: [FlagRecord(layer, clause_id, title, description, risk) for title, description, risk in layer_flags]
+        for layer, layer_flags in flags.items()
+    }, counts)
+
+def changed_clauses(clauses: List[Clause], pack: RulePack,
+                    previous: Optional[Revision]) -> Tuple[List[str], Dict[str, Clause]]:
+    """
+    The text hash of each clause, and the clauses that must run through the
+    rule layers: those without a result in `previous` (evaluated with the same
+    pack), one per distinct text, keyed by hash.
+    """
+    hashes = [clause_hash(clause.text) for clause in clauses]
+    cached = previous.clause_results if previous and previous.pack_digest == pack.digest else {}
+    changed: Dict[str, Clause] = {}
+    for clause, key in zip(clauses, hashes):
+        if key not in cached and key not in changed:
+            changed[key] = clause
+    return hashes, changed
+
+def evaluate_revision(contract_id: str, clauses: List[Clause], pack: RulePack,
+                      previous: Optional[Revision]) -> Tuple[RuleEngineResult, Revision]:
+    """
+    run_risk_engine() for a new revision of a contract. Clauses whose text is
+    unchanged since `previous` (evaluated with the same pack) reuse their rule
+    results; only the others run through the layers. The per-clause results
+    are then merged and aggregated as usual, so the result is identical to a
+    full run. Flags are marked "new" or "unchanged" against the previous
+    revision, and flags that no longer fire are listed in result.revision.
+
+    Runs the layers in this process; the server evaluates the changed clauses
+    on the analysis pool (AnalysisPool.evaluate_each) and calls merge_revision().
+    """
+    hashes, changed = changed_clauses(clauses, pack, previous)
+    fresh = evaluate_each_clause(list(changed.values()), None, pack)
+    return merge_revision(contract_id, clauses, pack, previous, hashes, changed, fresh)
+
+def merge_revision(contract_id: str, clauses: List[Clause], pack: RulePack, previous: Optional[Revision],
+                   hashes: List[str], changed: Dict[str, Clause],
+                   fresh: List[PartialEvaluation]) -> Tuple[RuleEngineResult, Revision]:
+    """
+    evaluate_revision() after the rule layers: `fresh` holds one
+    PartialEvaluation per clause of `changed` (see changed_clauses()), in order.
+    """
+    # 1. Rule results: fresh for changed clauses, the previous revision's for the rest
+    cached = previous.clause_results if previous and previous.pack_digest == pack.digest else {}
+    clause_results = {key: cached[key] for key in hashes if key in cached}
+    clause_results.update((key, _clause_result(partial)) for key, partial in zip(changed, fresh))
+
+    # 2. Merge in document order and re-aggregate
+    partials = [_partial(pack.digest, clause.clause_id, clause_results[key]) for clause, key in zip(clauses, hashes)]
+    result = build_engine_result(clauses, pack, partials)
+    record_rule_stats(pack.rules, fresh, result.layer_results)  # Reused results carry no timings
+
+    # 3. Diff flags against the previous revision
+    clause_hashes = {clause.clause_id: key for clause, key in zip(clauses, hashes)}
+    flags: Dict[FlagKey, Tuple[Optional[str], str]] = {}
+    previous_flags = previous.flags if previous else {}
+    flags_new = flags_unchanged = 0
+    for layer in result.layer_results:
+        for flag in layer.flags:
+            key = (flag.layer, flag.title, flag.description, clause_hashes.get(flag.clause_id))
+            flags[key] = (flag.clause_id, flag.risk)
+            if key in previous_flags:
+                flag.revision_status = "unchanged"
+                flags_unchanged += 1
+            else:
+                flag.revision_status = "new"
+                flags_new += 1
+    removed = [
+        Flag.from_rule(key[0], clause_id, key[1], key[2], risk)
+        for key, (clause_id, risk) in previous_flags.items() if key not in flags
+    ]
+
+    # Advisories follow the clause text, whatever the pack
+    advisories = {key: advisory for key, advisory in previous.advisories.items() if key[0] in clause_results} if previous else {}
+    revision = Revision((previous.number if previous else 0) + 1, pack.digest, clause_results, flags, advisories,
+                        clause_hashes)
+    result.revision = RevisionDiff(
+        contract_id=contract_id,
+        revision=revision.number,
+        previous_revision=previous.number if previous else None,
+        clauses_total=len(clauses),
+        clauses_evaluated=sum(1 for key in hashes if key in changed),
+        clauses_reused=sum(1 for key in hashes if key not in changed),
+        flags_new=flags_new,
+        flags_unchanged=flags_unchanged,
+        removed_flags=removed
+    )
+    return result, revision
+
+class RevisionStore:
+    """In-memory LRU of each contract's last Revision, keyed by owner and contract_id."""
+
+    def __init__(self, max_contracts: int):
+        self.max_contracts = max_contracts
+        self._lock = threading.Lock()
+        self._revisions: "OrderedDict[str, Revision]" = OrderedDict()
+        # key -> [lock, requests holding or waiting for it]; event loop only
+        self._editing: Dict[str, list] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @contextlib.asynccontextmanager
+    async def editing(self, key: str):
+        """
+        One request at a time per contract, from get() to put(): concurrent
+        revisions of the same contract each build on the one stored before
+        them, instead of both building on the same one and the last put() winning.
+        """
+        entry = self._editing.get(key)
+        if entry is None:
+            entry = self._editing[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._editing[key]
+
+    def get(self, key: str) -> Optional[Revision]:
+        with self._lock:
+            revision = self._revisions.get(key)
+            if revision is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._revisions.move_to_end(key)
+            return revision
+
+    def put(self, key: str, revision: Revision):
+        with self._lock:
+            self._revisions[key] = revision
+            self._revisions.move_to_end(key)
+            while len(self._revisions) > self.max_contracts:
+                self._revisions.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "contracts": len(self._revisions),
+                "max_contracts": self.max_contracts,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+revision_store = RevisionStore(REVISION_STORE_MAX_CONTRACTS)
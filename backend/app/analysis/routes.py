@@ -1,112 +1,323 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from app.analysis.text_extractor import extract_text
-import shutil
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from app.analysis.uploads import buffer_upload, BufferedUpload, UPLOAD_SPILL_THRESHOLD_BYTES
+from app.analysis.extraction_cache import extract_upload, get_extraction_cache
+from app.analysis.text_extractor import iter_pages, page_count, join_pages
+from app.analysis.extraction_pool import extraction_pool, ExtractionQueueFull, ExtractionSlot
+from app.analysis.analysis_pool import analysis_pool
+from app.analysis.revisions import Revision, changed_clauses, merge_revision, revision_store
+from app.analysis.rules.rule_pack import RULE_PACKS
+from app.analysis.lazy_document import LazyDocument
+from app.blockchain.hashing import hash_text
+from app.blockchain.file_hashes import record_file_hash
 import os
-import uuid
 import json
+import time
+import asyncio
 from typing import Optional, Dict, List
 from pydantic import BaseModel
 
 from app.auth.routes import get_current_user
-from app.analysis.jurisdiction import detect_jurisdiction
-from app.analysis.clause_segmenter import segment_clauses
-from app.analysis.schemas import ClauseSegmentationResult
-from app.analysis.rules.engine import run_risk_engine
+from app.analysis.clause_tree import build_clause_tree
+from app.analysis.block_extractor import extract_blocks
+from app.analysis.schemas import ClauseSegmentationResult, JurisdictionResult, TextBlock
 from app.analysis.rules.models import RuleEngineResult, GoverningLawDetail, AISummary, RiskLevel, PrecedentRequest, RedlineRequest
-from app.analysis.ai_summary import generate_summary, generate_batch_advisories
-from app.analysis.ai_deep_analysis import deep_analyze_contract
+from app.analysis.ai_summary import generate_summary, generate_batch_advisories, SUMMARY_CHAR_BUDGET
+from app.analysis.ai_deep_analysis import deep_analyze_contract, DEEP_ANALYSIS_CHAR_BUDGET
+from app.analysis.ai_chat import CHAT_CHAR_BUDGET
 from app.analysis.verification_schemas import VerificationResult
 from app.analysis.legal_knowledge.precedents import get_precedents
 from app.analysis.legal_knowledge.redlines import get_redline
 
 router = APIRouter()
 
-# Temporary storage path
-UPLOAD_DIR = "tmp"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# --- BATCH EVALUATION CONFIGURATION ---
+# /evaluate-batch streams one NDJSON line per contract. At most BATCH_CONCURRENCY
+# contracts of a batch are in flight at once (the analysis pool spreads them over
+# its workers), so a large portfolio never floods the pool or memory.
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "1000"))
+# /evaluate-batch/files buffers every upload before streaming starts, so it takes
+# far fewer items, and spills uploads to disk once the batch holds
+# BATCH_FILES_MEMORY_BYTES in memory
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "20"))
+BATCH_FILES_MEMORY_BYTES = int(os.getenv("BATCH_FILES_MEMORY_BYTES", str(32 * 1024 * 1024)))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", str(max(2, 2 * (os.cpu_count() or 1)))))
+
+# How much text each AI stage actually reads (/analyze?stage=...)
+STAGE_CHAR_BUDGETS = {
+    "summary": SUMMARY_CHAR_BUDGET,
+    "chat": CHAT_CHAR_BUDGET,
+    "deep_analysis": DEEP_ANALYSIS_CHAR_BUDGET
+}
 
 class SegmentRequest(BaseModel):
     text: str
     verify: bool = False
+    # Typed blocks from /analyze?blocks=true; when present, segmentation follows them
+    blocks: Optional[List[TextBlock]] = None
+    # Same id for every revision of a contract: /evaluate then re-runs only the
+    # clauses changed since the previous one and reports new / removed flags
+    contract_id: Optional[str] = None
 
 class FullAnalysisResult(BaseModel):
     rule_engine: RuleEngineResult
     verification: Optional[VerificationResult] = None
 
+def _extract_partial(upload: BufferedUpload, max_chars: Optional[int], headings: List[str]) -> dict:
+    """
+    Budgeted extraction: only the pages needed for the first `max_chars` characters,
+    or for the sections under `headings`. Runs on the extraction pool.
+    """
+    cache = get_extraction_cache()
+    cached = cache.get(f"{upload.sha256}{upload.file_ext}") if cache else None
+    doc = LazyDocument.from_text(cached) if cached is not None else LazyDocument(upload.source, upload.file_ext)
+
+    with doc:
+        result = {}
+        if headings:
+            sections = doc.pages_containing(headings)
+            text = join_pages(page_text for _, page_text in sections)
+            result["section_pages"] = [number for number, _ in sections]
+            if max_chars is not None:
+                text = text[:max_chars]
+        else:
+            text = doc.prefix(max_chars)
+            if not text:
+                raise ValueError("No extractable text found")
+
+        result.update({
+            "extracted_text": text,
+            "complete": doc.is_complete,
+            "pages_extracted": doc.pages_extracted,
+            "page_count": doc.page_count,  # 1 on a cache hit: page boundaries are not cached
+            "cache_hit": cached is not None
+        })
+        return result
+
+async def _record_file_hash(current_user: dict, upload: BufferedUpload, document_hash: str):
+    """
+    Pairs the upload's file_hash with the hash of its whole extracted text, so
+    /blockchain/store-proof can accept that file_hash. A failed write only
+    costs the proof its file_hash, never the analysis.
+    """
+    try:
+        await asyncio.to_thread(record_file_hash, current_user.get("uid"), upload.file_hash, document_hash)
+    except Exception as e:
+        print(f"File hash record failed: {e}")
+
 @router.post("/analyze")
 async def analyze_contract(
     file: UploadFile = File(...),
+    max_chars: Optional[int] = Query(None, gt=0),
+    stage: Optional[str] = Query(None, pattern="^(summary|chat|deep_analysis)$"),
+    headings: Optional[str] = Query(None, description="Comma-separated section headings"),
+    blocks: bool = Query(False, description="Also return typed heading/paragraph/table-cell blocks"),
     current_user: dict = Depends(get_current_user)
 ):
+    """
+    Extracts the contract text. By default the whole document is parsed.
+    With `max_chars` (or `stage`, which uses that AI stage's budget) only the
+    leading pages are parsed; with `headings` only the pages holding those sections.
+    With `blocks`, the typed blocks for /segment and /evaluate are returned as well.
+    """
     file_ext = os.path.splitext(file.filename)[1].lower()
     if file_ext not in [".pdf", ".docx"]:
          raise HTTPException(status_code=400, detail="Unsupported file format.")
 
-    temp_filename = f"{uuid.uuid4()}{file_ext}"
-    temp_path = os.path.join(UPLOAD_DIR, temp_filename)
-    
+    if stage and max_chars is None:
+        max_chars = STAGE_CHAR_BUDGETS[stage]
+    heading_list = [h.strip() for h in (headings or "").split(",") if h.strip()]
+
     try:
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        raw_text = extract_text(temp_path)
-        return {
-            "filename": file.filename,
-            "extracted_text": raw_text,
-            "status": "success"
-        }
+        # Parsed from memory; only very large uploads are spilled to a temp file.
+        # Re-uploads of the same bytes are served from the extraction cache.
+        # Extraction runs on the bounded extraction pool, never on the event loop,
+        # in one slot admitted before the upload is read.
+        with extraction_pool.reserve() as slot, await buffer_upload(file) as upload:
+            if max_chars is not None or heading_list:
+                partial = await slot.run(_extract_partial, upload, max_chars, heading_list)
+                return {
+                    "filename": file.filename,
+                    "file_hash": upload.file_hash,
+                    **partial,
+                    "disk_bytes_avoided": upload.disk_bytes_avoided,
+                    "status": "success"
+                }
+
+            raw_text, cache_hit = await slot.run(extract_upload, upload)
+            await _record_file_hash(current_user, upload, hash_text(raw_text))
+            response = {
+                "filename": file.filename,
+                "extracted_text": raw_text,
+                "file_hash": upload.file_hash,
+                "disk_bytes_avoided": upload.disk_bytes_avoided,
+                "cache_hit": cache_hit,
+                "status": "success"
+            }
+            if blocks:
+                response["blocks"] = await slot.run(extract_blocks, upload.source, upload.file_ext)
+            return response
+    except ExtractionQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+def _format_event(event: dict, stream_format: str) -> str:
+    if stream_format == "sse":
+        return f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+    return json.dumps(event) + "\n"
+
+async def _stream_extraction(upload: BufferedUpload, slot: ExtractionSlot, stream_format: str, current_user: dict):
+    """
+    Yields one event per extracted page, then a final "complete" event carrying
+    the full text and its document hash (same hash /blockchain/store-proof uses).
+    Each page, and the cache read and write, run on the extraction pool in the
+    stream's slot, so the event loop never blocks. When the stream ends (or the
+    client goes away) the page generator is closed, then the slot is released.
+    """
+    page_iter = None
+    try:
+        cache = get_extraction_cache()
+        cache_key = f"{upload.sha256}{upload.file_ext}"
+        cached = await slot.run(cache.get, cache_key) if cache else None
+
+        if cached is not None:
+            # Page boundaries are not cached; the whole text arrives in one event
+            full_text = cached
+        else:
+            total_pages = await slot.run(page_count, upload.source, upload.file_ext)
+            page_iter = iter_pages(upload.source, upload.file_ext)
+            pages = []
+            while True:
+                page_text = await slot.run(next, page_iter, None)
+                if page_text is None:
+                    break
+                pages.append(page_text)
+                number = len(pages)
+                yield _format_event({
+                    "event": "page",
+                    "page": number,
+                    "total_pages": total_pages,
+                    "text": page_text
+                }, stream_format)
+
+            full_text = join_pages(pages)
+            if not full_text:
+                raise ValueError("No extractable text found")
+            if cache:
+                await slot.run(cache.put, cache_key, full_text)
+
+        document_hash = hash_text(full_text)
+        await _record_file_hash(current_user, upload, document_hash)
+        yield _format_event({
+            "event": "complete",
+            "filename": upload.filename,
+            "extracted_text": full_text,
+            "document_hash": document_hash,
+            "file_hash": upload.file_hash,
+            "cache_hit": cached is not None,
+            "status": "success"
+        }, stream_format)
+    except Exception as e:
+        # Headers are already sent, so errors travel in-band
+        yield _format_event({"event": "error", "detail": str(e)}, stream_format)
     finally:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+        try:
+            if page_iter is not None:
+                # Closes the PDF document now, not whenever the generator is collected
+                await slot.run(page_iter.close)
+        except ValueError:
+            pass  # A cancelled page read is still running: the generator is collected after it
+        finally:
+            upload.close()
+            slot.release()
+
+@router.post("/analyze-stream")
+async def analyze_contract_stream(
+    file: UploadFile = File(...),
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Streaming variant of /analyze: emits NDJSON lines (or SSE events) as each
+    page is extracted, so the UI can show progress on long contracts.
+    """
+    file_ext = os.path.splitext(file.filename)[1].lower()
+    if file_ext not in [".pdf", ".docx"]:
+         raise HTTPException(status_code=400, detail="Unsupported file format.")
+
+    # Admission is decided up front: the stream holds its slot until it ends, and
+    # its pages are never rejected
+    try:
+        slot = extraction_pool.reserve()
+    except ExtractionQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+    try:
+        upload = await buffer_upload(file)
+    except BaseException:
+        slot.release()
+        raise
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    # The generator releases the slot when it ends; the background task covers a
+    # stream that never started (release is idempotent)
+    return StreamingResponse(_stream_extraction(upload, slot, format, current_user), media_type=media_type,
+                             background=BackgroundTask(slot.release))
 
 @router.post("/segment", response_model=ClauseSegmentationResult)
 async def segment_contract(request: SegmentRequest, current_user: dict = Depends(get_current_user)):
-    jurisdiction_result = detect_jurisdiction(request.text)
-    clauses = []
-    if jurisdiction_result.supported or jurisdiction_result.jurisdiction == "Unknown":
-         clauses = segment_clauses(request.text)
+    # Segmented on the analysis pool; foreign-law contracts get no clauses
+    jurisdiction_result, clauses = await analysis_pool.segment(request.text, request.blocks, skip_unsupported=True)
     
     return ClauseSegmentationResult(
         jurisdiction_result=jurisdiction_result,
-        clauses=clauses
+        clauses=clauses,
+        sections=build_clause_tree(clauses).section_refs()
     )
 
-@router.post("/evaluate", response_model=FullAnalysisResult)
-async def evaluate_contract(request: SegmentRequest, current_user: dict = Depends(get_current_user)):
-    if not request.text.strip():
-        raise HTTPException(status_code=400, detail="Contract text cannot be empty")
+def _governing_law(jurisdiction_result: JurisdictionResult) -> GoverningLawDetail:
+    return GoverningLawDetail(
+        country=jurisdiction_result.jurisdiction if jurisdiction_result.jurisdiction != "Unknown" else "India",
+        court=jurisdiction_result.court or "Unknown",
+        supported=jurisdiction_result.supported
+    )
 
-    # 1. Pipeline: Jurisdiction -> Segmentation -> Risk Engine
-    jurisdiction_result = detect_jurisdiction(request.text)
-    clauses = segment_clauses(request.text)
-    result = run_risk_engine(clauses)
-    
+async def _enrich(result: RuleEngineResult, text: str, revision: Optional[Revision] = None):
+    """
+    2. AI enrichment of a rule engine result, in place: summary, batched flag
+    advisories with precedents, and deep analysis when the rules found little.
+    With a contract `revision`, flags on unchanged clauses keep the advisory
+    they got before and only the others go to the LLM.
+    """
     print("Starting AI Enrichment Pipeline...")
 
     # A. Global Summary (1 API Call)
-    summary_data = await generate_summary(request.text)
+    summary_data = await generate_summary(text)
     result.ai_summary = AISummary(
         status=summary_data.get("status", "failed"),
         bullets=summary_data.get("summary", [])
     )
 
     # B. Flag Enrichment (Optimized Batching - 1 API Call)
-    clause_text_map = {c.clause_id: c.text for c in clauses}
     flags_to_enrich = []
     
-    # First pass: Link text and collect risks for batching
+    # First pass: Collect risks for batching
+    # (flags reference their clause by offset; original_text is filled when the response is serialized)
     all_flags = []
     for layer in result.layer_results:
         for flag in layer.flags:
             all_flags.append(flag)
-            if flag.clause_id in clause_text_map:
-                flag.original_text = clause_text_map[flag.clause_id]
             
             # Collect Medium/High risks to send to Gemini in one go
-            if flag.risk in [RiskLevel.HIGH, RiskLevel.MEDIUM] and flag.original_text:
+            if flag.risk in [RiskLevel.HIGH, RiskLevel.MEDIUM] and flag.start is not None:
+                previous = revision.advisory(flag) if revision else None
+                if previous:
+                    flag.ai_advisory, flag.ai_confidence = previous
+                    flag.precedents = get_precedents(flag.title)
+                    continue
                 flags_to_enrich.append({
-                    "clause_text": flag.original_text[:1500],
+                    "clause_text": result.flag_text(flag)[:1500],
                     "risk_type": flag.title
                 })
 
@@ -119,7 +330,7 @@ async def evaluate_contract(request: SegmentRequest, current_user: dict = Depend
         # Second pass: Apply AI data and add precedents
         for layer in result.layer_results:
             for flag in layer.flags:
-                if flag.title in adv_lookup:
+                if flag.title in adv_lookup and flag.ai_advisory is None:
                     match = adv_lookup[flag.title]
                     flag.ai_advisory = match.get("advisory", "Review carefully.")
                     flag.ai_confidence = match.get("confidence", "High")
@@ -132,18 +343,48 @@ async def evaluate_contract(request: SegmentRequest, current_user: dict = Depend
     if len(all_flags) < 3:
         print(f"Rule engine found only {len(all_flags)} flags. Triggering AI Deep Analysis...")
         try:
-            ai_deep = await deep_analyze_contract(request.text, all_flags)
+            ai_deep = await deep_analyze_contract(text, all_flags)
             if ai_deep.get("success"):
                 result.ai_deep_analysis = ai_deep.get("analysis")
         except Exception as e:
             print(f"AI Deep Analysis Failed: {e}")
 
-    # 3. Final Metadata
-    result.governing_law = GoverningLawDetail(
-        country=jurisdiction_result.jurisdiction if jurisdiction_result.jurisdiction != "Unknown" else "India",
-        court="New Delhi" if jurisdiction_result.jurisdiction == "India" else "Unknown",
-        supported=jurisdiction_result.supported
+async def _evaluate_revision(request: SegmentRequest, clauses, revision_key: str) -> RuleEngineResult:
+    """Evaluates, enriches and stores the next revision of a contract; call under revision_store.editing()."""
+    pack = RULE_PACKS.current()
+    previous = revision_store.get(revision_key)
+    hashes, changed = await asyncio.to_thread(changed_clauses, clauses, pack, previous)
+    # Changed clauses (all of them for a first revision) run on the analysis pool
+    fresh = await analysis_pool.evaluate_each(list(changed.values()), pack)
+    result, revision = await asyncio.to_thread(
+        merge_revision, request.contract_id, clauses, pack, previous, hashes, changed, fresh
     )
+    await _enrich(result, request.text, revision)
+    revision.record_advisories(result)
+    revision_store.put(revision_key, revision)
+    return result
+
+@router.post("/evaluate", response_model=FullAnalysisResult)
+async def evaluate_contract(request: SegmentRequest, current_user: dict = Depends(get_current_user)):
+    if not request.text.strip():
+        raise HTTPException(status_code=400, detail="Contract text cannot be empty")
+
+    # 1. Pipeline: Jurisdiction -> Segmentation -> Risk Engine
+    # CPU-bound, so it runs on the analysis process pool (sharded for long
+    # contracts) and is awaited; the event loop keeps serving other requests
+    if request.contract_id:
+        # Revision of a known contract: only changed clauses run through the layers,
+        # one request per contract at a time so each revision builds on the last
+        revision_key = f"{current_user.get('uid')}:{request.contract_id}"
+        jurisdiction_result, clauses = await analysis_pool.segment(request.text, request.blocks)
+        async with revision_store.editing(revision_key):
+            result = await _evaluate_revision(request, clauses, revision_key)
+    else:
+        jurisdiction_result, clauses, result = await analysis_pool.evaluate(request.text, request.blocks)
+        await _enrich(result, request.text)
+
+    # 3. Final Metadata
+    result.governing_law = _governing_law(jurisdiction_result)
     
     verification_result = None
     if request.verify:
@@ -155,6 +396,161 @@ async def evaluate_contract(request: SegmentRequest, current_user: dict = Depend
     
     return FullAnalysisResult(rule_engine=result, verification=verification_result)
 
+class BatchItem(BaseModel):
+    id: Optional[str] = None # Echoed back on the item's result line
+    text: str
+    blocks: Optional[List[TextBlock]] = None
+
+class BatchEvaluateRequest(BaseModel):
+    items: List[BatchItem]
+    enrich: bool = False # AI summary / advisories / deep analysis per contract (LLM calls)
+
+async def _evaluate_batch_item(index: int, item_id: Optional[str], load, enrich: bool) -> dict:
+    """One contract of a batch as a result or error event; never raises."""
+    started = time.perf_counter()
+    try:
+        text, blocks = await load()
+        if not text.strip():
+            raise ValueError("Contract text cannot be empty")
+        jurisdiction_result, _, result = await analysis_pool.evaluate(text, blocks)
+        if enrich:
+            await _enrich(result, text)
+        result.governing_law = _governing_law(jurisdiction_result)
+        return {
+            "event": "result",
+            "index": index,
+            "id": item_id,
+            "status": "success",
+            "document_hash": hash_text(text),
+            "rule_engine": result.model_dump(mode="json"),
+            "seconds": round(time.perf_counter() - started, 4)
+        }
+    except Exception as e:
+        return {
+            "event": "error",
+            "index": index,
+            "id": item_id,
+            "status": "failed",
+            "detail": str(e) or type(e).__name__,
+            "seconds": round(time.perf_counter() - started, 4)
+        }
+
+async def _stream_batch(items: list, enrich: bool, cleanup=None):
+    """
+    Evaluates (id, load) items, at most BATCH_CONCURRENCY at a time, and yields
+    one NDJSON line per contract as it completes (in completion order; "index"
+    is its position in the request), then a "complete" summary line.
+    """
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run(index: int, item_id: Optional[str], load):
+        async with semaphore:
+            return await _evaluate_batch_item(index, item_id, load, enrich)
+
+    tasks = [asyncio.create_task(run(index, item_id, load)) for index, (item_id, load) in enumerate(items)]
+    failed = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            event = await next_done
+            failed += event["status"] == "failed"
+            yield _format_event(event, "ndjson")
+        yield _format_event({
+            "event": "complete",
+            "total": len(items),
+            "succeeded": len(items) - failed,
+            "failed": failed,
+            "seconds": round(time.perf_counter() - started, 4)
+        }, "ndjson")
+    finally:
+        # Client gone mid-stream: drop the contracts not evaluated yet
+        for task in tasks:
+            task.cancel()
+        if cleanup:
+            cleanup()
+
+def _check_batch_size(count: int, limit: int = BATCH_MAX_ITEMS):
+    if not count:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if count > limit:
+        raise HTTPException(status_code=413, detail=f"Batch has {count} contracts; the limit is {limit}")
+
+@router.post("/evaluate-batch")
+async def evaluate_batch(request: BatchEvaluateRequest, current_user: dict = Depends(get_current_user)):
+    """
+    /evaluate for many contract texts in one request. Streams NDJSON: one
+    "result" (or "error") line per contract as soon as it is evaluated, then
+    a "complete" line. A failing contract never fails the batch.
+    """
+    _check_batch_size(len(request.items))
+
+    def loader(item: BatchItem):
+        async def load():
+            return item.text, item.blocks
+        return load
+
+    items = [(item.id, loader(item)) for item in request.items]
+    return StreamingResponse(_stream_batch(items, request.enrich), media_type="application/x-ndjson")
+
+@router.post("/evaluate-batch/files")
+async def evaluate_batch_files(
+    files: List[UploadFile] = File(...),
+    enrich: bool = Query(False, description="AI enrichment per contract (LLM calls)"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    /evaluate-batch for uploaded PDF / DOCX files: each is extracted on the
+    extraction pool (cache hits skip parsing), then evaluated. Result lines
+    carry the filename as "id". At most BATCH_MAX_FILES files per batch.
+    """
+    _check_batch_size(len(files), BATCH_MAX_FILES)
+    # One slot for the whole batch, held until its stream ends
+    try:
+        slot = extraction_pool.reserve()
+    except ExtractionQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+    # Buffered before streaming starts, like /analyze-stream: the UploadFiles are
+    # not ours to read once the response is returned. Large files spill to disk, and
+    # so does every file once the batch's in-memory uploads reach BATCH_FILES_MEMORY_BYTES.
+    uploads: List[Optional[BufferedUpload]] = []
+    memory_left = BATCH_FILES_MEMORY_BYTES
+
+    def cleanup():
+        for upload in uploads:
+            if upload is not None:
+                upload.close()
+        slot.release()
+
+    try:
+        for file in files:
+            if os.path.splitext(file.filename or "")[1].lower() not in [".pdf", ".docx"]:
+                uploads.append(None)
+                continue
+            upload = await buffer_upload(file, spill_threshold=min(memory_left, UPLOAD_SPILL_THRESHOLD_BYTES))
+            uploads.append(upload)
+            if upload.in_memory:
+                memory_left = max(0, memory_left - upload.size)
+    except BaseException:
+        cleanup()
+        raise
+
+    def loader(upload: Optional[BufferedUpload]):
+        async def load():
+            if upload is None:
+                raise ValueError("Unsupported file format.")
+            try:
+                # In the batch's slot: items are never rejected half-way through it
+                text, _ = await slot.run(extract_upload, upload)
+            finally:
+                upload.close()
+            return text, None
+        return load
+
+    items = [(file.filename, loader(upload)) for file, upload in zip(files, uploads)]
+    return StreamingResponse(_stream_batch(items, enrich, cleanup), media_type="application/x-ndjson",
+                             background=BackgroundTask(cleanup))
+
 @router.post("/precedents")
 async def fetch_precedents(request: PrecedentRequest, current_user: dict = Depends(get_current_user)):
     return get_precedents(request.flag_title)
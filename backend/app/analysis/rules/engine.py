@@ -1,49 +1,91 @@
-from typing import List
+from typing import List, Optional
 from app.analysis.schemas import Clause
-from app.analysis.rules.models import RuleEngineResult, LayerResult, RiskLevel
+from app.analysis.prepared_document import PreparedDocument
+from app.analysis.rules.models import RuleEngineResult
 from app.analysis.rules.scoring import aggregate_results
+from app.core.metrics import record_rule_stats, timed
 
-# Explicit imports ensure strict dependency tracking
-# If a layer file is missing, the application will fail to start (Fast Fail)
-from app.analysis.rules.layer1_structural import run_layer1
-from app.analysis.rules.layer2_termination import run_layer2
-from app.analysis.rules.layer3_liability import run_layer3
-from app.analysis.rules.layer4_employment import run_layer4
-from app.analysis.rules.layer5_ip_confidential import run_layer5
-from app.analysis.rules.layer6_dispute import run_layer6
-from app.analysis.rules.layer7_fairness import run_layer7
+# The rule layers are a declarative pack (rules/packs/default.json), compiled at
+# import: a broken default pack fails start-up, like a missing layer module did
+from app.analysis.rules.rule_pack import RULE_PACKS, PartialEvaluation, RulePack
 
-def run_risk_engine(clauses: List[Clause]) -> RuleEngineResult:
+def run_risk_engine(clauses: List[Clause], prepared: Optional[PreparedDocument] = None,
+                    pack: Optional[RulePack] = None) -> RuleEngineResult:
     """
     Orchestrates the rule-based risk analysis pipeline.
-    Executes all 7 layers sequentially and aggregates results.
-    
+    Evaluates every layer of the rule pack and aggregates results.
+
     Args:
         clauses: List of Clause objects from the segmentation phase.
-        
+        prepared: The request's PreparedDocument, if the clauses were segmented
+            from it. Each clause is lowercased once and shared by all layers.
+        pack: Rule pack to evaluate; defaults to the live pack (RULE_PACKS),
+            taken once so a hot reload never splits a request across packs.
+
     Returns:
         RuleEngineResult: Aggregated risk score and detailed flags.
     """
-    layer_results: List[LayerResult] = []
+    if pack is None:
+        pack = RULE_PACKS.current()
+    partial = evaluate_clauses(clauses, prepared, pack)
+    return build_engine_result(clauses, pack, [partial])
 
+def evaluate_clauses(clauses: List[Clause], prepared: Optional[PreparedDocument],
+                     pack: RulePack) -> PartialEvaluation:
+    """
+    The clause-level half of run_risk_engine(), for one contiguous run of a
+    contract's clauses (all of them, or one shard on the analysis pool).
+    """
     # --- EXECUTION PHASE ---
-    # Strictly sequential execution of all layers
-    # Each layer function MUST return a LayerResult object
-    
-    layer_results.append(run_layer1(clauses))
-    layer_results.append(run_layer2(clauses))
-    layer_results.append(run_layer3(clauses))
-    layer_results.append(run_layer4(clauses))
-    layer_results.append(run_layer5(clauses))
-    layer_results.append(run_layer6(clauses))
-    layer_results.append(run_layer7(clauses))
+    # Clause rules of every layer, plus the counts document rules need
+    return pack.evaluate_partial(_prepare_hits(clauses, prepared, pack))
+
+def evaluate_each_clause(clauses: List[Clause], prepared: Optional[PreparedDocument],
+                         pack: RulePack) -> List[PartialEvaluation]:
+    """
+    evaluate_clauses() with one PartialEvaluation per clause, for results
+    kept per clause across revisions of a contract (see revisions.py).
+    """
+    return pack.evaluate_each(_prepare_hits(clauses, prepared, pack))
+
+@timed("phrase_scan")
+def _prepare_hits(clauses: List[Clause], prepared: Optional[PreparedDocument], pack: RulePack) -> list:
+    if prepared is None:
+        prepared = PreparedDocument("")  # Clauses from elsewhere: each is lowercased from its own text, once
+    prepared_clauses = prepared.prepare(clauses)
+    # One split per clause feeds both the phrase vocabulary and the word counts
+    vocabulary = set()
+    for clause in prepared_clauses:
+        words = clause.text_lower.split()
+        clause.word_count = len(words)
+        vocabulary.update(words)
+    scan = pack.phrases.for_vocabulary(vocabulary)
+    for clause in prepared_clauses:
+        clause.hits = scan.hits(clause.text_lower)
+    return prepared_clauses
+
+def build_engine_result(clauses: List[Clause], pack: RulePack, partials: List[PartialEvaluation]) -> RuleEngineResult:
+    """
+    Merges the partial evaluations of consecutive runs of `clauses` (in
+    order) into the engine result: document rules, layer risks, verdict.
+    """
+    # One LayerRecords per layer of the pack, in pack order
+    layer_records = pack.finalize(partials)
 
     # --- AGGREGATION PHASE ---
-    overall_risk, score, recommendation = aggregate_results(layer_results)
+    overall_risk, score, recommendation = aggregate_results(layer_records)
+    # Rule counters and per-layer time, from the stats each partial carries
+    record_rule_stats(pack.rules, partials, layer_records)
 
-    return RuleEngineResult(
-        layer_results=layer_results,
+    # --- RESULT PHASE ---
+    # Flags that survived deduplication become models here, once and unvalidated (the
+    # engine built them). They point at their clause by offset; text is filled in on
+    # serialization.
+    clauses_by_id = {clause.clause_id: clause for clause in clauses}
+    return RuleEngineResult.model_construct(
+        layer_results=[layer.to_result(clauses_by_id) for layer in layer_records],
         overall_risk=overall_risk,
-        score=score,
-        recommendation=recommendation
+        score=float(score),
+        recommendation=recommendation,
+        rule_pack=pack.label
     )
@@ -1,12 +1,17 @@
 from enum import Enum
 from typing import List, Optional, Dict
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr, field_serializer
+from app.analysis.schemas import Clause
 
 class RiskLevel(str, Enum):
     LOW = "Low"
     MEDIUM = "Medium"
     HIGH = "High"
 
+# Inside the rule engine risks are codes (FlagRecord.risk), ordered by severity
+RISK_LEVELS = (RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH)
+RISK_CODES = {level: code for code, level in enumerate(RISK_LEVELS)}
+
 class AnalysisVerdict(str, Enum):
     PROCEED = "PROCEED"
     CAUTION = "PROCEED_WITH_CAUTION"
@@ -33,11 +38,44 @@ class Flag(BaseModel):
     title: str
     description: str
     risk: RiskLevel
+    # Offsets of the flagged clause in the document (see Clause.start / end)
+    start: Optional[int] = None
+    end: Optional[int] = None
+    # Set explicitly, or filled from the clause span when the result is serialized
     original_text: Optional[str] = None
     # AI Enrichment
     ai_advisory: Optional[str] = None
     ai_confidence: Optional[str] = None # Low/Medium/High
     precedents: Optional[List[PrecedentData]] = []
+    # Against the contract's previous revision (see RevisionDiff): "new" | "unchanged"
+    revision_status: Optional[str] = None
+
+    # The flagged clause (see RuleEngineResult.attach_clauses); not serialized itself
+    _clause: Optional[Clause] = PrivateAttr(default=None)
+
+    @field_serializer("original_text")
+    def _serialize_original_text(self, original_text: Optional[str]) -> Optional[str]:
+        # Clause text is only materialized here, at the API boundary
+        if original_text is None:
+            clause = self.__pydantic_private__["_clause"]
+            if clause is not None:
+                return clause.text
+        return original_text
+
+    @classmethod
+    def from_rule(cls, layer: int, clause_id: Optional[str], title: str, description: str, risk: RiskLevel,
+                  clause: Optional[Clause] = None) -> "Flag":
+        """
+        A flag from trusted rule engine output, linked to its clause as
+        attach_clauses() does: model_construct(), without validation, with the
+        fields Flag(...) plus attach_clauses() would have set.
+        """
+        if clause is None:
+            return cls.model_construct(layer=layer, clause_id=clause_id, title=title, description=description, risk=risk)
+        flag = cls.model_construct(layer=layer, clause_id=clause_id, title=title, description=description, risk=risk,
+                                   start=clause.start, end=clause.end)
+        flag._clause = clause
+        return flag
 
 class LayerResult(BaseModel):
     layer: int
@@ -45,10 +83,61 @@ class LayerResult(BaseModel):
     risk: RiskLevel
     positive_findings: List[str] = []
 
+class FlagRecord:
+    """
+    A flag inside the rule engine (RulePack to aggregate_results()): the
+    rule's fields, with the title shared by all the rule's flags and the
+    risk as a RISK_LEVELS code. Flags that survive deduplication become
+    Flag models once, in build_engine_result().
+    """
+
+    __slots__ = ("layer", "clause_id", "title", "description", "risk")
+
+    def __init__(self, layer: int, clause_id: Optional[str], title: str, description: str, risk: int):
+        self.layer = layer
+        self.clause_id = clause_id
+        self.title = title
+        self.description = description
+        self.risk = risk
+
+    def to_flag(self, clause: Optional[Clause] = None) -> Flag:
+        return Flag.from_rule(self.layer, self.clause_id, self.title, self.description, RISK_LEVELS[self.risk], clause)
+
+class LayerRecords:
+    """One layer's FlagRecords and risk code (RulePack.finalize()), until they become a LayerResult."""
+
+    __slots__ = ("layer", "flags", "risk", "positive_findings")
+
+    def __init__(self, layer: int, flags: List[FlagRecord], risk: int):
+        self.layer = layer
+        self.flags = flags
+        self.risk = risk
+        self.positive_findings: List[str] = []
+
+    def to_result(self, clauses_by_id: Dict[str, Clause]) -> LayerResult:
+        return LayerResult.model_construct(
+            layer=self.layer,
+            flags=[flag.to_flag(clauses_by_id.get(flag.clause_id)) for flag in self.flags],
+            risk=RISK_LEVELS[self.risk],
+            positive_findings=list(self.positive_findings)
+        )
+
 class AISummary(BaseModel):
     status: str # "success" | "failed"
     bullets: List[str]
 
+class RevisionDiff(BaseModel):
+    """How a revision of a contract (evaluated with a contract_id) differs from the previous one."""
+    contract_id: str
+    revision: int
+    previous_revision: Optional[int] = None
+    clauses_total: int
+    clauses_evaluated: int # Changed (or new) clauses run through the rule layers
+    clauses_reused: int # Unchanged clauses whose previous results were reused
+    flags_new: int
+    flags_unchanged: int
+    removed_flags: List[Flag] = [] # Flags of the previous revision that no longer fire
+
 class RuleEngineResult(BaseModel):
     layer_results: List[LayerResult]
     overall_risk: RiskLevel
@@ -57,6 +146,25 @@ class RuleEngineResult(BaseModel):
     governing_law: Optional[GoverningLawDetail] = None
     ai_summary: Optional[AISummary] = None
     ai_deep_analysis: Optional[Dict] = None # For non-employment contracts
+    rule_pack: Optional[str] = None # Label of the rule pack that produced the flags
+    revision: Optional[RevisionDiff] = None
+
+    def attach_clauses(self, clauses: List[Clause]):
+        """Links flags to their clauses by offset (Flag.start / end), without copying text."""
+        by_id = {clause.clause_id: clause for clause in clauses}
+        for layer in self.layer_results:
+            for flag in layer.flags:
+                clause = by_id.get(flag.clause_id)
+                if clause is not None:
+                    flag.start, flag.end = clause.start, clause.end
+                    flag.__pydantic_private__["_clause"] = clause
+
+    def flag_text(self, flag: Flag) -> Optional[str]:
+        """The flagged clause's text: original_text if set, else read from the clause span."""
+        if flag.original_text is not None:
+            return flag.original_text
+        clause = flag.__pydantic_private__["_clause"]
+        return clause.text if clause is not None else None
 
 class PrecedentRequest(BaseModel):
     layer: int
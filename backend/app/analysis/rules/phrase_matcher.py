@@ -0,0 +1,68 @@
+from typing import Dict, Iterable, List, Optional, Set
+
+class PhraseMatcher:
+    """
+    Every trigger and guard phrase of the rule layers, compiled once.
+
+    A clause is scanned once per document into a hit set, which all seven
+    layers test with set lookups instead of repeating `"phrase" in text`.
+    Hits have exactly the semantics of `phrase in text` (substrings, so
+    "usa" hits in "usage", like the layers always did).
+
+    CPython's `in` is a C substring search, several times faster per
+    character than a regex automaton, so the matcher does fewer `in` checks
+    rather than one regex pass:
+    - Gates: a phrase is only searched for in clauses that contain its gate,
+      the longest other phrase inside it.
+      "company shall indemnify" is skipped unless "company shall" hit.
+    - Vocabulary pruning: phrases with a word that is not part of any token of
+      the document are dropped for the whole document up front.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases: List[str] = sorted({phrase.lower() for phrase in phrases})
+        # phrase -> longest other phrase inside it (None: always searched)
+        self._gates: Dict[str, Optional[str]] = {
+            phrase: max((gate for gate in self.phrases if gate != phrase and gate in phrase),
+                        key=len, default=None)
+            for phrase in self.phrases
+        }
+
+    def for_vocabulary(self, vocabulary: Set[str]) -> "PhraseScan":
+        """Scanner for one document, given the set of str.split() tokens of its lowercased clauses."""
+        tokens = "\n".join(vocabulary)
+        # Each word of an occurring phrase lies inside one token of the text
+        present = {phrase for phrase in self.phrases if all(word in tokens for word in phrase.split())}
+
+        roots: List[str] = []
+        children: Dict[str, List[str]] = {}
+        for phrase, gate in self._gates.items():
+            if phrase not in present:
+                continue
+            if gate is None or gate not in present:
+                roots.append(phrase)
+            else:
+                children.setdefault(gate, []).append(phrase)
+        return PhraseScan(roots, children)
+
+class PhraseScan:
+    """PhraseMatcher pruned to one document's vocabulary."""
+
+    __slots__ = ("_roots", "_children")
+
+    def __init__(self, roots: List[str], children: Dict[str, List[str]]):
+        self._roots = roots
+        self._children = children
+
+    def hits(self, text: str) -> Set[str]:
+        """Every phrase in `text` (lowercased)."""
+        children = self._children
+        hits = {phrase for phrase in self._roots if phrase in text}
+        pending = [phrase for phrase in hits if phrase in children]
+        while pending:
+            for phrase in children[pending.pop()]:
+                if phrase in text:
+                    hits.add(phrase)
+                    if phrase in children:
+                        pending.append(phrase)
+        return hits
@@ -0,0 +1,516 @@
+import hashlib
+import json
+import os
+import re
+import string
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from app.analysis.rules.models import RISK_CODES, FlagRecord, LayerRecords, RiskLevel
+from app.analysis.rules.phrase_matcher import PhraseMatcher
+
+# --- RULE PACK CONFIGURATION ---
+# The rule layers are data (packs/default.json). With hot reload on, the pack
+# file's mtime is checked at most every RULE_PACK_RELOAD_SECONDS and a changed
+# file is compiled and swapped in; requests already running keep their pack.
+RULE_PACK_PATH = os.getenv("RULE_PACK_PATH", os.path.join(os.path.dirname(__file__), "packs", "default.json"))
+RULE_PACK_HOT_RELOAD = os.getenv("RULE_PACK_HOT_RELOAD", "true").lower() == "true"
+RULE_PACK_RELOAD_SECONDS = float(os.getenv("RULE_PACK_RELOAD_SECONDS", "2"))
+
+_RULE_KEYS = {"title", "description", "risk", "scope", "trigger", "guard", "near", "words_over", "numbers",
+              "first_of", "suppressed_by", "ratio"}
+_LAYER_KEYS = {"layer", "name", "when", "rules"}
+
+class RulePackError(Exception):
+    """A rule pack that cannot be loaded or compiled; the message names the rule."""
+
+class CompiledRule:
+    """
+    One rule of a pack. Phrase conditions are compiled into the pack's match
+    function; what is left here is the per-flag work (notice numbers,
+    proximity windows, description fields) for clauses that passed them.
+    """
+
+    __slots__ = ("layer", "title", "description", "risk", "risk_code", "scope", "near", "words_over", "numbers",
+                 "first_of", "suppressed_by", "ratio", "fixed_description")
+
+    def __init__(self, layer: int, title: str, description: str, risk: RiskLevel, scope: str):
+        self.layer = layer
+        self.title = sys.intern(title)  # Shared by every flag of the rule, and across reloads of the pack
+        self.description = description
+        self.risk = risk
+        self.risk_code = RISK_CODES[risk]
+        self.scope = scope
+        self.near: List[Tuple[str, str, int]] = []
+        self.words_over: Optional[int] = None
+        self.numbers: Optional[Tuple["re.Pattern", int, int]] = None
+        self.first_of: List[str] = []
+        self.suppressed_by: Set[str] = set()
+        self.ratio: Optional[dict] = None
+        # The description, formatted once, when it has no fields
+        self.fixed_description: Optional[str] = None
+
+    def _flag(self, clause_id: Optional[str], **fields) -> FlagRecord:
+        description = self.fixed_description
+        if description is None:
+            description = self.description.format(**fields)
+        return FlagRecord(self.layer, clause_id, self.title, description, self.risk_code)
+
+    def clause_flags(self, clause) -> List[FlagRecord]:
+        """Flags for a clause whose hits already satisfy the rule's phrase conditions."""
+        text_lower = clause.text_lower
+        for first, second, window in self.near:
+            if not _within(text_lower, first, second, window):
+                return []
+        fields = {}
+        if self.words_over is not None:
+            fields["word_count"] = clause.word_count
+        if self.first_of:
+            hits = clause.hits
+            match = next(phrase for phrase in self.first_of if phrase in hits)
+            fields["match"], fields["match_title"] = match, match.title()
+        if self.numbers is None:
+            return [self._flag(clause.clause_id, **fields)]
+        pattern, low, high = self.numbers
+        flags = []
+        for found in pattern.findall(text_lower):
+            try:
+                number = int(found)
+            except ValueError:
+                continue
+            if low <= number <= high:
+                flags.append(self._flag(clause.clause_id, number=number, **fields))
+        return flags
+
+    def document_counts(self, clauses) -> Tuple[int, int]:
+        """A "scope": "document" rule's phrase counts over `clauses`; counts of shards add up."""
+        return _count(clauses, self.ratio["count"]), _count(clauses, self.ratio["versus"])
+
+    def document_flags(self, counts: Tuple[int, int]) -> List[FlagRecord]:
+        """Flags of a document rule, given its counts over the whole contract."""
+        ratio = self.ratio
+        count, versus_count = counts
+        if count > ratio["count_over"] and count / (versus_count or 1) > ratio["ratio_over"]:
+            return [self._flag(None, count=count, versus_count=versus_count)]
+        return []
+
+def _count(clauses, phrases: List[str]) -> int:
+    # Occurrences, counted only in clauses that contain the phrase at all
+    return sum(clause.text_lower.count(phrase) for clause in clauses for phrase in phrases if phrase in clause.hits)
+
+def _within(text: str, first: str, second: str, window: int) -> bool:
+    """True if some `first` and some `second` in `text` are at most `window` characters apart."""
+    second_starts = []
+    start = text.find(second)
+    while start != -1:
+        second_starts.append(start)
+        start = text.find(second, start + 1)
+    start = text.find(first)
+    while start != -1:
+        end = start + len(first)
+        index = bisect_left(second_starts, start)
+        # Nearest occurrences of `second` starting at/after and before this one
+        if index < len(second_starts) and second_starts[index] - end <= window:
+            return True
+        if index > 0 and start - (second_starts[index - 1] + len(second)) <= window:
+            return True
+        start = text.find(first, start + 1)
+    return False
+
+class RulePack:
+    """
+    A compiled rule pack: the phrases its conditions test (one PhraseMatcher,
+    see engine.py), one generated function that maps a clause's hit set to
+    the rules it may fire, and the rules themselves.
+
+    Pack format (JSON):
+        {"name": ..., "version": ..., "layers": [
+            {"layer": 2, "name": "Termination", "when": <condition>, "rules": [<rule>, ...]}, ...]}
+
+    A condition is a phrase (true when the lowercased clause contains it) or
+    {"any": [...]}, {"all": [...]}, {"not": <condition>}. A rule has a title,
+    description and risk ("Low" / "Medium" / "High") and fires on a clause when
+    its layer's "when", its "trigger" and every other test below hold and its
+    "guard" does not:
+    - "near": [[phrase, phrase, window], ...]: both phrases occur at most
+      `window` characters apart.
+    - "words_over": N: the clause has more than N words ({word_count}).
+    - "first_of": [phrase, ...]: the first listed phrase the clause contains
+      ({match}, {match_title}).
+    - "numbers": {"pattern", "min", "max"}: one flag per regex match whose
+      first group, as an integer, is in [min, max] ({number}).
+    - "suppressed_by": [title, ...]: not if an earlier rule of the same layer
+      already flagged the clause.
+    Rules with "scope": "document" run once per contract instead, after the
+    layer's clause rules; "ratio": {"count", "versus", "count_over",
+    "ratio_over"} compares phrase occurrence counts ({count}, {versus_count}).
+    Flags come out per layer, clause by clause, in rule order.
+    """
+
+    def __init__(self, data: dict, source: str, digest: str, layers: List[int], rules: List[CompiledRule],
+                 phrases: PhraseMatcher, match: Callable[[Set[str], int], List[int]]):
+        self.data = data
+        self.source = source
+        self.name = str(data.get("name", "unnamed"))
+        self.version = str(data.get("version", 0))
+        self.digest = digest
+        self.layers = layers
+        self.rules = rules
+        self.phrases = phrases
+        self._match = match
+        self._document_rules = [rule for rule in rules if rule.scope == "document"]
+        self._document_indexes = [index for index, rule in enumerate(rules) if rule.scope == "document"]
+
+    @property
+    def label(self) -> str:
+        return f"{self.name} v{self.version} ({self.digest})"
+
+    def __reduce__(self):
+        # Pickled as its JSON (the match function is generated); see _unpickle_rule_pack
+        return _unpickle_rule_pack, (self.data, self.source, self.digest)
+
+    def evaluate(self, clauses) -> List[LayerRecords]:
+        """
+        Runs every rule over `clauses` (PreparedClause views with `hits` set,
+        see run_risk_engine) and returns one LayerRecords per layer.
+        """
+        return self.finalize([self.evaluate_partial(clauses)])
+
+    def evaluate_partial(self, clauses) -> "PartialEvaluation":
+        """
+        Clause rules over one contiguous run of a contract's clauses, plus the
+        document rules' counts over them. finalize() merges the runs, in order.
+        """
+        flags: Dict[int, List[FlagRecord]] = {layer: [] for layer in self.layers}
+        match, rules = self._match, self.rules
+        # Rule index -> [candidate clauses, flags, seconds], for metrics (see record_rule_stats)
+        stats: Dict[int, list] = {}
+        match_seconds = 0.0
+        perf_counter = time.perf_counter
+        for clause in clauses:
+            started = perf_counter()
+            fired = match(clause.hits, clause.word_count)
+            match_seconds += perf_counter() - started
+            if not fired:
+                continue
+            flagged: Set[Tuple[int, str]] = set()
+            for index in fired:
+                rule = rules[index]
+                entry = stats.get(index)
+                if entry is None:
+                    entry = stats[index] = [0, 0, 0.0]
+                entry[0] += 1
+                if rule.suppressed_by and any((rule.layer, title) in flagged for title in rule.suppressed_by):
+                    continue
+                started = perf_counter()
+                produced = rule.clause_flags(clause)
+                entry[2] += perf_counter() - started
+                if produced:
+                    entry[1] += len(produced)
+                    flags[rule.layer].extend(produced)
+                    flagged.add((rule.layer, rule.title))
+        counts = []
+        for index, rule in zip(self._document_indexes, self._document_rules):
+            started = perf_counter()
+            counts.append(rule.document_counts(clauses))
+            stats.setdefault(index, [0, 0, 0.0])[2] += perf_counter() - started
+        return PartialEvaluation(self.digest, flags, counts, (match_seconds, stats))
+
+    def evaluate_each(self, clauses) -> List["PartialEvaluation"]:
+        """evaluate_partial() of every clause on its own: results that can be kept per clause and reused."""
+        return [self.evaluate_partial([clause]) for clause in clauses]
+
+    def finalize(self, partials: List["PartialEvaluation"]) -> List[LayerRecords]:
+        """One LayerRecords per layer from the partial evaluations of consecutive runs of clauses."""
+        flags: Dict[int, List[FlagRecord]] = {layer: [] for layer in self.layers}
+        for partial in partials:
+            if partial.digest != self.digest:
+                raise ValueError(f"partial evaluation of rule pack {partial.digest}, not {self.digest}")
+            for layer, layer_flags in partial.flags.items():
+                flags[layer].extend(layer_flags)
+        # Document rules run after the layer's clause rules, on counts summed over all runs
+        for index, rule in enumerate(self._document_rules):
+            counts = tuple(sum(column) for column in zip(*(partial.counts[index] for partial in partials)))
+            flags[rule.layer].extend(rule.document_flags(counts or (0, 0)))
+
+        return [LayerRecords(layer, flags[layer], max((flag.risk for flag in flags[layer]), default=0))
+                for layer in self.layers]
+
+class PartialEvaluation:
+    """
+    RulePack.evaluate_partial() output: clause flags per layer and document
+    rule counts, plus timing stats: (phrase match seconds, {rule index:
+    [candidate clauses, flags, seconds]}), or None when not evaluated here.
+    """
+
+    __slots__ = ("digest", "flags", "counts", "stats")
+
+    def __init__(self, digest: str, flags: Dict[int, List[FlagRecord]], counts: List[Tuple[int, int]],
+                 stats: Optional[Tuple[float, Dict[int, list]]] = None):
+        self.digest = digest
+        self.flags = flags
+        self.counts = counts
+        self.stats = stats
+
+    def __getstate__(self):
+        # Flags travel from pool workers as plain tuples, without the class and layer of each
+        flags = {layer: [(flag.clause_id, flag.title, flag.description, flag.risk) for flag in layer_flags]
+                 for layer, layer_flags in self.flags.items()}
+        return self.digest, flags, self.counts, self.stats
+
+    def __setstate__(self, state):
+        self.digest, flags, self.counts, self.stats = state
+        intern = sys.intern
+        self.flags = {layer: [FlagRecord(layer, clause_id, intern(title), description, risk)
+                              for clause_id, title, description, risk in layer_flags]
+                      for layer, layer_flags in flags.items()}
+
+# digest -> RulePack, for packs unpickled in pool workers (compiled once per worker)
+_unpickled_packs: Dict[str, RulePack] = {}
+
+def _unpickle_rule_pack(data: dict, source: str, digest: str) -> RulePack:
+    pack = _unpickled_packs.get(digest)
+    if pack is None:
+        if len(_unpickled_packs) >= 4:
+            _unpickled_packs.clear()  # Old reloads
+        pack = _unpickled_packs[digest] = compile_rule_pack(data, source)
+    return pack
+
+class _Compiler:
+    """Validates a pack's JSON and generates its match function."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.phrases: Set[str] = set()
+
+    def fail(self, where: str, message: str):
+        raise RulePackError(f"{self.source}: {where}: {message}")
+
+    def phrase(self, value, where: str) -> str:
+        if not isinstance(value, str) or not value.strip():
+            self.fail(where, f"expected a non-empty phrase, got {value!r}")
+        phrase = value.lower()
+        self.phrases.add(phrase)
+        return phrase
+
+    def phrase_list(self, value, where: str) -> List[str]:
+        if not isinstance(value, list) or not value:
+            self.fail(where, f"expected a non-empty list of phrases, got {value!r}")
+        return [self.phrase(item, where) for item in value]
+
+    def condition(self, value, where: str) -> str:
+        """Python expression over `hits` for a condition."""
+        if isinstance(value, str):
+            return f"{self.phrase(value, where)!r} in hits"
+        if isinstance(value, dict) and len(value) == 1:
+            (op, argument), = value.items()
+            if op == "not":
+                return f"not ({self.condition(argument, where)})"
+            if op in ("any", "all") and isinstance(argument, list) and argument:
+                joiner = " or " if op == "any" else " and "
+                return "(" + joiner.join(self.condition(item, where) for item in argument) + ")"
+        self.fail(where, f"bad condition {value!r} (a phrase, or one of any / all / not)")
+
+    def integer(self, value, where: str, key: str) -> int:
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            self.fail(where, f"{key} must be a non-negative integer, got {value!r}")
+        return value
+
+    def rule(self, layer: int, spec, where: str, earlier_titles: Set[str]) -> Tuple[CompiledRule, List[str]]:
+        """The compiled rule and the expressions that must all hold for it to fire."""
+        if not isinstance(spec, dict):
+            self.fail(where, "a rule must be an object")
+        unknown = set(spec) - _RULE_KEYS
+        if unknown:
+            self.fail(where, f"unknown keys {sorted(unknown)}")
+        for key in ("title", "description", "risk"):
+            if not isinstance(spec.get(key), str) or not spec[key]:
+                self.fail(where, f"missing {key}")
+        where = f"{where} {spec['title']!r}"
+        try:
+            risk = RiskLevel(spec["risk"])
+        except ValueError:
+            self.fail(where, f"risk must be one of {[level.value for level in RiskLevel]}")
+        scope = spec.get("scope", "clause")
+        if scope not in ("clause", "document"):
+            self.fail(where, f"scope must be 'clause' or 'document', got {scope!r}")
+
+        rule = CompiledRule(layer, spec["title"], spec["description"], risk, scope)
+        tests: List[str] = []
+        fields: Set[str] = set()
+        if scope == "document":
+            other = set(spec) - {"title", "description", "risk", "scope", "ratio"}
+            if other or not isinstance(spec.get("ratio"), dict):
+                self.fail(where, "a document rule has exactly title, description, risk, scope and ratio")
+            ratio = spec["ratio"]
+            if set(ratio) != {"count", "versus", "count_over", "ratio_over"}:
+                self.fail(where, "ratio needs count, versus, count_over and ratio_over")
+            if not isinstance(ratio["ratio_over"], (int, float)) or isinstance(ratio["ratio_over"], bool):
+                self.fail(where, f"ratio_over must be a number, got {ratio['ratio_over']!r}")
+            rule.ratio = {
+                "count": self.phrase_list(ratio["count"], where),
+                "versus": self.phrase_list(ratio["versus"], where),
+                "count_over": self.integer(ratio["count_over"], where, "count_over"),
+                "ratio_over": ratio["ratio_over"],
+            }
+            fields = {"count", "versus_count"}
+        else:
+            if "ratio" in spec:
+                self.fail(where, "ratio is only for \"scope\": \"document\" rules")
+            if "trigger" in spec:
+                tests.append(self.condition(spec["trigger"], where))
+            if "guard" in spec:
+                tests.append(f"not ({self.condition(spec['guard'], where)})")
+            for near in spec.get("near", []):
+                if not (isinstance(near, list) and len(near) == 3):
+                    self.fail(where, f"near entries are [phrase, phrase, window], got {near!r}")
+                first, second = self.phrase(near[0], where), self.phrase(near[1], where)
+                rule.near.append((first, second, self.integer(near[2], where, "near window")))
+                tests.append(f"{first!r} in hits and {second!r} in hits")
+            if "words_over" in spec:
+                rule.words_over = self.integer(spec["words_over"], where, "words_over")
+                tests.append(f"word_count > {rule.words_over}")
+                fields.add("word_count")
+            if "first_of" in spec:
+                rule.first_of = self.phrase_list(spec["first_of"], where)
+                tests.append("(" + " or ".join(f"{phrase!r} in hits" for phrase in rule.first_of) + ")")
+                fields |= {"match", "match_title"}
+            if "numbers" in spec:
+                numbers = spec["numbers"]
+                if not isinstance(numbers, dict) or set(numbers) != {"pattern", "min", "max"}:
+                    self.fail(where, "numbers needs pattern, min and max")
+                try:
+                    pattern = re.compile(numbers["pattern"])
+                except (re.error, TypeError) as e:
+                    self.fail(where, f"bad numbers pattern: {e}")
+                if pattern.groups != 1:
+                    self.fail(where, "the numbers pattern needs exactly one group")
+                rule.numbers = (pattern, self.integer(numbers["min"], where, "min"),
+                                self.integer(numbers["max"], where, "max"))
+                fields.add("number")
+            suppressed_by = spec.get("suppressed_by", [])
+            if not isinstance(suppressed_by, list) or not set(suppressed_by) <= earlier_titles:
+                self.fail(where, f"suppressed_by must list titles of earlier rules in layer {layer}")
+            rule.suppressed_by = set(suppressed_by)
+
+        try:
+            used = {name for _, name, _, _ in string.Formatter().parse(rule.description) if name is not None}
+        except ValueError as e:
+            self.fail(where, f"bad description: {e}")
+        if not used <= fields:
+            self.fail(where, f"description uses {sorted(used - fields)}; this rule provides {sorted(fields)}")
+        if not used:
+            rule.fixed_description = sys.intern(rule.description.format())
+        return rule, tests
+
+    def compile(self, data) -> RulePack:
+        if not isinstance(data, dict) or not isinstance(data.get("layers"), list):
+            self.fail("pack", "expected an object with a list of layers")
+        lines = ["def match(hits, word_count):", "    fired = []"]
+        rules: List[CompiledRule] = []
+        layers: List[int] = []
+        for spec in data["layers"]:
+            if not isinstance(spec, dict) or not isinstance(spec.get("layer"), int) or \
+               not isinstance(spec.get("rules"), list):
+                self.fail("pack", f"a layer needs an integer layer and a list of rules, got {spec!r}")
+            layer = spec["layer"]
+            where = f"layer {layer}"
+            if layer in layers:
+                self.fail(where, "declared twice")
+            unknown = set(spec) - _LAYER_KEYS
+            if unknown:
+                self.fail(where, f"unknown keys {sorted(unknown)}")
+            layers.append(layer)
+            indent = "    "
+            if "when" in spec:
+                lines.append(f"    if {self.condition(spec['when'], where)}:")
+                indent = "        "
+            titles: Set[str] = set()
+            for number, rule_spec in enumerate(spec["rules"], 1):
+                rule, tests = self.rule(layer, rule_spec, f"{where} rule {number}", titles)
+                titles.add(rule.title)
+                if rule.scope == "clause":
+                    lines.append(f"{indent}if {' and '.join(tests) or 'True'}: fired.append({len(rules)})")
+                rules.append(rule)
+            if lines[-1].endswith(":"):
+                lines.append(f"{indent}pass")
+        lines.append("    return fired")
+
+        namespace: dict = {}
+        exec(compile("\n".join(lines), f"<rule pack {self.source}>", "exec"), namespace)
+        digest = hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()[:12]
+        return RulePack(data, self.source, digest, layers, rules, PhraseMatcher(self.phrases), namespace["match"])
+
+def compile_rule_pack(data, source: str = "<pack>") -> RulePack:
+    """Compiles a parsed pack (see RulePack for the format); raises RulePackError."""
+    return _Compiler(source).compile(data)
+
+def load_rule_pack(path: str) -> RulePack:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise RulePackError(f"{path}: {e}")
+    return compile_rule_pack(data, path)
+
+class RulePackStore:
+    """
+    The live rule pack, reloaded when its file changes.
+
+    current() is what each request calls once and then uses throughout, so a
+    reload never changes the rules under a running request: the new pack is
+    compiled off to the side and swapped in with one assignment. A pack that
+    fails to load or compile is reported and the previous one stays live.
+    Write pack files atomically (write a temporary file, then rename it).
+    """
+
+    def __init__(self, path: str, hot_reload: bool = True, reload_seconds: float = 2.0):
+        self.path = path
+        self.hot_reload = hot_reload
+        self.reload_seconds = reload_seconds
+        self.reloads = 0
+        self.failed_reloads = 0
+        self._lock = threading.Lock()
+        self._stamp = self._file_stamp()
+        self._pack = load_rule_pack(path)  # A broken pack at start-up fails fast
+        self._checked = time.monotonic()
+
+    def _file_stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def current(self) -> RulePack:
+        if self.hot_reload and time.monotonic() - self._checked >= self.reload_seconds:
+            self.reload_if_changed()
+        return self._pack
+
+    def reload_if_changed(self) -> bool:
+        """Reloads the pack if its file changed since the last load; True if a new pack went live."""
+        if not self._lock.acquire(blocking=False):
+            return False  # Another request is reloading; keep serving the current pack
+        try:
+            self._checked = time.monotonic()
+            stamp = self._file_stamp()
+            if stamp is None or stamp == self._stamp:
+                return False
+            self._stamp = stamp  # Taken before reading, so a write during the load triggers another
+            try:
+                pack = load_rule_pack(self.path)
+            except RulePackError as e:
+                self.failed_reloads += 1
+                print(f"Rule pack reload failed, keeping {self._pack.label}: {e}")
+                return False
+            self._pack = pack
+            self.reloads += 1
+            print(f"Rule pack reloaded: {pack.label}")
+            return True
+        finally:
+            self._lock.release()
+
+RULE_PACKS = RulePackStore(RULE_PACK_PATH, RULE_PACK_HOT_RELOAD, RULE_PACK_RELOAD_SECONDS)
@@ -1,9 +1,16 @@
 from typing import List, Tuple
-from app.analysis.rules.models import RiskLevel, LayerResult, Recommendation, AnalysisVerdict
+from app.analysis.rules.models import RISK_CODES, RiskLevel, LayerRecords, Recommendation, AnalysisVerdict
+from app.core.metrics import timed
 
-def aggregate_results(layer_results: List[LayerResult]) -> Tuple[RiskLevel, float, Recommendation]:
+_HIGH = RISK_CODES[RiskLevel.HIGH]
+_MEDIUM = RISK_CODES[RiskLevel.MEDIUM]
+
+@timed("aggregate_results")
+def aggregate_results(layer_results: List[LayerRecords]) -> Tuple[RiskLevel, float, Recommendation]:
     """
     Determines overall verdict and score based on detailed rules.
+    Works on the engine's flag records (see RulePack.finalize), before
+    they become Flag models.
     """
     high_risk_count = 0
     medium_risk_count = 0
@@ -13,37 +20,42 @@ def aggregate_results(layer_results: List[LayerResult]) -> Tuple[RiskLevel, floa
     # 4. DUPLICATE FLAG DEDUPLICATION
     # Tuple of (layer, title, clause_id)
     seen_flags = set()
-    unique_layer_results = []
     
     total_bonus_score = 0
 
     for result in layer_results:
-        # Filter flags
-        unique_flags = []
-        for flag in result.flags:
+        # Filter flags; the list is only rebuilt once a duplicate turns up
+        unique_flags = None
+        for index, flag in enumerate(result.flags):
             # Identifier: (Layer, Title, ClauseID)
             # If clause_id is None, use Description or something unique? 
             # Ideally ClauseID is present. If not, fallback to Title.
             flag_key = (flag.layer, flag.title, flag.clause_id or "global")
             
-            if flag_key not in seen_flags:
-                seen_flags.add(flag_key)
+            if flag_key in seen_flags:
+                if unique_flags is None:
+                    unique_flags = result.flags[:index]
+                continue
+
+            seen_flags.add(flag_key)
+            if unique_flags is not None:
                 unique_flags.append(flag)
-                
-                # Check Risk
-                if flag.risk == RiskLevel.HIGH:
-                    high_risk_count += 1
-                    # Check for Section 27 specific titles
-                    if "Non-Compete" in flag.title or "Employment Bond" in flag.title:
-                        section_27_violation = True
-                        
-                elif flag.risk == RiskLevel.MEDIUM:
-                    medium_risk_count += 1
-                    if result.layer in [3, 4]:
-                        critical_medium_found = True
+
+            # Check Risk
+            if flag.risk == _HIGH:
+                high_risk_count += 1
+                # Check for Section 27 specific titles
+                if "Non-Compete" in flag.title or "Employment Bond" in flag.title:
+                    section_27_violation = True
+
+            elif flag.risk == _MEDIUM:
+                medium_risk_count += 1
+                if result.layer in [3, 4]:
+                    critical_medium_found = True
         
-        # Replace flags in result with unique ones (Modification in place or new object)
-        result.flags = unique_flags
+        # Replace flags in result with unique ones (Modification in place)
+        if unique_flags is not None:
+            result.flags = unique_flags
         
         # Calculate Bonuses from Positive Findings (Max 20 total)
         for finding in result.positive_findings:
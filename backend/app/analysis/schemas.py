@@ -1,16 +1,94 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, PrivateAttr, computed_field, model_validator
+from typing import Any, List, Optional
+from app.analysis.document_buffer import DocumentBuffer
+
+class JurisdictionMatch(BaseModel):
+    kind: str # governing_law | court | india | state | city | foreign
+    text: str # as written in the contract
+    start: int
+    end: int
 
 class JurisdictionResult(BaseModel):
     jurisdiction: str
     supported: bool
     message: Optional[str] = None
+    state: Optional[str] = None # named by the governing law clause, e.g. "Maharashtra"
+    court: Optional[str] = None # court city, e.g. "Mumbai"
+    matches: List[JurisdictionMatch] = [] # the phrases and places the decision rests on
+
+# TextBlock kinds
+HEADING = "heading"
+PARAGRAPH = "paragraph"
+TABLE_CELL = "table_cell"
+
+class TextBlock(BaseModel):
+    kind: str # heading | paragraph | table_cell
+    text: str
+    style: Optional[str] = None # DOCX paragraph style name / PDF font name
+    font_size: Optional[float] = None # points
+    page: Optional[int] = None # 1-based, PDF only
 
 class Clause(BaseModel):
+    """
+    A clause as a (start, end) span of the shared DocumentBuffer. `text` is
+    built on access (and serialized), never stored per clause.
+    Clause(clause_id=..., clause_type=..., text="...") still works and keeps
+    that text as given.
+    """
     clause_id: str
     clause_type: str
-    text: str
-    
+    start: int = 0 # offsets into the document text
+    end: int = 0
+    _document: Optional[DocumentBuffer] = PrivateAttr(default=None)
+    _text: Optional[str] = PrivateAttr(default=None) # explicit text, when not a span
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _attach_source(cls, data: Any, handler):
+        # Clause(..., document=buffer) / Clause(..., text="...") / {"text": ...} from JSON
+        clause = handler(data)
+        if isinstance(data, dict):
+            if data.get("document") is not None:
+                clause._document = data["document"]
+            elif data.get("text") is not None:
+                clause._text = data["text"]
+                if "end" not in data:
+                    clause.end = clause.start + len(clause._text)
+        return clause
+
+    @classmethod
+    def span(cls, clause_id: str, clause_type: str, document: DocumentBuffer, start: int, end: int) -> "Clause":
+        """Segmenter fast path: a span of `document`, built without re-validation."""
+        clause = cls.model_construct(clause_id=clause_id, clause_type=clause_type, start=start, end=end)
+        clause._document = document
+        return clause
+
+    @computed_field
+    @property
+    def text(self) -> str:
+        private = self.__pydantic_private__  # Direct lookup; BaseModel.__getattr__ is slow on hot paths
+        if private["_text"] is not None:
+            return private["_text"]
+        document = private["_document"]
+        return document.span_text(self.start, self.end) if document is not None else ""
+
+    @property
+    def text_lower(self) -> str:
+        return self.text.lower()
+
+    @property
+    def document(self) -> Optional[DocumentBuffer]:
+        return self.__pydantic_private__["_document"]
+
+class SectionRef(BaseModel):
+    """One entry of the clause tree's section index (see clause_tree.py)."""
+    number: str # normalized: "4", "7.2", "7.2(b)"
+    title: str
+    clause_id: Optional[str] = None # segmenter clause containing the section
+    start: int
+    end: int # end of the section including its sub-clauses
+
 class ClauseSegmentationResult(BaseModel):
     jurisdiction_result: JurisdictionResult
     clauses: List[Clause]
+    sections: List[SectionRef] = []
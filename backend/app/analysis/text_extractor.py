@@ -1,61 +1,339 @@
+import io
 import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import pdfplumber
-from docx import Document
+import pypdfium2 as pdfium
+from app.analysis.docx_stream import docx_text
+from app.analysis.pool_context import pool_context
 
-def extract_text(file_path: str) -> str:
+# Bump whenever extraction output can change for the same input bytes.
+# It is part of the extraction cache key, so stale cached text is never served.
+EXTRACTOR_VERSION = "3"
+
+# --- PDF BACKEND CONFIGURATION ---
+# "pdfium" (default): pypdfium2 fast path, per-page fallback to pdfplumber for
+#                     pages that come back empty or garbled.
+# "pdfplumber":       pdfminer-based layout extraction for every page.
+EXTRACTION_BACKEND = os.getenv("EXTRACTION_BACKEND", "pdfium").lower()
+PDFIUM_GARBLED_RATIO = float(os.getenv("PDFIUM_GARBLED_RATIO", "0.05"))
+
+_PDFIUM_LOCK = threading.Lock()
+_GARBLED_CHARS = re.compile(r"[\ufffd\ue000-\uf8ff\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# --- DOCX CONFIGURATION ---
+# Table cells and footnotes are always part of the text. Headers/footers are
+# opt-in because they repeat on every page.
+DOCX_INCLUDE_HEADERS = os.getenv("DOCX_INCLUDE_HEADERS", "false").lower() == "true"
+
+# The extractor version plus every setting above that changes the text extracted
+# from the same bytes. The extraction cache is keyed by it, so text extracted under
+# another backend or DOCX option is never served after a configuration change.
+EXTRACTION_SIGNATURE = (
+    f"{EXTRACTOR_VERSION}-{EXTRACTION_BACKEND}-g{PDFIUM_GARBLED_RATIO:g}-h{int(DOCX_INCLUDE_HEADERS)}"
+)
+
+# --- PARALLEL PDF CONFIGURATION ---
+# Large PDFs are split into page ranges and extracted in a process pool.
+# Small PDFs stay on the serial path (pool start-up costs more than it saves).
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(os.cpu_count() or 1)))
+EXTRACTION_PARALLEL_MIN_PAGES = int(os.getenv("EXTRACTION_PARALLEL_MIN_PAGES", "32"))
+
+# Worker count -> pool. In the server only EXTRACTION_WORKERS is ever used,
+# created at startup by start_pdf_pool().
+_pdf_pools: Dict[int, ProcessPoolExecutor] = {}
+_pdf_pools_lock = threading.Lock()
+
+# A path on disk, the raw upload bytes, or a seekable binary file object
+ExtractionSource = Union[str, bytes, BinaryIO]
+
+def _get_pdf_pool(workers: int) -> ProcessPoolExecutor:
+    """Lazily creates the shared page-extraction pool for a worker count."""
+    with _pdf_pools_lock:
+        pool = _pdf_pools.get(workers)
+        if pool is None:
+            # Spawned, not forked: extraction threads may hold _PDFIUM_LOCK right now
+            pool = _pdf_pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=pool_context())
+        return pool
+
+def _warm_worker() -> int:
+    # Importing this module (pdfium, pdfplumber) is the worker's start-up cost
+    return os.getpid()
+
+def start_pdf_pool(workers: int = EXTRACTION_WORKERS):
+    """
+    Creates the page-extraction pool and starts its workers, so the first large
+    PDF does not pay for them. Called once at server startup.
+    """
+    if workers <= 1:
+        return
+    pool = _get_pdf_pool(workers)
+    for future in [pool.submit(_warm_worker) for _ in range(workers)]:
+        future.result()
+
+def _open_stream(source: ExtractionSource):
+    """Adapts a source to what pdfplumber accepts (path or file object)."""
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    if not isinstance(source, str):
+        source.seek(0)
+    return source
+
+def _pdfplumber_pages(source: Union[str, bytes], start: int, end: int) -> Iterator[str]:
+    with pdfplumber.open(_open_stream(source)) as pdf:
+        for page in pdf.pages[start:end]:
+            # extract_text() usually handles standard layout well
+            yield page.extract_text() or ""
+            page.close()  # Drops pdfplumber's per-page object cache
+
+def _looks_garbled(page_text: str) -> bool:
+    """Empty pages, or pages dominated by control / private-use / replacement chars."""
+    stripped = page_text.strip()
+    if not stripped:
+        return True
+    return len(_GARBLED_CHARS.findall(stripped)) / len(stripped) > PDFIUM_GARBLED_RATIO
+
+def _normalize_pdfium_text(page_text: str) -> str:
+    # pdfium emits CRLF line ends and keeps trailing spaces; match pdfplumber's shape
+    lines = page_text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip("\n")
+
+def _pdfium_pages(source: Union[str, bytes], start: int, end: int) -> Iterator[str]:
+    """pdfium fast path; pages it cannot read cleanly are re-extracted with pdfplumber."""
+    with _PDFIUM_LOCK:  # pdfium is not thread-safe within a process
+        try:
+            pdf = pdfium.PdfDocument(source)
+        except pdfium.PdfiumError:
+            pdf = None  # pdfium rejects some damaged files pdfminer can still read
+    if pdf is None:
+        yield from _pdfplumber_pages(source, start, end)
+        return
+
+    plumber_pdf = None
+    try:
+        for index in range(start, end):
+            # Lock is held per page, never across a yield
+            with _PDFIUM_LOCK:
+                page = pdf[index]
+                textpage = page.get_textpage()
+                page_text = _normalize_pdfium_text(textpage.get_text_bounded())
+                textpage.close()
+                page.close()
+
+            if _looks_garbled(page_text):
+                if plumber_pdf is None:
+                    plumber_pdf = pdfplumber.open(_open_stream(source))
+                page_text = plumber_pdf.pages[index].extract_text() or ""
+            yield page_text
+    finally:
+        with _PDFIUM_LOCK:
+            pdf.close()
+        if plumber_pdf is not None:
+            plumber_pdf.close()
+
+# Backend name -> page-range generator
+PDF_BACKENDS: Dict[str, Callable[[Union[str, bytes], int, int], Iterator[str]]] = {
+    "pdfium": _pdfium_pages,
+    "pdfplumber": _pdfplumber_pages
+}
+
+def _pdf_page_count(source: Union[str, bytes], backend: str) -> int:
+    if backend == "pdfium":
+        with _PDFIUM_LOCK:
+            try:
+                pdf = pdfium.PdfDocument(source)
+            except pdfium.PdfiumError:
+                pdf = None
+            if pdf is not None:
+                try:
+                    return len(pdf)
+                finally:
+                    pdf.close()
+    with pdfplumber.open(_open_stream(source)) as pdf:
+        return len(pdf.pages)
+
+def _extract_pdf_page_range(source: Union[str, bytes], start: int, end: int, backend: str) -> List[str]:
+    """
+    Extracts pages [start, end) of a PDF. Runs inside pool workers,
+    so it must stay a top-level (picklable) function.
+    """
+    return list(PDF_BACKENDS[backend](source, start, end))
+
+def _split_page_ranges(page_count: int, workers: int) -> List[Tuple[int, int]]:
+    """Splits [0, page_count) into roughly equal contiguous ranges, several per worker."""
+    chunk_count = min(page_count, workers * 4)
+    chunk_size = -(-page_count // chunk_count)  # ceil division
+    return [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+
+def _as_pdf_source(source: ExtractionSource, backend: str) -> Union[str, bytes]:
+    """Backends and pool workers take a path or the raw bytes."""
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown extraction backend: {backend}")
+    if not isinstance(source, (str, bytes)):
+        source.seek(0)
+        source = source.read()
+    return source
+
+def _extract_pdf_pages(
+    source: ExtractionSource,
+    workers: int,
+    min_parallel_pages: int,
+    backend: str
+) -> List[str]:
+    """Returns page texts in page order, fanning out to the pool for large files."""
+    source = _as_pdf_source(source, backend)
+    page_count = _pdf_page_count(source, backend)
+    if workers <= 1 or page_count < min_parallel_pages:
+        return _extract_pdf_page_range(source, 0, page_count, backend)
+
+    ranges = _split_page_ranges(page_count, workers)
+    pool = _get_pdf_pool(workers)
+    futures = [pool.submit(_extract_pdf_page_range, source, start, end, backend) for start, end in ranges]
+
+    pages: List[str] = []
+    for future in futures:  # Submission order == page order
+        pages.extend(future.result())
+    return pages
+
+def _resolve_ext(source: ExtractionSource, file_ext: Optional[str]) -> str:
+    """Validates the source and returns its lower-cased extension (".pdf" / ".docx")."""
+    if isinstance(source, str):
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"File not found: {source}")
+        if file_ext is None:
+            _, file_ext = os.path.splitext(source)
+    elif file_ext is None:
+        raise ValueError("file_ext is required when extracting from memory")
+
+    ext = file_ext.lower()
+
+    if ext == ".doc":
+         # python-docx only supports .docx
+         # We can't strictly support .doc without converting or using other libs (like antiword).
+         # For now, strict requirements said "DOCX Handling".
+         # If .doc is passed, it might fail or we raise unsupported.
+         # I will raise Unsupported for .doc to be safe unless instructed otherwise.
+         raise ValueError("Legacy .doc format not supported. Please convert to .docx")
+
+    if ext not in [".pdf", ".docx"]:
+        raise ValueError("Unsupported file format. Only PDF and DOCX are allowed.")
+    return ext
+
+def _docx_text(source: ExtractionSource) -> str:
+    try:
+        # Streaming reader: paragraphs and table cells in document order, constant memory
+        return docx_text(source, include_headers=DOCX_INCLUDE_HEADERS)
+    except Exception as e:
+         raise ValueError(f"Failed to process DOCX: {str(e)}")
+
+def join_pages(pages: Iterable[str]) -> str:
+    """
+    Joins page texts exactly as extract_text() does (one newline per non-empty
+    page, trimmed), so streamed and one-shot extraction produce the same string.
+    """
+    # Single join instead of repeated concatenation (quadratic on long PDFs)
+    return "".join(page_text + "\n" for page_text in pages if page_text).strip()
+
+def iter_page_chunks(pages: Iterable[str]) -> Iterator[str]:
+    """
+    join_pages() as a stream of chunks: "".join(iter_page_chunks(pages)) is
+    join_pages(pages) plus its trailing whitespace, so offsets into either agree.
+    """
+    leading = True
+    for page_text in pages:
+        if not page_text:
+            continue
+        chunk = page_text + "\n"
+        if leading:
+            chunk = chunk.lstrip()  # join_pages() trims the start of the document
+            if not chunk:
+                continue
+            leading = False
+        yield chunk
+
+def page_count(source: ExtractionSource, file_ext: Optional[str] = None, backend: Optional[str] = None) -> int:
+    """Number of pages iter_pages() will yield (DOCX counts as a single page)."""
+    ext = _resolve_ext(source, file_ext)
+    if ext == ".docx":
+        return 1
+    backend = EXTRACTION_BACKEND if backend is None else backend
+    return _pdf_page_count(_as_pdf_source(source, backend), backend)
+
+def iter_pages(
+    source: ExtractionSource,
+    file_ext: Optional[str] = None,
+    backend: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Generator version of extract_text(): yields page texts lazily, in page order,
+    without building the full document string. DOCX has no pages; its body is
+    yielded as one page.
+
+    join_pages(iter_pages(src)) == extract_text(src) for any extractable file.
+    """
+    ext = _resolve_ext(source, file_ext)
+
+    if ext == ".docx":
+        yield _docx_text(source)
+        return
+
+    backend = EXTRACTION_BACKEND if backend is None else backend
+    source = _as_pdf_source(source, backend)
+    try:
+        yield from PDF_BACKENDS[backend](source, 0, _pdf_page_count(source, backend))
+    except Exception as e:
+        raise ValueError(f"Failed to process PDF: {str(e)}")
+
+def extract_text(
+    source: ExtractionSource,
+    workers: Optional[int] = None,
+    min_parallel_pages: Optional[int] = None,
+    file_ext: Optional[str] = None,
+    backend: Optional[str] = None
+) -> str:
     """
     Extracts raw text from a PDF or DOCX contract file.
     
     Args:
-        file_path (str): Absolute path to the file.
+        source: Absolute path to the file, or the file contents as bytes /
+            a seekable binary file object (parsed in memory, no temp file).
+        workers (int, optional): Page-extraction processes for large PDFs.
+            Defaults to EXTRACTION_WORKERS.
+        min_parallel_pages (int, optional): Page count at which PDFs go parallel.
+            Defaults to EXTRACTION_PARALLEL_MIN_PAGES.
+        file_ext (str, optional): ".pdf" or ".docx". Required for in-memory sources.
+        backend (str, optional): PDF backend, "pdfium" or "pdfplumber".
+            Defaults to EXTRACTION_BACKEND.
         
     Returns:
-        str: extracted text content.
+        str: extracted text content. Identical for the serial and parallel paths.
         
     Raises:
         ValueError: If file type is unsupported or no text is found.
     """
     
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File not found: {file_path}")
-
-    _, ext = os.path.splitext(file_path)
-    ext = ext.lower()
+    ext = _resolve_ext(source, file_ext)
 
     text = ""
 
     # PDF Handling
     if ext == ".pdf":
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    # extract_text() usually handles standard layout well
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            pages = _extract_pdf_pages(
+                source,
+                EXTRACTION_WORKERS if workers is None else workers,
+                EXTRACTION_PARALLEL_MIN_PAGES if min_parallel_pages is None else min_parallel_pages,
+                EXTRACTION_BACKEND if backend is None else backend
+            )
         except Exception as e:
             raise ValueError(f"Failed to process PDF: {str(e)}")
+        text = join_pages(pages)
 
     # DOCX Handling
-    elif ext in [".docx", ".doc"]:
-        if ext == ".doc":
-             # python-docx only supports .docx
-             # We can't strictly support .doc without converting or using other libs (like antiword).
-             # For now, strict requirements said "DOCX Handling".
-             # If .doc is passed, it might fail or we raise unsupported.
-             # I will raise Unsupported for .doc to be safe unless instructed otherwise.
-             raise ValueError("Legacy .doc format not supported. Please convert to .docx")
-             
-        try:
-            doc = Document(file_path)
-            # Create a list of paragraph texts
-            paragraphs = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
-            text = "\n".join(paragraphs)
-        except Exception as e:
-             raise ValueError(f"Failed to process DOCX: {str(e)}")
-             
     else:
-        raise ValueError("Unsupported file format. Only PDF and DOCX are allowed.")
+        text = _docx_text(source)
 
     # Normalization (Strip excessive whitespace, normalize line breaks)
     # The requirement says: "Strip excessive whitespace... Normalize line breaks... DO NOT lowercase... DO NOT remove punctuation"
@@ -0,0 +1,115 @@
+import hashlib
+import os
+import tempfile
+from typing import List, Optional, Union
+from fastapi import UploadFile
+
+# --- UPLOAD BUFFERING ---
+# Uploads are parsed straight from memory. Only files above the threshold are
+# spilled to a temp file, so bursts of normal-sized contracts never touch disk.
+UPLOAD_SPILL_THRESHOLD_BYTES = int(os.getenv("UPLOAD_SPILL_THRESHOLD_BYTES", str(20 * 1024 * 1024)))
+UPLOAD_SPILL_DIR = os.getenv("UPLOAD_SPILL_DIR") or None  # None -> system temp dir
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Process-wide counters (surfaced in /health)
+UPLOAD_STATS = {
+    "in_memory_uploads": 0,
+    "spilled_uploads": 0,
+    "disk_bytes_avoided": 0
+}
+
+class BufferedUpload:
+    """
+    An uploaded file held in memory, or in a temp file once it crossed the spill threshold.
+    Use as a context manager so the spill file is always removed.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.file_ext = os.path.splitext(filename or "")[1].lower()
+        self.size = 0
+        self.sha256: Optional[str] = None  # hex digest of the raw bytes
+        self.data: Optional[bytes] = None
+        self.path: Optional[str] = None
+
+    @property
+    def in_memory(self) -> bool:
+        return self.path is None
+
+    @property
+    def disk_bytes_avoided(self) -> int:
+        return self.size if self.in_memory else 0
+
+    @property
+    def file_hash(self) -> Optional[str]:
+        """Raw-bytes digest in the 0x-prefixed bytes32 form hash_text() uses."""
+        return f"0x{self.sha256}" if self.sha256 else None
+
+    @property
+    def source(self) -> Union[bytes, str]:
+        """What extract_text() should read: the bytes, or the spill file path."""
+        return self.data if self.in_memory else self.path
+
+    def close(self):
+        if self.path and os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        self.path = None
+        self.data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+async def buffer_upload(file: UploadFile, spill_threshold: Optional[int] = None) -> BufferedUpload:
+    """
+    Reads an UploadFile in chunks, hashing each chunk as it arrives. Keeps it in
+    memory up to the spill threshold, then streams the remainder into a temp file.
+    """
+    threshold = UPLOAD_SPILL_THRESHOLD_BYTES if spill_threshold is None else spill_threshold
+    upload = BufferedUpload(file.filename)
+    chunks: List[bytes] = []
+    spill = None
+    digest = hashlib.sha256()
+
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            upload.size += len(chunk)
+            digest.update(chunk)
+
+            if spill is None and upload.size > threshold:
+                # Crossed the threshold: move what we have so far to disk
+                spill = tempfile.NamedTemporaryFile(
+                    suffix=upload.file_ext, dir=UPLOAD_SPILL_DIR, delete=False
+                )
+                upload.path = spill.name
+                spill.writelines(chunks)
+                chunks = []
+
+            if spill is not None:
+                spill.write(chunk)
+            else:
+                chunks.append(chunk)
+    except Exception:
+        if spill is not None:
+            spill.close()
+        upload.close()
+        raise
+
+    upload.sha256 = digest.hexdigest()
+    if spill is not None:
+        spill.close()
+        UPLOAD_STATS["spilled_uploads"] += 1
+    else:
+        upload.data = b"".join(chunks)
+        UPLOAD_STATS["in_memory_uploads"] += 1
+        UPLOAD_STATS["disk_bytes_avoided"] += upload.size
+
+    return upload
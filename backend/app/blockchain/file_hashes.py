@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Optional
+
+from app.core.firebase import db
+
+# Server-side record of which text each upload extracted to.
+# /analysis/analyze stores file_hash -> document_hash for the user when it
+# extracts a whole upload; /blockchain/store-proof only accepts a file_hash
+# recorded here for the same text, so clients cannot bind arbitrary bytes to a proof.
+
+def _uploads_ref(user_id: str):
+    return db.collection("proofs").document(user_id).collection("uploads")
+
+def record_file_hash(user_id: str, file_hash: str, document_hash: str):
+    """Records that this user's upload `file_hash` extracted to text hashing to `document_hash`."""
+    _uploads_ref(user_id).document(file_hash).set({
+        "document_hash": document_hash,
+        "created_at": datetime.utcnow()
+    })
+
+def recorded_document_hash(user_id: str, file_hash: str) -> Optional[str]:
+    """Document hash recorded for this user's upload `file_hash`, or None if it was never extracted."""
+    snapshot = _uploads_ref(user_id).document(file_hash).get()
+    if not snapshot.exists:
+        return None
+    return snapshot.to_dict().get("document_hash")
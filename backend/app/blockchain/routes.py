@@ -1,26 +1,28 @@
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from app.blockchain.service import store_proof, verify_proof
 from app.auth.routes import get_current_user
 from typing import Optional, List
 from app.blockchain.hashing import hash_text
-from app.analysis.text_extractor import extract_text
+from app.blockchain.file_hashes import recorded_document_hash
+from app.analysis.uploads import buffer_upload
+from app.analysis.extraction_cache import extract_upload
+from app.analysis.extraction_pool import extraction_pool, ExtractionQueueFull
+from app.analysis.text_extractor import EXTRACTION_BACKEND, extract_text
+from app.analysis.docx_stream import docx_paragraph_text
 from app.core.firebase import db
 from datetime import datetime
 import os
-import shutil
-import uuid
 from google.cloud.firestore import Query
 
 router = APIRouter()
 
-# Temporary storage for extraction
-UPLOAD_DIR = "tmp"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
 class ProofRequest(BaseModel):
     text: str
     filename: Optional[str] = None
+    # SHA-256 of the original upload bytes, as returned by /analysis/analyze
+    # (accepted only for the text that upload was extracted to)
+    file_hash: Optional[str] = Field(None, pattern="^0x[0-9a-f]{64}$")
 
 class ProofResponse(BaseModel):
     tx_hash: str
@@ -46,6 +48,7 @@ class VerifyResponse(BaseModel):
     message: str
     privacy_note: str = "No personal data stored on-chain"
     filename: Optional[str] = None
+    matched_on: Optional[str] = None # file_hash | document_hash
 
 class HistoryItem(BaseModel):
     document_hash: str
@@ -54,6 +57,22 @@ class HistoryItem(BaseModel):
     network: str
     filename: Optional[str] = "Document"
 
+def _find_record(user_id: str, field: str, value: str):
+    """First proof record of this user whose `field` equals `value`, as (snapshot, data)."""
+    docs_ref = db.collection("proofs").document(user_id).collection("records")
+    for d in docs_ref.where(field, "==", value).limit(1).stream():
+        return d, d.to_dict()
+    return None, None
+
+def _check_file_hash(user_id: str, file_hash: str, doc_hash: str):
+    """
+    Rejects a file hash unless /analysis/analyze recorded, for this user, that the
+    upload with these bytes extracted to text hashing to doc_hash. Unknown file
+    hashes are rejected too: the client's word alone never binds bytes to a proof.
+    """
+    if recorded_document_hash(user_id, file_hash) != doc_hash:
+        raise HTTPException(status_code=400, detail="file_hash does not belong to this text")
+
 @router.post("/store-proof", response_model=ProofResponse)
 async def store_document_proof(
     request: ProofRequest, 
@@ -72,17 +91,18 @@ async def store_document_proof(
     if not user_id:
         raise HTTPException(status_code=401, detail="User ID not found")
 
+    if request.file_hash:
+        _check_file_hash(user_id, request.file_hash, doc_hash)
+
     # 1. Idempotency Check (Firestore)
     # Query: proofs/{uid}/records where document_hash == doc_hash
     docs_ref = db.collection("proofs").document(user_id).collection("records")
-    query = docs_ref.where("document_hash", "==", doc_hash).limit(1).stream()
-    
-    existing = None
-    for d in query:
-        existing = d.to_dict()
-        break
+    snapshot, existing = _find_record(user_id, "document_hash", doc_hash)
 
     if existing:
+        if request.file_hash and not existing.get("file_hash"):
+            # Older proof: record the byte digest (checked above) so verify-file can skip parsing
+            snapshot.reference.update({"file_hash": request.file_hash})
         return {
             "tx_hash": existing.get("tx_hash"),
             "timestamp": existing.get("timestamp"),
@@ -108,7 +128,8 @@ async def store_document_proof(
             "contract_address": "0xfE0ED936D92AA844A06B8a4279330FE747f55420",
             "network": "Polygon Amoy",
             "created_at": datetime.utcnow(),
-            "filename": request.filename
+            "filename": request.filename,
+            "file_hash": request.file_hash
         }
         
         docs_ref.add(record_data)
@@ -150,28 +171,10 @@ async def _verify_logic(text: str, current_user: dict):
     user_id = current_user.get("uid")
 
     # 1. Check Firestore (Fastest / User Specific)
-    docs_ref = db.collection("proofs").document(user_id).collection("records")
-    query = docs_ref.where("document_hash", "==", doc_hash).limit(1).stream()
-    
-    record = None
-    for d in query:
-        record = d.to_dict()
-        break
+    _, record = _find_record(user_id, "document_hash", doc_hash)
 
     if record:
-        return {
-            "status": "verified",
-            "match": True,
-            "exists": True,
-            "document_hash": record.get("document_hash"),
-            "submitted_by": "You",
-            "on_chain_timestamp": record.get("timestamp"),
-            "blockchain_tx_hash": record.get("tx_hash"),
-            "tx_hash": record.get("tx_hash"),
-            "network": record.get("network"),
-            "message": "Document verified via personal history.",
-            "privacy_note": "No personal data stored on-chain."
-        }
+        return _verified_response(record, "document_hash")
 
     # 2. Return No Match
     return {
@@ -182,36 +185,72 @@ async def _verify_logic(text: str, current_user: dict):
         "message": "No matching integrity proof found for this account."
     }
 
+def _legacy_text(upload) -> Optional[str]:
+    """
+    The upload's text as extraction produced it before this backend's changes,
+    or None when it is the same: proofs stored back then hashed that text.
+    PDFs: pdfplumber's text, which pdfium does not reproduce byte for byte on
+    every PDF. DOCX: body paragraphs only, without table cells or footnotes.
+    """
+    if upload.file_ext == ".pdf" and EXTRACTION_BACKEND != "pdfplumber":
+        return extract_text(upload.source, file_ext=".pdf", backend="pdfplumber")
+    if upload.file_ext == ".docx":
+        return docx_paragraph_text(upload.source)
+    return None
+
+def _verified_response(record: dict, matched_on: str) -> dict:
+    return {
+        "status": "verified",
+        "match": True,
+        "exists": True,
+        "document_hash": record.get("document_hash"),
+        "submitted_by": "You",
+        "on_chain_timestamp": record.get("timestamp"),
+        "blockchain_tx_hash": record.get("tx_hash"),
+        "tx_hash": record.get("tx_hash"),
+        "network": record.get("network"),
+        "message": "Document verified via personal history.",
+        "privacy_note": "No personal data stored on-chain.",
+        "matched_on": matched_on
+    }
+
 @router.post("/verify-file", response_model=VerifyResponse)
 async def verify_uploaded_file(
     file: UploadFile = File(...), 
     current_user: dict = Depends(get_current_user)
 ):
-    # 1. Save & Extract
-    file_ext = os.path.splitext(file.filename)[1].lower()
-    temp_filename = f"{uuid.uuid4()}{file_ext}"
-    temp_path = os.path.join(UPLOAD_DIR, temp_filename)
-    
+    # 1. Buffer (in memory below the spill threshold), hashing the bytes as they arrive
     try:
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        raw_text = extract_text(temp_path)
-        
-        # 2. Verify Logic
-        result = await _verify_logic(raw_text, current_user)
+        with await buffer_upload(file) as upload:
+            # 2. Byte-identical to a proven upload: verified without any parsing
+            _, record = _find_record(current_user.get("uid"), "file_hash", upload.file_hash)
+            if record:
+                result = _verified_response(record, "file_hash")
+                result["filename"] = file.filename
+                return result
+
+            # 3. Bytes differ (re-saved, re-exported...): Extract (cached by upload SHA-256),
+            # in one extraction pool slot with the legacy retry below
+            with extraction_pool.reserve() as slot:
+                raw_text, _ = await slot.run(extract_upload, upload)
+
+                # 4. Verify Logic
+                result = await _verify_logic(raw_text, current_user)
+                if not result["match"]:
+                    # Proofs stored without a file_hash hashed the text extraction gave back then
+                    legacy_text = await slot.run(_legacy_text, upload)
+                    if legacy_text and legacy_text != raw_text:
+                        legacy_result = await _verify_logic(legacy_text, current_user)
+                        if legacy_result["match"]:
+                            result = legacy_result
         result["filename"] = file.filename
         return result
 
+    except ExtractionQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         print(f"Verify File Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if os.path.exists(temp_path):
-            try:
-                os.remove(temp_path)
-            except:
-                pass
 
 @router.get("/history", response_model=List[HistoryItem])
 async def get_proof_history(
@@ -1,4 +1,6 @@
 import logging
+import time
+from app.core.metrics import record_llm_call
 from app.core.gemini_provider import GeminiProvider
 from app.core.groq_provider import GroqProvider
 from app.core.sarvam_provider import SarvamProvider
@@ -48,6 +50,7 @@ class LLMRouter:
             if not provider:
                 continue
 
+            started = time.perf_counter()
             try:
                 logger.info(f"Attempting generation with provider: {provider.provider_name} for task: {task}")
                 
@@ -55,6 +58,7 @@ class LLMRouter:
                 result = await provider.generate(prompt)
                 
                 logger.info(f"LLM response generated by {provider.provider_name}")
+                record_llm_call(task, provider.provider_name, time.perf_counter() - started, ok=True)
                 
                 # Formatting: Handle both dict and raw string returns
                 if isinstance(result, dict):
@@ -68,6 +72,7 @@ class LLMRouter:
                 }
                 
             except Exception as e:
+                record_llm_call(task, provider.provider_name, time.perf_counter() - started, ok=False)
                 logger.error(f"Error encountered with {provider.provider_name}: {str(e)}")
                 logger.warning(f"Fallback triggered. Moving to next provider...")
                 continue
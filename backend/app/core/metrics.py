@@ -0,0 +1,263 @@
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+# --- METRICS CONFIGURATION ---
+# Stage timers (jurisdiction, segmentation, rule layers, LLM calls, ...) and rule
+# counters, exposed in Prometheus text format at /metrics. Each response also
+# carries its own breakdown in a Server-Timing header (durations in ms, summed
+# when a stage runs more than once, e.g. over shards or batch items).
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+
+# Seconds; stages range from sub-millisecond rule checks to multi-second LLM calls
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+StageSample = Tuple[str, float]  # (stage, seconds)
+
+class MetricsRegistry:
+    """
+    Counters and histograms with labels, rendered in the Prometheus text
+    exposition format. Thread-safe; one per process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta: Dict[str, Tuple[str, str]] = {}  # name -> (type, help), in declaration order
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, list]] = {}  # labels -> [bucket counts..., sum, count]
+
+    def counter(self, name: str, help_text: str):
+        self._meta[name] = ("counter", help_text)
+        self._counters[name] = {}
+
+    def histogram(self, name: str, help_text: str):
+        self._meta[name] = ("histogram", help_text)
+        self._histograms[name] = {}
+
+    def inc(self, name: str, labels: Labels, value: float = 1):
+        with self._lock:
+            series = self._counters[name]
+            series[labels] = series.get(labels, 0) + value
+
+    def observe(self, name: str, labels: Labels, seconds: float):
+        with self._lock:
+            series = self._histograms[name]
+            state = series.get(labels)
+            if state is None:
+                state = series[labels] = [0] * len(DURATION_BUCKETS) + [0.0, 0]
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    state[index] += 1
+            state[-2] += seconds
+            state[-1] += 1
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, (kind, help_text) in self._meta.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                if kind == "counter":
+                    for labels, value in sorted(self._counters[name].items()):
+                        lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                    continue
+                for labels, state in sorted(self._histograms[name].items()):
+                    for bound, count in zip(DURATION_BUCKETS, state):
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', _number(bound)),))} {count}")
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {state[-1]}")
+                    lines.append(f"{name}_sum{_labels(labels)} {_number(state[-2])}")
+                    lines.append(f"{name}_count{_labels(labels)} {state[-1]}")
+        return "\n".join(lines) + "\n"
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+REGISTRY = MetricsRegistry()
+REGISTRY.histogram("lexchain_stage_seconds", "Time spent per analysis stage.")
+REGISTRY.counter("lexchain_rule_candidates_total", "Clauses that passed a rule's phrase conditions.")
+REGISTRY.counter("lexchain_rule_flags_total", "Flags produced by a rule.")
+REGISTRY.counter("lexchain_rule_seconds_total", "Time spent in a rule's checks after phrase matching.")
+REGISTRY.counter("lexchain_layer_seconds_total", "Time spent in a rule layer's checks after phrase matching.")
+REGISTRY.counter("lexchain_llm_requests_total", "LLM provider calls by task, provider and outcome.")
+REGISTRY.histogram("lexchain_llm_seconds", "LLM provider call latency.")
+
+class StageSamples:
+    """(stage, seconds) samples: one request's breakdown, or a pool task's to ship back."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: List[StageSample] = []
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            self.samples.append((stage, seconds))
+
+    def server_timing(self, total: Optional[float] = None) -> str:
+        """Server-Timing header value: one metric per stage, in first-seen order."""
+        with self._lock:
+            totals: Dict[str, List] = {}
+            for stage, seconds in self.samples:
+                entry = totals.setdefault(stage, [0.0, 0])
+                entry[0] += seconds
+                entry[1] += 1
+        parts = []
+        for stage, (seconds, count) in totals.items():
+            part = f"{stage};dur={seconds * 1000:.2f}"
+            if count > 1:
+                part += f';desc="x{count}"'
+            parts.append(part)
+        if total is not None:
+            parts.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(parts)
+
+# The current request's breakdown (set by ServerTimingMiddleware), and inside
+# pool tasks the samples collected to return to the server process
+_request_samples: ContextVar[Optional[StageSamples]] = ContextVar("request_samples", default=None)
+_task_samples: ContextVar[Optional[StageSamples]] = ContextVar("task_samples", default=None)
+
+def record_stage(stage: str, seconds: float):
+    if not METRICS_ENABLED:
+        return
+    collector = _task_samples.get()
+    if collector is not None:
+        # Recorded where the task's caller merges it (record_samples)
+        collector.add(stage, seconds)
+        return
+    REGISTRY.observe("lexchain_stage_seconds", (("stage", stage),), seconds)
+    request = _request_samples.get()
+    if request is not None:
+        request.add(stage, seconds)
+
+def record_samples(samples: Optional[List[StageSample]]):
+    """Records stage samples a pool task collected (see collecting())."""
+    for stage, seconds in samples or ():
+        record_stage(stage, seconds)
+
+@contextmanager
+def collecting():
+    """Collects the stages timed inside the block instead of recording them, for pool tasks."""
+    samples = StageSamples()
+    token = _task_samples.set(samples)
+    try:
+        yield samples
+    finally:
+        _task_samples.reset(token)
+
+@contextmanager
+def stage_timer(stage: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started)
+
+def timed(stage: str):
+    """Decorator: records each call's duration as `stage`."""
+    def decorate(fn):
+        if not METRICS_ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record_stage(stage, time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+def record_llm_call(task: str, provider: str, seconds: float, ok: bool):
+    if not METRICS_ENABLED:
+        return
+    REGISTRY.inc("lexchain_llm_requests_total",
+                 (("task", task), ("provider", provider), ("status", "success" if ok else "error")))
+    REGISTRY.observe("lexchain_llm_seconds", (("task", task), ("provider", provider)), seconds)
+    record_stage(f"llm_{task}", seconds)
+
+def record_rule_stats(rules, partials, layer_results=()):
+    """
+    Rule counters from the stats of partial evaluations (see
+    RulePack.evaluate_partial), plus the "rule_match" and per-layer stages.
+    Document rule flags are counted from `layer_results`.
+    """
+    if not METRICS_ENABLED:
+        return
+    match_seconds = 0.0
+    merged: Dict[int, List] = {}
+    for partial in partials:
+        if partial.stats is None:
+            continue
+        seconds, per_rule = partial.stats
+        match_seconds += seconds
+        for index, (candidates, flags, rule_seconds) in per_rule.items():
+            entry = merged.setdefault(index, [0, 0, 0.0])
+            entry[0] += candidates
+            entry[1] += flags
+            entry[2] += rule_seconds
+    if not merged and not match_seconds:
+        return
+    document_flags: Dict[Tuple[int, str], int] = {}
+    for layer in layer_results:
+        for flag in layer.flags:
+            if flag.clause_id is None:
+                key = (flag.layer, flag.title)
+                document_flags[key] = document_flags.get(key, 0) + 1
+
+    record_stage("rule_match", match_seconds)
+    layer_seconds: Dict[int, float] = {}
+    for index, (candidates, flags, seconds) in sorted(merged.items()):
+        rule = rules[index]
+        labels = (("layer", str(rule.layer)), ("rule", rule.title))
+        flags += document_flags.get((rule.layer, rule.title), 0)
+        REGISTRY.inc("lexchain_rule_candidates_total", labels, candidates)
+        REGISTRY.inc("lexchain_rule_flags_total", labels, flags)
+        REGISTRY.inc("lexchain_rule_seconds_total", labels, seconds)
+        layer_seconds[rule.layer] = layer_seconds.get(rule.layer, 0.0) + seconds
+    for layer, seconds in sorted(layer_seconds.items()):
+        REGISTRY.inc("lexchain_layer_seconds_total", (("layer", str(layer)),), seconds)
+        record_stage(f"layer_{layer}", seconds)
+
+class ServerTimingMiddleware:
+    """ASGI middleware: collects the request's stage timings and sends them as a Server-Timing header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (METRICS_ENABLED and SERVER_TIMING_ENABLED):
+            await self.app(scope, receive, send)
+            return
+        samples = StageSamples()
+        token = _request_samples.set(samples)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                # Streaming responses start before their work ends: only stages done so far
+                header = samples.server_timing(total=time.perf_counter() - started)
+                message = {**message, "headers": [
+                    *message.get("headers", []),
+                    (b"server-timing", header.encode("latin-1")),
+                    (b"timing-allow-origin", b"*")
+                ]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_samples.reset(token)
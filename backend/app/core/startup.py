@@ -127,10 +127,26 @@ def init_rules():
     """Step 4: Rule Engine Verification"""
     try:
         from app.analysis.rules.engine import run_risk_engine
+        from app.analysis.rules.rule_pack import RULE_PACKS
         HEALTH_STATE["rules"] = True
-        print("Rule Engine subsystem ready.")
+        print(f"Rule Engine subsystem ready (rule pack {RULE_PACKS.current().label}).")
     except ImportError as e:
         raise RuntimeError(f"Rule Engine Import Failed: {e}")
+    except Exception as e:
+        # RulePackError: the pack file is missing or does not compile
+        raise RuntimeError(f"Rule Pack Load Failed: {e}")
+
+def init_process_pools():
+    """Step 6: Worker processes, started before any request thread exists"""
+    from app.analysis.text_extractor import start_pdf_pool, EXTRACTION_WORKERS
+    from app.analysis.analysis_pool import analysis_pool
+    from app.analysis.clause_segmenter import start_segment_pool, SEGMENT_WORKERS
+    start_pdf_pool()
+    analysis_pool.start()
+    start_segment_pool()
+    print(f"PDF extraction pool ready ({EXTRACTION_WORKERS} workers), "
+          f"analysis pool ready ({analysis_pool.workers} workers), "
+          f"segmentation pool ready ({SEGMENT_WORKERS} workers).")
 
 def validate_sarvam():
     """Step 5: Validate Sarvam AI API Key"""
@@ -157,4 +173,7 @@ def run_strict_startup():
     # 5. Sarvam
     validate_sarvam()
 
+    # 6. Process pools
+    init_process_pools()
+
     print("=================================================\nALL SYSTEMS GO. Backend ready.\n")
\ No newline at end of file
@@ -2,6 +2,7 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from app.auth.routes import router as auth_router
 from app.core import startup
+from app.core.metrics import REGISTRY, METRICS_ENABLED, ServerTimingMiddleware
 import os
 
 # --- STRICT STARTUP ---
@@ -12,7 +13,7 @@ app = FastAPI(title="LexChain Backend")
 
 # Debug Endpoint used for verification
 from google import genai
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 @app.get("/debug/gemini-test")
 async def debug_gemini_test():
@@ -49,6 +50,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Per-request stage breakdown in a Server-Timing header (see app/core/metrics.py)
+app.add_middleware(ServerTimingMiddleware)
 
 from app.analysis.routes import router as analysis_router
 from app.blockchain.routes import router as blockchain_router
@@ -68,7 +71,26 @@ def health_check():
     """
     Health Check. Returns 200 even if some subsystems are down.
     """
+    from app.analysis.uploads import UPLOAD_STATS
+    from app.analysis.extraction_cache import cache_stats
+    from app.analysis.extraction_pool import extraction_pool
+    from app.analysis.revisions import revision_store
     return {
         "status": "ok",
-        "subsystems": startup.HEALTH_STATE
+        "subsystems": startup.HEALTH_STATE,
+        "uploads": UPLOAD_STATS,
+        "extraction_cache": cache_stats(),
+        "extraction_pool": extraction_pool.stats(),
+        "revision_store": revision_store.stats()
     }
+
+@app.get("/metrics")
+def metrics():
+    """
+    Prometheus scrape endpoint: stage latency histograms (jurisdiction,
+    segmentation, phrase scan, rule match, per-layer, aggregation, LLM calls),
+    per-rule candidate / flag / time counters and LLM call counts.
+    """
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,145 @@
+"""
+Analysis pool: parity with the in-process pipeline, and request latency under
+concurrent mixed small/large workloads.
+
+1. Parity: AnalysisPool.evaluate() returns exactly what jurisdiction ->
+   segment_clauses() -> run_risk_engine() return in-process (jurisdiction,
+   clause offsets and text, every flag, score and verdict), for small
+   contracts, indented (non-canonical) text, block-driven segmentation, and
+   contracts sharded across workers. One contract spreads its "employee shall"
+   obligations so that no shard alone trips layer 1's asymmetry rule but the
+   whole contract does.
+2. Latency: large and small /evaluate pipelines arrive together. "inline"
+   runs the pipeline in the coroutine (the handler before the pool), "pool"
+   awaits the analysis pool. Reports per-request latency by size and the
+   longest event loop stall, measured by a 5ms ticker.
+
+Usage (from backend/):
+    python -m benchmarks.bench_analysis_pool [--workers 4] [--large 4] [--small 24] [--large-pages 300] [--rounds 3]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from app.analysis.analysis_pool import AnalysisPool
+from app.analysis.clause_segmenter import segment_blocks, segment_clauses
+from app.analysis.jurisdiction import detect_jurisdiction
+from app.analysis.prepared_document import PreparedDocument
+from app.analysis.rules.engine import run_risk_engine
+from app.analysis.schemas import HEADING, PARAGRAPH, TextBlock
+from benchmarks.bench_sharding import random_document
+from benchmarks.synthetic import generate_contract
+
+def run_inline(text: str, blocks=None):
+    prepared = PreparedDocument(text)
+    jurisdiction = detect_jurisdiction(prepared)
+    clauses = segment_blocks(blocks) if blocks else segment_clauses(prepared, workers=1)
+    return jurisdiction, clauses, run_risk_engine(clauses, None if blocks else prepared)
+
+def _snapshot(jurisdiction, clauses, result):
+    return (
+        jurisdiction.model_dump(),
+        [(c.clause_id, c.clause_type, c.start, c.end, c.text) for c in clauses],
+        result.model_dump(),
+    )
+
+def parity_cases():
+    rng = random.Random(20)
+    for seed in range(4):
+        yield f"synthetic-{seed}", generate_contract(2 + seed, seed=seed), None
+    yield "indented", generate_contract(6, seed=9).replace("\nThe ", "\n  The "), None
+    for n in range(4):
+        yield f"random-{n}", random_document(rng), None
+    # Twelve one-line sections with one employee obligation each: 12 > 5 only contract-wide
+    yield "asymmetry", "\n".join(f"{n}. DUTIES\nThe employee shall report weekly." for n in range(1, 13)), None
+    blocks = []
+    for n in range(1, 30):
+        blocks.append(TextBlock(kind=HEADING, text=f"{n}. TERMINATION"))
+        blocks.append(TextBlock(kind=PARAGRAPH, text="The Company may terminate without notice.\n  Employee shall indemnify the Company."))
+    yield "blocks", "\n".join(block.text for block in blocks), blocks
+
+async def check_parity(workers: int):
+    pools = {"one task": AnalysisPool(workers, 100000), "sharded": AnalysisPool(workers, 5),
+             "in-thread": AnalysisPool(0, 5)}
+    cases = 0
+    for name, text, blocks in parity_cases():
+        expected = _snapshot(*run_inline(text, blocks))
+        for mode, pool in pools.items():
+            got = _snapshot(*await pool.evaluate(text, blocks))
+            assert got == expected, f"{name} ({mode}): differs from the in-process pipeline"
+        cases += 1
+    asymmetry = [flag.title for layer in run_inline(parity_cases_text("asymmetry"))[2].layer_results
+                 for flag in layer.flags]
+    assert "Obligation Asymmetry" in asymmetry
+    print(f"parity: {cases} contracts x {len(pools)} modes identical, incl. asymmetry merged over shards")
+
+def parity_cases_text(name: str) -> str:
+    return next(text for case, text, _ in parity_cases() if case == name)
+
+async def _ticker(stalls: list, stop: asyncio.Event):
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(0.005)
+        now = time.perf_counter()
+        stalls.append(now - last - 0.005)
+        last = now
+
+async def _workload(mode: str, pool: AnalysisPool, docs):
+    async def one(kind: str, text: str, delay: float):
+        # Latency counts from the request's arrival, including time spent waiting for a blocked loop
+        await asyncio.sleep(delay)
+        if mode == "inline":
+            run_inline(text)
+        else:
+            await pool.evaluate(text)
+        return kind, time.perf_counter() - (started + delay)
+
+    stalls, stop = [], asyncio.Event()
+    ticker = asyncio.create_task(_ticker(stalls, stop))
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one(kind, text, delay) for kind, text, delay in docs))
+    total = time.perf_counter() - started
+    stop.set()
+    await ticker
+    return results, max(stalls), total
+
+def _ms(values, q):
+    return statistics.quantiles(values, n=20)[18] * 1000 if q == 95 else statistics.median(values) * 1000
+
+async def main_async(args):
+    await check_parity(args.workers)
+
+    rng = random.Random(7)
+    docs = [("large", generate_contract(args.large_pages, seed=i), rng.uniform(0, 0.5)) for i in range(args.large)]
+    docs += [("small", generate_contract(3, seed=100 + i), rng.uniform(0, 1.0)) for i in range(args.small)]
+    pool = AnalysisPool(args.workers, args.shard_clauses)
+    await asyncio.to_thread(pool.start)  # Start the workers outside the timing
+
+    print(f"\n{args.large} x {args.large_pages}-page + {args.small} x 3-page contracts, "
+          f"{args.workers} workers, shards of {args.shard_clauses} clauses")
+    print(f"{'mode':>7} {'small p50':>10} {'p95':>8} {'large p50':>10} {'p95':>8} {'loop stall':>11} {'total':>8}  (ms)")
+    for mode in ("inline", "pool"):
+        # Median of each column over the rounds
+        rows = []
+        for _ in range(args.rounds):
+            results, stall, total = await _workload(mode, pool, docs)
+            small = [t for kind, t in results if kind == "small"]
+            large = [t for kind, t in results if kind == "large"]
+            rows.append((_ms(small, 50), _ms(small, 95), _ms(large, 50), _ms(large, 95), stall * 1000, total * 1000))
+        columns = [statistics.median(column) for column in zip(*rows)]
+        print(f"{mode:>7} " + " ".join(f"{value:>{width}.1f}" for value, width in zip(columns, (10, 8, 10, 8, 11, 8))))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--shard-clauses", type=int, default=1000)
+    parser.add_argument("--large", type=int, default=4)
+    parser.add_argument("--large-pages", type=int, default=300)
+    parser.add_argument("--small", type=int, default=24)
+    parser.add_argument("--rounds", type=int, default=3)
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
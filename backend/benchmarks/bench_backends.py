@@ -0,0 +1,57 @@
+"""
+PDF backend comparison: pdfium fast path vs pdfplumber.
+
+Reports throughput and whether both backends produce the same text
+(exactly, and after collapsing whitespace) for every file in the corpus.
+
+Usage (from backend/):
+    python -m benchmarks.bench_backends [--pages 10 100] [--corpus DIR]
+"""
+import argparse
+import glob
+import os
+import tempfile
+import time
+
+from app.analysis import text_extractor
+from benchmarks.synthetic import generate_contract_lines, write_pdf
+
+BACKENDS = ["pdfplumber", "pdfium"]
+
+def _page_count(path: str) -> int:
+    return text_extractor._pdf_page_count(path, "pdfium")
+
+def _measure(path: str, backend: str):
+    started = time.perf_counter()
+    # Serial on purpose: this compares backends, not the process pool
+    text = text_extractor.extract_text(path, workers=1, backend=backend)
+    return text, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--corpus", help="Directory of real PDFs to include")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = []
+        for pages in args.pages:
+            path = os.path.join(tmp, f"synthetic_{pages}p.pdf")
+            write_pdf(path, generate_contract_lines(pages, seed=pages))
+            corpus.append(path)
+        if args.corpus:
+            corpus.extend(sorted(glob.glob(os.path.join(args.corpus, "*.pdf"))))
+
+        print(f"{'file':<32} {'pages':>6} {'plumber p/s':>12} {'pdfium p/s':>11} {'speedup':>8}  exact  ws-equal")
+        for path in corpus:
+            pages = _page_count(path)
+            results = {backend: _measure(path, backend) for backend in BACKENDS}
+            (plumber_text, plumber_s), (pdfium_text, pdfium_s) = results["pdfplumber"], results["pdfium"]
+
+            exact = plumber_text == pdfium_text
+            ws_equal = plumber_text.split() == pdfium_text.split()
+            print(f"{os.path.basename(path)[:32]:<32} {pages:>6} {pages / plumber_s:>12.1f} "
+                  f"{pages / pdfium_s:>11.1f} {plumber_s / pdfium_s:>7.1f}x  {str(exact):<5}  {ws_equal}")
+
+if __name__ == "__main__":
+    main()
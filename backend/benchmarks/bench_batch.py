@@ -0,0 +1,110 @@
+"""
+Batch evaluation: parity with /evaluate, per-item error isolation, and
+throughput of one streamed batch against one /evaluate call per contract.
+
+1. Parity: every "result" line of /evaluate-batch (without enrichment)
+   carries exactly the rule engine result of the in-process pipeline plus
+   governing law, as /evaluate returns it, for text and block contracts.
+2. Isolation: empty texts and loaders that raise (a corrupt upload) become
+   "error" lines at their own index; every other contract still succeeds
+   and the "complete" line counts both.
+3. Throughput: N contracts as one batch (BATCH_CONCURRENCY in flight) vs
+   awaited one after another, as a client calling /evaluate in a loop would.
+   Reports total time and time to the first result line.
+
+Usage (from backend/):
+    python -m benchmarks.bench_batch [--contracts 24] [--pages 20] [--workers 4] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from app.analysis import routes
+from app.analysis.analysis_pool import AnalysisPool
+from app.blockchain.hashing import hash_text
+from benchmarks.bench_analysis_pool import parity_cases, run_inline
+from benchmarks.synthetic import generate_contract
+
+def _items(contracts):
+    def loader(text, blocks):
+        async def load():
+            return text, blocks
+        return load
+    return [(name, loader(text, blocks)) for name, text, blocks in contracts]
+
+async def _collect(items, enrich=False):
+    lines = [json.loads(line) async for line in routes._stream_batch(items, enrich)]
+    return lines[:-1], lines[-1]
+
+async def check_parity():
+    cases = list(parity_cases())
+    events, complete = await _collect(_items(cases))
+    assert complete == {**complete, "event": "complete", "total": len(cases), "succeeded": len(cases), "failed": 0}
+    assert sorted(event["index"] for event in events) == list(range(len(cases)))
+    for event in events:
+        name, text, blocks = cases[event["index"]]
+        jurisdiction, _, expected = run_inline(text, blocks)
+        expected.governing_law = routes._governing_law(jurisdiction)
+        assert event["id"] == name and event["status"] == "success", event
+        assert event["document_hash"] == hash_text(text)
+        assert event["rule_engine"] == expected.model_dump(mode="json"), f"{name}: differs from /evaluate"
+    print(f"parity: {len(cases)} contracts, every result line identical to /evaluate")
+
+async def check_isolation():
+    async def corrupt():
+        raise ValueError("File is not a zip file")
+    good = [(f"good-{n}", generate_contract(2, seed=40 + n), None) for n in range(4)]
+    items = _items(good[:2] + [("empty", "  \n ", None)] + good[2:3]) + [("corrupt", corrupt)] + _items(good[3:])
+    events, complete = await _collect(items)
+    failed = {event["index"]: event for event in events if event["status"] == "failed"}
+    assert sorted(failed) == [2, 4], failed
+    assert failed[2]["id"] == "empty" and "empty" in failed[2]["detail"]
+    assert failed[4]["detail"] == "File is not a zip file" and failed[4]["event"] == "error"
+    assert (complete["succeeded"], complete["failed"]) == (4, 2)
+    print(f"isolation: {len(failed)} bad contracts reported in-band, {complete['succeeded']} others evaluated")
+
+async def check_throughput(contracts: int, pages: int):
+    texts = [generate_contract(pages, seed=200 + n) for n in range(contracts)]
+    await asyncio.to_thread(routes.analysis_pool.start)  # Start the workers outside the timing
+
+    started = time.perf_counter()
+    for text in texts:
+        jurisdiction, _, result = await routes.analysis_pool.evaluate(text)
+        result.governing_law = routes._governing_law(jurisdiction)
+        result.model_dump(mode="json")
+        if text is texts[0]:
+            first_sequential = time.perf_counter() - started
+    sequential = time.perf_counter() - started
+
+    started, first_batch = time.perf_counter(), None
+    async for line in routes._stream_batch(_items((None, text, None) for text in texts), False):
+        if first_batch is None:
+            first_batch = time.perf_counter() - started
+    batch = time.perf_counter() - started
+
+    print(f"\n{contracts} x {pages}-page contracts, {routes.analysis_pool.workers} workers, "
+          f"batch concurrency {routes.BATCH_CONCURRENCY}")
+    print(f"{'mode':>11} {'total':>9} {'first result':>13} {'contracts/s':>12}")
+    for mode, total, first in (("per-call", sequential, first_sequential), ("batch", batch, first_batch)):
+        print(f"{mode:>11} {total * 1000:>7.0f}ms {first * 1000:>11.0f}ms {contracts / total:>12.1f}")
+
+async def main_async(args):
+    routes.analysis_pool = AnalysisPool(args.workers, args.shard_clauses)
+    if args.concurrency:
+        routes.BATCH_CONCURRENCY = args.concurrency
+    await check_parity()
+    await check_isolation()
+    await check_throughput(args.contracts, args.pages)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--contracts", type=int, default=24)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--shard-clauses", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=None, help="default: BATCH_CONCURRENCY")
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Segmentation over typed blocks vs the line heuristics.
+
+Builds PDFs whose section headings are set in a larger bold font (as word
+processors export them), then compares segment_clauses(extract_text()) with
+segment_blocks(extract_blocks()): segmentation time, and heading precision /
+recall against the generator's known section headings.
+
+Usage (from backend/):
+    python -m benchmarks.bench_blocks [--pages 10 50] [--repeat 20]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.analysis.block_extractor import extract_blocks
+from app.analysis.clause_segmenter import is_heading_line, segment_blocks, segment_clauses
+from app.analysis.schemas import HEADING
+from app.analysis.text_extractor import extract_text
+from benchmarks.synthetic import SECTION_HEADING, generate_contract_lines, write_pdf
+
+# Body lines the text heuristic mistakes for headings (numbered, letters only)
+DECOYS = ["30 days notice shall apply to both parties", "12 months from the Effective Date"]
+
+def _lines_with_decoys(pages: int):
+    lines = generate_contract_lines(pages, seed=pages)
+    for i in range(len(lines) - 1, 0, -len(lines) // (pages * 2)):
+        if not SECTION_HEADING.match(lines[i]):
+            lines.insert(i, DECOYS[i % len(DECOYS)])
+    return lines
+
+def _score(found, truth):
+    """Precision / recall over heading occurrences (lists, not sets: titles repeat)."""
+    truth_set = set(truth)
+    hits = sum(1 for heading in found if heading in truth_set)
+    precision = hits / len(found) if found else 0.0
+    recall = hits / len(truth) if truth else 0.0
+    return precision, recall
+
+def _time(fn, arg, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - started) / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'lines ms':>9} {'blocks ms':>10} {'lines P/R':>12} {'blocks P/R':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            lines = _lines_with_decoys(pages)
+            truth = [line for line in lines if SECTION_HEADING.match(line)]
+            path = os.path.join(tmp, f"styled_{pages}p.pdf")
+            write_pdf(path, lines, heading_size=13)
+
+            # Same parser for both, so only the segmentation strategy differs
+            text = extract_text(path, workers=1, backend="pdfplumber")
+            blocks = extract_blocks(path)
+
+            line_headings = [line.strip() for line in text.split("\n") if line.strip() and is_heading_line(line.strip())]
+            block_headings = [block.text for block in blocks if block.kind == HEADING]
+            line_p, line_r = _score(line_headings, truth)
+            block_p, block_r = _score(block_headings, truth)
+
+            line_ms = _time(segment_clauses, text, args.repeat) * 1000
+            block_ms = _time(segment_blocks, blocks, args.repeat) * 1000
+            print(f"{pages:>6} {line_ms:>9.2f} {block_ms:>10.2f} {line_p:>6.2f}/{line_r:.2f} {block_p:>6.2f}/{block_r:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+DOCX reader comparison: streaming lxml iterparse vs python-docx Document().
+
+Each run happens in a fresh interpreter so peak RSS is per reader, not shared.
+Reports throughput, peak RSS growth while reading (interpreter and imports
+excluded), how many table cells each reader returns, and whether the streaming reader's body paragraphs match python-docx's exactly.
+First checks that a DOCX whose parts declare an external entity (XXE) does
+not leak the referenced file into the extracted text or blocks.
+
+Usage (from backend/):
+    python -m benchmarks.bench_docx [--pages 10 100 1000] [--corpus DIR]
+"""
+import argparse
+import glob
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+from docx import Document
+
+from benchmarks.synthetic import LINES_PER_PAGE, generate_contract_lines
+
+READERS = ["python-docx", "streaming"]
+TABLE_EVERY_LINES = 200  # One payment-schedule style table per ~4 pages
+
+def write_docx(path: str, lines, table_every: int = TABLE_EVERY_LINES):
+    """Contract lines as paragraphs, with a small table inserted every `table_every` lines."""
+    doc = Document()
+    for i, line in enumerate(lines, 1):
+        doc.add_paragraph(line)
+        if i % table_every == 0:
+            table = doc.add_table(rows=3, cols=3)
+            for r, row in enumerate(table.rows):
+                for c, cell in enumerate(row.cells):
+                    cell.text = f"Instalment {i // table_every}.{r}.{c}: INR {(r + 1) * (c + 1) * 1000}"
+    doc.save(path)
+
+def write_entity_docx(path: str, target: str):
+    """A one-paragraph DOCX whose document and styles parts declare `target` as an external entity."""
+    buffer = io.BytesIO()
+    doc = Document()
+    doc.add_paragraph("Governing law: PLACEHOLDER")
+    doc.save(buffer)
+    with zipfile.ZipFile(buffer) as source, zipfile.ZipFile(path, "w") as out:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename in ("word/document.xml", "word/styles.xml"):
+                xml = data.decode("utf-8")
+                prolog = xml.index("?>") + 2
+                root = xml[prolog:].lstrip().split()[0][1:]
+                doctype = f'<!DOCTYPE {root} [<!ENTITY xxe SYSTEM "file://{target}">]>'
+                data = (xml[:prolog] + doctype + xml[prolog:].replace("PLACEHOLDER", "&xxe;")).encode("utf-8")
+            out.writestr(item, data)
+
+def check_entities(tmp: str):
+    from app.analysis.docx_stream import iter_docx_blocks, iter_docx_styled_blocks
+    from app.analysis.text_extractor import extract_text
+
+    secret = "host-secret-7f3a"
+    target = os.path.join(tmp, "secret.txt")
+    with open(target, "w", encoding="utf-8") as f:
+        f.write(secret)
+    path = os.path.join(tmp, "entity.docx")
+    write_entity_docx(path, target)
+
+    outputs = [extract_text(path)]
+    outputs += [text for _, text in iter_docx_blocks(path)]
+    outputs += [block.text for block in iter_docx_styled_blocks(path)]
+    assert not any(secret in text for text in outputs), "external entity resolved"
+    assert "Governing law:" in outputs[0]
+    print("entities: external entities in document.xml / styles.xml are not resolved\n")
+
+def _read(reader: str, path: str):
+    """Returns (body paragraphs, table cells) as each reader sees them."""
+    if reader == "python-docx":
+        # The pre-streaming extract_text() path; table cells are invisible to it
+        doc = Document(path)
+        return [p.text for p in doc.paragraphs], []
+
+    from app.analysis.docx_stream import PARAGRAPH, TABLE_CELL, iter_docx_blocks
+    paragraphs, cells = [], []
+    for kind, text in iter_docx_blocks(path, include_footnotes=False):
+        if kind == PARAGRAPH:
+            paragraphs.append(text)
+        elif kind == TABLE_CELL:
+            cells.append(text)
+    return paragraphs, cells
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _worker(reader: str, path: str):
+    import app.analysis.docx_stream  # noqa: F401  (imports excluded from the RSS growth)
+    baseline = _peak_rss_mb()
+    started = time.perf_counter()
+    paragraphs, cells = _read(reader, path)
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        "seconds": elapsed,
+        "peak_rss_mb": _peak_rss_mb() - baseline,
+        "paragraphs": paragraphs,
+        "cells": len(cells)
+    }))
+
+def _measure(reader: str, path: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_docx", "--worker", reader, path],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--corpus", help="Directory of real DOCX files to include")
+    parser.add_argument("--worker", nargs=2, metavar=("READER", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(*args.worker)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        check_entities(tmp)
+        corpus = []
+        for pages in args.pages:
+            path = os.path.join(tmp, f"synthetic_{pages}p.docx")
+            write_docx(path, generate_contract_lines(pages, seed=pages))
+            corpus.append(path)
+        if args.corpus:
+            corpus.extend(sorted(glob.glob(os.path.join(args.corpus, "*.docx"))))
+
+        print(f"{'file':<28} {'MB':>6} {'docx p/s':>9} {'stream p/s':>10} {'docx +RSS':>9} "
+              f"{'stream +RSS':>11} {'cells':>7}  paragraphs-equal")
+        for path in corpus:
+            results = {reader: _measure(reader, path) for reader in READERS}
+            old, new = results["python-docx"], results["streaming"]
+            paragraphs = len(old["paragraphs"])
+            pages = max(1, paragraphs // LINES_PER_PAGE)
+            size_mb = os.path.getsize(path) / (1024 * 1024)
+
+            print(f"{os.path.basename(path)[:28]:<28} {size_mb:>6.1f} {pages / old['seconds']:>9.1f} "
+                  f"{pages / new['seconds']:>10.1f} {old['peak_rss_mb']:>8.1f}M {new['peak_rss_mb']:>10.1f}M "
+                  f"{new['cells']:>7}  {old['paragraphs'] == new['paragraphs']}")
+
+if __name__ == "__main__":
+    main()
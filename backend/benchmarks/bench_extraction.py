@@ -0,0 +1,46 @@
+"""
+PDF extraction throughput: serial vs page-parallel.
+
+Usage (from backend/):
+    python -m benchmarks.bench_extraction [--pages 10 100 500] [--workers N]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.analysis import text_extractor
+from benchmarks.synthetic import generate_contract_lines, write_pdf
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--workers", type=int, default=text_extractor.EXTRACTION_WORKERS)
+    args = parser.parse_args()
+
+    # Workers are started once, as the server does at startup (see start_pdf_pool)
+    text_extractor.start_pdf_pool(args.workers)
+    print(f"workers={args.workers}")
+    print(f"{'pages':>6} {'serial p/s':>12} {'parallel p/s':>13} {'speedup':>8}  identical")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            path = os.path.join(tmp, f"contract_{pages}.pdf")
+            write_pdf(path, generate_contract_lines(pages))
+
+            serial, serial_s = _timed(lambda: text_extractor.extract_text(path, workers=1))
+            # Parallel path is forced (min_parallel_pages=1) so every size is measured
+            parallel, parallel_s = _timed(
+                lambda: text_extractor.extract_text(path, workers=args.workers, min_parallel_pages=1)
+            )
+
+            print(f"{pages:>6} {pages / serial_s:>12.1f} {pages / parallel_s:>13.1f} "
+                  f"{serial_s / parallel_s:>7.2f}x  {serial == parallel}")
+
+if __name__ == "__main__":
+    main()
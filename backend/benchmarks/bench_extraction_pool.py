@@ -0,0 +1,112 @@
+"""
+Extraction pool admission: slots held by requests, streams and batches.
+
+1. Capacity: workers + queue_limit slots can be reserved; the next reserve()
+   and run() are rejected, and a released slot admits new work again.
+2. Streams: steps of a reserved slot are never rejected, however many run.
+3. Cancellation: a request cancelled while its step runs keeps its slot until
+   the thread finishes; a step cancelled while still queued frees it at once.
+4. Load: many concurrent run() calls never hold more slots than the limit.
+
+Usage (from backend/):
+    python -m benchmarks.bench_extraction_pool [--workers 2] [--queue 3]
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from app.analysis.extraction_pool import ExtractionPool, ExtractionQueueFull
+
+def _held(pool: ExtractionPool) -> int:
+    return pool.stats()["slots_held"]
+
+async def _wait_for(condition, timeout: float = 5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "timed out"
+        await asyncio.sleep(0.005)
+
+async def check_capacity(workers: int, queue: int):
+    pool = ExtractionPool(workers, queue)
+    slots = [pool.reserve() for _ in range(workers + queue)]
+    try:
+        pool.reserve()
+        raise AssertionError("reserve() admitted past capacity")
+    except ExtractionQueueFull:
+        pass
+    try:
+        await pool.run(time.sleep, 0)
+        raise AssertionError("run() admitted past capacity")
+    except ExtractionQueueFull:
+        pass
+    # A full stream's pages still run: they belong to an admitted slot
+    results = await asyncio.gather(*(slots[0].run(pow, 2, n) for n in range(20)))
+    assert results == [2 ** n for n in range(20)]
+    slots[0].release()
+    slots[0].release()  # Idempotent
+    assert _held(pool) == workers + queue - 1
+    assert await pool.run(len, "abc") == 3
+    for slot in slots[1:]:
+        slot.release()
+    assert _held(pool) == 0 and pool.stats()["rejected"] == 2
+    print(f"capacity: {workers + queue} slots, 2 rejections, 20 steps of a held slot never rejected")
+
+async def check_cancellation():
+    pool = ExtractionPool(1, 1)
+    gate = threading.Event()
+    running = asyncio.create_task(pool.run(gate.wait, 5))
+    await _wait_for(lambda: pool.stats()["running"] == 1)
+    queued = asyncio.create_task(pool.run(time.sleep, 0))
+    await _wait_for(lambda: pool.stats()["queue_depth"] == 1)
+
+    # Queued step: cancelled before it started, its slot is free again at once
+    queued.cancel()
+    await asyncio.gather(queued, return_exceptions=True)
+    await _wait_for(lambda: _held(pool) == 1)
+
+    # Running step: the thread goes on, and so does its slot
+    running.cancel()
+    await asyncio.gather(running, return_exceptions=True)
+    assert _held(pool) == 1, "slot released while its thread still runs"
+    held = pool.reserve()  # The one free slot
+    try:
+        pool.reserve()
+        raise AssertionError("a cancelled request's running thread was not counted")
+    except ExtractionQueueFull:
+        pass
+    held.release()
+    gate.set()
+    await _wait_for(lambda: _held(pool) == 0)
+    print("cancellation: queued step frees its slot, running step keeps it until the thread ends")
+
+async def check_load(workers: int, queue: int):
+    pool = ExtractionPool(workers, queue)
+    peak = 0
+
+    def work():
+        nonlocal peak
+        peak = max(peak, _held(pool))
+        time.sleep(0.002)
+
+    outcomes = await asyncio.gather(*(pool.run(work) for _ in range(200)), return_exceptions=True)
+    rejected = sum(isinstance(outcome, ExtractionQueueFull) for outcome in outcomes)
+    await _wait_for(lambda: _held(pool) == 0)
+    assert peak <= workers + queue, peak
+    print(f"load: 200 concurrent requests, {200 - rejected} run, {rejected} rejected, "
+          f"at most {peak} of {workers + queue} slots held")
+
+async def run_checks(workers: int, queue: int):
+    await check_capacity(workers, queue)
+    await check_cancellation()
+    await check_load(workers, queue)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--queue", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run_checks(args.workers, args.queue))
+
+if __name__ == "__main__":
+    main()
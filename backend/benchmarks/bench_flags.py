@@ -0,0 +1,101 @@
+"""
+Engine flags as records: FlagRecord inside the engine, Flag models only for
+the flags in the result (see build_engine_result).
+
+1. Models: results built without validation equal their validated round
+   trip (model_validate of the dump), set the fields Flag(...) plus
+   attach_clauses() did, and serialize the clause text as before; so do
+   the segmenter's Clause.span() clauses.
+2. Construction: one flag as a FlagRecord, Flag(...), Flag.model_construct()
+   and Flag.from_rule().
+3. Engine: time (best of 7) and tracemalloc peak of run_risk_engine() on
+   large contracts at two risky-clause densities.
+
+Usage (from backend/):
+    python -m benchmarks.bench_flags [--pages 300 1000]
+"""
+import argparse
+import gc
+import time
+import timeit
+import tracemalloc
+
+from app.analysis.clause_segmenter import segment_clauses
+from app.analysis.prepared_document import PreparedDocument
+from app.analysis.rules.engine import run_risk_engine
+from app.analysis.rules.models import Flag, FlagRecord, RiskLevel, RuleEngineResult
+from app.analysis.rules.rule_pack import RULE_PACKS
+from app.analysis.schemas import Clause
+from benchmarks.synthetic import CONTRACT_KINDS, generate_contract
+
+RULE_FIELDS = {"layer", "clause_id", "title", "description", "risk"}
+
+def check_models():
+    pack = RULE_PACKS.current()
+    checked = 0
+    for seed, kind in enumerate(CONTRACT_KINDS):
+        prepared = PreparedDocument(generate_contract(6, seed=700 + seed, kind=kind, risk_density=0.5))
+        clauses = segment_clauses(prepared, workers=1)
+        result = run_risk_engine(clauses, prepared, pack)
+        validated = RuleEngineResult.model_validate(result.model_dump())
+        assert result.model_dump() == validated.model_dump(), kind
+        assert result.model_dump_json() == validated.model_dump_json(), kind
+        texts = {clause.clause_id: clause.text for clause in clauses}
+        for clause in clauses:
+            assert Clause.model_validate(clause.model_dump()).model_dump() == clause.model_dump(), kind
+            assert clause.model_fields_set == {"clause_id", "clause_type", "start", "end"}
+        for layer, validated_layer in zip(result.layer_results, validated.layer_results):
+            assert isinstance(layer.risk, RiskLevel)
+            for flag in layer.flags:
+                assert isinstance(flag.risk, RiskLevel) and flag.precedents == []
+                assert flag.model_dump()["original_text"] == texts.get(flag.clause_id)
+                # As Flag(...) with the rule's fields, then linked to its clause (start / end)
+                assert flag.model_fields_set == RULE_FIELDS | ({"start", "end"} if flag.clause_id else set())
+                checked += 1
+    print(f"models: {checked} flags built without validation equal their validated round trip")
+
+def time_construction():
+    fields = dict(layer=2, clause_id="clause_7", title="Short Notice Period",
+                  description="Notice period of 7 days is shorter than 30.", risk=RiskLevel.HIGH)
+    runs = {
+        "FlagRecord": lambda: FlagRecord(2, "clause_7", fields["title"], fields["description"], 2),
+        "Flag(...)": lambda: Flag(**fields),
+        "model_construct": lambda: Flag.model_construct(**fields),
+        "from_rule": lambda: Flag.from_rule(**fields),
+    }
+    print(f"\n{'construction':>16} {'us/flag':>8}")
+    for name, run in runs.items():
+        best = min(timeit.repeat(run, number=20000, repeat=5)) / 20000
+        print(f"{name:>16} {best * 1e6:>8.2f}")
+
+def time_engine(pages_list):
+    pack = RULE_PACKS.current()
+    print(f"\n{'pages':>6} {'density':>8} {'clauses':>8} {'flags':>6} {'ms':>8} {'peak KB':>8}")
+    for pages in pages_list:
+        for density in (0.1, 0.5):
+            text = generate_contract(pages, seed=31, risk_density=density)
+            clauses = segment_clauses(PreparedDocument(text), workers=1)
+            best = float("inf")
+            for _ in range(7):
+                started = time.perf_counter()
+                result = run_risk_engine(clauses, PreparedDocument(text), pack)
+                best = min(best, time.perf_counter() - started)
+            gc.collect()
+            tracemalloc.start()
+            run_risk_engine(clauses, PreparedDocument(text), pack)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            flags = sum(len(layer.flags) for layer in result.layer_results)
+            print(f"{pages:>6} {density:>8} {len(clauses):>8} {flags:>6} {best * 1000:>8.1f} {peak / 1024:>8.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[300, 1000])
+    args = parser.parse_args()
+
+    check_models()
+    time_construction()
+    time_engine(args.pages)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Jurisdiction detection: compiled gazetteer scanner vs the substring checks it
+replaced.
+
+1. Accuracy cases: governing law vs court city, foreign law with an Indian
+   address, "Made in India" with no governing law clause, word boundaries.
+2. Throughput (MB/s) of detect_jurisdiction() on synthetic contracts, next to
+   the old `in` checks (which find no court, state or offsets). The bundles
+   mix India-governed contracts with ones seated in Singapore, so the two
+   verdicts can differ: the old checks accept any "india" in the text.
+
+Usage (from backend/):
+    python -m benchmarks.bench_jurisdiction [--pages 100 400 1000] [--repeat 5]
+"""
+import argparse
+import time
+
+from app.analysis.jurisdiction import detect_jurisdiction
+from benchmarks.synthetic import generate_contract
+
+# (text, jurisdiction, state, court)
+CASES = [
+    ("This Agreement shall be governed by the laws of India. The courts at Mumbai, Maharashtra "
+     "shall have exclusive jurisdiction.", "India", "Maharashtra", "Mumbai"),
+    ("Governed by the laws of the Republic of India; courts of Bangalore shall have jurisdiction.",
+     "India", None, "Bengaluru"),
+    ("This Agreement is governed by the laws of Singapore. Supplier: 12 MG Road, Bangalore, India.",
+     "Foreign/Unknown", None, None),
+    ("Governing law: the laws of the State of New York. Goods are Made in India.",
+     "Foreign/Unknown", None, None),
+    ("Seat of arbitration: New Delhi. The governing law is the law of India.", "India", None, "New Delhi"),
+    ("Made in India. Delivered to Pune.", "Unknown", None, None),
+    ("This Agreement shall be governed by and construed in accordance with Indian law.", "India", None, None),
+    ("Governed by the laws of the Union of India; courts at Chennai shall have jurisdiction.",
+     "India", None, "Chennai"),
+    # "goal" is not Goa, "usage" is not USA, "indiana" is not India
+    ("Jurisdiction: the courts of Indiana. Our goal is fair usage.", "Foreign/Unknown", None, None),
+]
+
+def legacy_jurisdiction(text: str) -> str:
+    text_lower = text.lower()
+    if not ("governed by" in text_lower or "laws of" in text_lower or "jurisdiction" in text_lower):
+        return "Unknown"
+    if "india" in text_lower or "delhi" in text_lower or "mumbai" in text_lower or "bangalore" in text_lower:
+        return "India"
+    return "Foreign/Unknown"
+
+def check_cases():
+    for text, jurisdiction, state, court in CASES:
+        result = detect_jurisdiction(text)
+        assert (result.jurisdiction, result.state, result.court) == (jurisdiction, state, court), (text, result)
+        for match in result.matches:
+            assert text[match.start:match.end] == match.text
+    print(f"accuracy: {len(CASES)} cases pass")
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 400, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    check_cases()
+
+    print(f"\n{'pages':>6} {'MB':>6} {'old ms':>8} {'new ms':>8} {'new MB/s':>9} {'matches':>8}  old / new verdict")
+    for pages in args.pages:
+        text = generate_contract(pages, seed=pages)
+        mb = len(text.encode()) / 1e6
+        result = detect_jurisdiction(text)
+        old = _best(lambda: legacy_jurisdiction(text), args.repeat)
+        new = _best(lambda: detect_jurisdiction(text), args.repeat)
+        print(f"{pages:>6} {mb:>6.2f} {old * 1000:>8.2f} {new * 1000:>8.2f} {mb / new:>9.1f} "
+              f"{len(result.matches):>8}  {legacy_jurisdiction(text)} / {result.jurisdiction} ({result.court})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Clause keyword classification: compiled KeywordMatcher vs the per-keyword loops
+it replaced in the segmenter's PASS 2 / PASS 3.
+
+Checks that both agree on every line of the synthetic contract (plus
+keyword-dense lines), then times classifying every line and a full
+segment_clauses() run.
+
+Usage (from backend/):
+    python -m benchmarks.bench_keywords [--pages 100 1000] [--repeat 5]
+"""
+import argparse
+import time
+
+from app.analysis.clause_segmenter import segment_clauses
+from app.analysis.clause_taxonomy import CLAUSE_KEYWORDS, CLAUSE_MATCHER
+from benchmarks.synthetic import generate_contract
+
+# Lines where keywords overlap or nest ("nda" inside "mandatory", "confidentiality")
+DENSE_LINES = [
+    "the mandatory confidentiality and non-disclosure obligations survive termination for cause",
+    "liability for consequential damages arising from an act of god or force majeure",
+    "indemnification, hold harmless and make good obligations under the laws of india",
+    "ip rights, copyright, patent and trademark ownership, payment of fees and billing",
+    "arbitration before an arbitral tribunal; venue and courts of mumbai; renewal term"
+]
+
+def legacy_first(line_lower: str) -> str:
+    for c_type, keywords in CLAUSE_KEYWORDS.items():
+        for kw in keywords:
+            if kw in line_lower:
+                return c_type
+    return "Unclassified"
+
+def legacy_last(line_lower: str) -> str:
+    found_type = "Unclassified"
+    for c_type, keywords in CLAUSE_KEYWORDS.items():
+        for kw in keywords:
+            if kw in line_lower:
+                found_type = c_type
+                break
+    return found_type
+
+def legacy_categories(line_lower: str):
+    return [c_type for c_type, keywords in CLAUSE_KEYWORDS.items() if any(kw in line_lower for kw in keywords)]
+
+def check_parity(lines):
+    for line in lines:
+        assert (CLAUSE_MATCHER.first_category(line) or "Unclassified") == legacy_first(line), line
+        assert (CLAUSE_MATCHER.last_category(line) or "Unclassified") == legacy_last(line), line
+        assert CLAUSE_MATCHER.find_categories(line) == legacy_categories(line), line
+        for hit in CLAUSE_MATCHER.iter_hits(line):
+            assert line[hit.start:hit.end] == hit.keyword
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'lines':>7} {'first old/new ms':>17} {'last old/new ms':>16} {'segment ms':>11}")
+    for pages in args.pages:
+        text = generate_contract(pages, seed=pages)
+        lines = [line.strip().lower() for line in text.split("\n") if line.strip()] + DENSE_LINES
+        check_parity(lines)
+
+        first_old = _best(lambda: [legacy_first(line) for line in lines], args.repeat) * 1000
+        first_new = _best(lambda: [CLAUSE_MATCHER.first_category(line) for line in lines], args.repeat) * 1000
+        last_old = _best(lambda: [legacy_last(line) for line in lines], args.repeat) * 1000
+        last_new = _best(lambda: [CLAUSE_MATCHER.last_category(line) for line in lines], args.repeat) * 1000
+        segment = _best(lambda: segment_clauses(text), args.repeat) * 1000
+        print(f"{pages:>6} {len(lines):>7} {first_old:>8.1f}/{first_new:<8.1f} {last_old:>7.1f}/{last_new:<8.1f} {segment:>11.1f}")
+
+if __name__ == "__main__":
+    main()
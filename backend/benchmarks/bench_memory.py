@@ -0,0 +1,85 @@
+"""
+Per-request memory of the analysis pipeline (segmentation -> risk engine -> JSON).
+
+Uses tracemalloc, so numbers are Python allocations, not RSS. "held" is what
+the request keeps alive after the engine ran (clauses, flags, results);
+"peak" includes transient allocations up to and including serialization.
+
+A second table compares segmentation alone: segment_clauses() on the whole
+text vs segment_clauses_iter() fed line by line, consuming each clause as it
+is yielded (peak should stay flat as the document grows).
+
+Usage (from backend/):
+    python -m benchmarks.bench_memory [--pages 100 400]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from app.analysis.clause_segmenter import segment_clauses, segment_clauses_iter
+from app.analysis.rules.engine import run_risk_engine
+from benchmarks.synthetic import generate_contract, generate_contract_lines
+
+MB = 1024 * 1024
+
+def measure(text: str) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+
+    clauses = segment_clauses(text)
+    result = run_risk_engine(clauses)
+    held = tracemalloc.get_traced_memory()[0] - base
+
+    body = result.model_dump_json()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+
+    return {
+        "clauses": len(clauses),
+        "held_mb": held / MB,
+        "peak_mb": peak / MB,
+        "json_mb": len(body) / MB,
+        "seconds": elapsed
+    }
+
+def segmentation_peak(segment, *args) -> tuple:
+    """(clauses, peak MB) of running `segment` and touching each clause's text once."""
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    count = 0
+    for clause in segment(*args):
+        clause.text  # What a consumer does with it
+        count += 1
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return count, peak / MB
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 400])
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'text MB':>8} {'clauses':>8} {'held MB':>8} {'peak MB':>8} {'json MB':>8} {'seconds':>8}")
+    for pages in args.pages:
+        text = generate_contract(pages, seed=pages)
+        stats = measure(text)
+        print(f"{pages:>6} {len(text) / MB:>8.2f} {stats['clauses']:>8} {stats['held_mb']:>8.2f} "
+              f"{stats['peak_mb']:>8.2f} {stats['json_mb']:>8.2f} {stats['seconds']:>8.2f}")
+
+    print(f"\n{'pages':>6} {'list peak MB':>13} {'iter peak MB':>13}")
+    for pages in args.pages:
+        lines = generate_contract_lines(pages, seed=pages)
+        text = "\n".join(lines)
+        _, list_peak = segmentation_peak(segment_clauses, text)
+        # Last line without its "\n", so the stream is exactly `text`
+        chunks = (line + "\n" if i < len(lines) - 1 else line for i, line in enumerate(lines))
+        _, iter_peak = segmentation_peak(segment_clauses_iter, chunks)
+        print(f"{pages:>6} {list_peak:>13.2f} {iter_peak:>13.2f}")
+
+if __name__ == "__main__":
+    main()
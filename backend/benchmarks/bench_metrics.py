@@ -0,0 +1,116 @@
+"""
+Metrics: rule counters and stage timings against what the engine did, across
+pool workers, and what recording them costs.
+
+1. Counters: after evaluating a corpus, lexchain_rule_flags_total per rule
+   equals the flags the rule produced (before aggregate_results dedupes
+   them), and every rule with flags has candidate clauses.
+2. Pool: stages timed inside analysis pool workers (jurisdiction,
+   segmentation, phrase scan) reach the server's registry and the request's
+   Server-Timing breakdown, for one-task and sharded contracts.
+3. Cost: the per-clause timers' share of the engine run (best of 7), and
+   /metrics render time.
+
+Usage (from backend/):
+    python -m benchmarks.bench_metrics [--pages 300] [--workers 2]
+"""
+import argparse
+import asyncio
+import re
+import time
+from collections import Counter
+
+from app.analysis.analysis_pool import AnalysisPool
+from app.analysis.clause_segmenter import segment_clauses
+from app.analysis.prepared_document import PreparedDocument
+from app.analysis.rules.engine import evaluate_clauses, run_risk_engine
+from app.analysis.rules.rule_pack import RULE_PACKS
+from app.core import metrics
+from benchmarks.synthetic import generate_contract
+
+def _series(name: str) -> dict:
+    """{labels: value} of one metric from the rendered exposition."""
+    found = {}
+    for line in metrics.REGISTRY.render().splitlines():
+        matched = re.match(rf"{name}(\{{.*\}})? (\S+)$", line)
+        if matched:
+            found[matched.group(1) or ""] = float(matched.group(2))
+    return found
+
+def _rule_labels(flag) -> str:
+    return f'{{layer="{flag.layer}",rule="{flag.title}"}}'
+
+def check_counters():
+    pack = RULE_PACKS.current()
+    before = _series("lexchain_rule_flags_total")
+    produced = Counter()
+    for seed in range(6):
+        prepared = PreparedDocument(generate_contract(4 + seed, seed=500 + seed))
+        clauses = segment_clauses(prepared, workers=1)
+        # evaluate_clauses() only returns stats; run_risk_engine() records them
+        partial = evaluate_clauses(clauses, prepared, pack)
+        produced.update(_rule_labels(flag) for flags in partial.flags.values() for flag in flags)
+        result = run_risk_engine(clauses, prepared, pack)
+        produced.update(_rule_labels(flag) for layer in result.layer_results for flag in layer.flags
+                        if flag.clause_id is None)  # Document rules flag in finalize()
+    after = _series("lexchain_rule_flags_total")
+    counted = Counter({labels: int(value - before.get(labels, 0)) for labels, value in after.items()})
+    assert +counted == produced, (counted, produced)
+    candidates = _series("lexchain_rule_candidates_total")
+    document_rules = {f'{{layer="{rule.layer}",rule="{rule.title}"}}' for rule in pack.rules if rule.scope == "document"}
+    assert all(candidates.get(labels, 0) > 0 for labels in produced if labels not in document_rules)
+    print(f"counters: {len(produced)} rules, {sum(produced.values())} flags counted as the engine produced them")
+
+async def check_pool(workers: int):
+    for name, pool in (("one task", AnalysisPool(workers, 100000)), ("sharded", AnalysisPool(workers, 20))):
+        samples = metrics.StageSamples()
+        token = metrics._request_samples.set(samples)
+        try:
+            before = _series("lexchain_stage_seconds_count")
+            await pool.evaluate(generate_contract(8, seed=9))
+            after = _series("lexchain_stage_seconds_count")
+        finally:
+            metrics._request_samples.reset(token)
+        stages = {stage for stage, _ in samples.samples}
+        for stage in ("jurisdiction", "segmentation", "phrase_scan", "rule_match", "aggregate_results"):
+            assert stage in stages, f"{name}: no {stage} timing"
+            labels = f'{{stage="{stage}"}}'
+            assert after[labels] > before.get(labels, 0), f"{name}: {stage} not in the registry"
+        print(f"pool ({name}): {samples.server_timing()}")
+
+def check_cost(pages: int):
+    pack = RULE_PACKS.current()
+    prepared = PreparedDocument(generate_contract(pages, seed=31))
+    clauses = segment_clauses(prepared, workers=1)
+    best, stats = float("inf"), None
+    for _ in range(7):
+        started = time.perf_counter()
+        partial = evaluate_clauses(clauses, prepared, pack)
+        elapsed = time.perf_counter() - started
+        if elapsed < best:
+            best, stats = elapsed, partial.stats
+    # Two perf_counter() calls per clause for the match, two per candidate rule
+    timer_calls = 2 * len(clauses) + 2 * sum(entry[0] for entry in stats[1].values())
+    started = time.perf_counter()
+    for _ in range(100000):
+        time.perf_counter()
+    per_call = (time.perf_counter() - started) / 100000
+    started = time.perf_counter()
+    exposition = metrics.REGISTRY.render()
+    render = time.perf_counter() - started
+    print(f"\ncost: {len(clauses)} clauses evaluated in {best * 1000:.1f}ms; {timer_calls} timer calls "
+          f"~{timer_calls * per_call * 1000:.2f}ms ({timer_calls * per_call / best:.1%}); "
+          f"/metrics renders {len(exposition.splitlines())} lines in {render * 1000:.2f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    check_counters()
+    asyncio.run(check_pool(args.workers))
+    check_cost(args.pages)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+PreparedDocument: text copies per /evaluate pipeline run (jurisdiction ->
+segmentation -> risk engine), before and after.
+
+"Before" reproduces the unprepared pipeline: every read of a clause's
+lowered text, word count or phrase hits rebuilds the clause text and
+lowercases it again (Clause.text_lower), and nothing is kept between reads.
+
+1. Parity: both pipelines return the same flags for every document.
+2. Copies: calls that build a clause- or document-sized string (span_text,
+   str.lower, str.split, span_lower), counted with a profiler hook, plus the
+   tracemalloc peak and wall time.
+
+Usage (from backend/):
+    python -m benchmarks.bench_prepared [--pages 10 100 400] [--repeat 3]
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+from app.analysis.clause_segmenter import segment_clauses
+from app.analysis.jurisdiction import detect_jurisdiction
+from app.analysis.prepared_document import PreparedDocument
+from app.analysis.rules.engine import run_risk_engine
+from app.analysis.rules.rule_pack import RULE_PACKS
+from benchmarks.synthetic import generate_contract
+
+PACK = RULE_PACKS.current()
+COPY_CALLS = {"span_text", "span_lower", "lower", "split"}
+
+class UnpreparedClause:
+    """A clause as the layers read it before PreparedClause: nothing is kept."""
+
+    __slots__ = ("clause",)
+
+    def __init__(self, clause):
+        self.clause = clause
+
+    @property
+    def clause_id(self):
+        return self.clause.clause_id
+
+    @property
+    def text_lower(self):
+        return self.clause.text_lower
+
+    @property
+    def word_count(self):
+        return len(self.clause.text_lower.split())
+
+    @property
+    def hits(self):
+        text_lower = self.clause.text_lower
+        return {phrase for phrase in PACK.phrases.phrases if phrase in text_lower}
+
+def run_unprepared(text: str):
+    detect_jurisdiction(text)
+    clauses = segment_clauses(text, workers=1)
+    wrapped = [UnpreparedClause(clause) for clause in clauses]
+    return PACK.evaluate(wrapped)
+
+def run_prepared(text: str):
+    prepared = PreparedDocument(text)
+    detect_jurisdiction(prepared)
+    clauses = segment_clauses(prepared, workers=1)
+    return run_risk_engine(clauses, prepared, PACK).layer_results
+
+def _flags(layer_results):
+    return [(f.layer, f.clause_id, f.title, f.description) for layer in layer_results for f in layer.flags]
+
+def count_copies(fn, text: str) -> Counter:
+    counts = Counter()
+
+    def hook(frame, event, arg):
+        if event == "c_call" and arg.__name__ in COPY_CALLS:
+            counts[arg.__name__] += 1
+        elif event == "call" and frame.f_code.co_name in COPY_CALLS:
+            counts[frame.f_code.co_name] += 1
+
+    sys.setprofile(hook)
+    try:
+        fn(text)
+    finally:
+        sys.setprofile(None)
+    return counts
+
+def peak_kb(fn, text: str) -> float:
+    tracemalloc.start()
+    try:
+        fn(text)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+def _best(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 400])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'clauses':>8} {'copies before':>14} {'after':>7} {'peak KB before':>15} {'after':>8} "
+          f"{'ms before':>10} {'after':>8}")
+    for pages in args.pages:
+        # Indented lines make the text non-canonical, so spans are re-joined
+        text = generate_contract(pages, seed=pages).replace("\nThe ", "\n  The ")
+        before, after = run_unprepared(text), run_prepared(text)
+        assert _flags(before) == _flags(after), f"{pages} pages: flags differ"
+
+        copies_before = sum(count_copies(run_unprepared, text).values())
+        copies_after = sum(count_copies(run_prepared, text).values())
+        clauses = len(segment_clauses(text, workers=1))
+        print(f"{pages:>6} {clauses:>8} {copies_before:>14} {copies_after:>7} "
+              f"{peak_kb(run_unprepared, text):>15.0f} {peak_kb(run_prepared, text):>8.0f} "
+              f"{_best(run_unprepared, text, args.repeat) * 1000:>10.1f} "
+              f"{_best(run_prepared, text, args.repeat) * 1000:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Declarative rule packs: parity with the Python layers they replaced, the
+pack format, and hot reload under load.
+
+1. Parity: the default pack returns exactly the flags in golden/rule_flags.json
+   (recorded from the seven Python layer functions; see bench_rule_phrases)
+   and tests exactly the phrases those layers tested.
+2. Format: proximity windows, notice numbers, suppression and document rules
+   on small inline packs; malformed packs are rejected with the rule named.
+3. Hot reload: threads run the engine while the pack file is rewritten
+   (atomic renames, plus one broken file). Every result must come from a
+   single pack version, and the broken file must leave the last good pack live.
+4. Timing: pack compile time and hot reload latency.
+
+Usage (from backend/):
+    python -m benchmarks.bench_rule_packs [--threads 4] [--rewrites 20]
+"""
+import argparse
+import copy
+import json
+import os
+import tempfile
+import threading
+import time
+
+from app.analysis.clause_segmenter import segment_clauses
+from app.analysis.prepared_document import PreparedDocument
+from app.analysis.rules.engine import run_risk_engine
+from app.analysis.rules.rule_pack import (RULE_PACK_PATH, RULE_PACKS, RulePackError, RulePackStore,
+                                          compile_rule_pack)
+from app.analysis.schemas import Clause
+from benchmarks.bench_rule_phrases import CORPUS_PHRASES, check_golden
+from benchmarks.synthetic import generate_contract
+
+def _pack(*rules, layer=9):
+    return {"name": "check", "version": 1, "layers": [{"layer": layer, "rules": list(rules)}]}
+
+def _rule(**spec):
+    return {"title": "Check", "description": "Check.", "risk": "High", **spec}
+
+def _titles(pack, *texts):
+    clauses = [Clause(clause_id=str(i + 1), clause_type="Unclassified", text=text) for i, text in enumerate(texts)]
+    result = run_risk_engine(clauses, pack=compile_rule_pack(pack))
+    return [(flag.clause_id, flag.title, flag.description) for layer in result.layer_results for flag in layer.flags]
+
+def check_parity():
+    check_golden()
+    # Plus "day", which layer 2 tested before running its notice regex
+    layer_phrases = set(CORPUS_PHRASES) | {"day"}
+    assert set(RULE_PACKS.current().phrases.phrases) == layer_phrases, "default pack phrases differ"
+    print(f"parity: default pack tests the same {len(layer_phrases)} phrases as the Python layers")
+
+def check_format():
+    near = _pack(_rule(trigger="indemnify", near=[["indemnify", "third party", 20]]))
+    assert _titles(near, "Employee shall indemnify any third party claims.",
+                   "Employee shall indemnify the company for losses caused to any third party.",
+                   "Losses of a third party: Employee shall indemnify them.") == \
+        [("1", "Check", "Check."), ("3", "Check", "Check.")]
+
+    numbers = _pack(_rule(description="{number} days.", numbers={"pattern": r"(\d+)\s*days?", "min": 1, "max": 9}))
+    # One flag per title and clause survives aggregate_results
+    assert _titles(numbers, "Within 30 days or 0 days; 7day rule.", "Within 3 days, 30 days.") == \
+        [("1", "Check", "7 days."), ("2", "Check", "3 days.")]
+
+    suppressed = _pack(_rule(title="Strong", trigger="perpetual"),
+                       _rule(title="Weak", trigger="confidential", suppressed_by=["Strong"]))
+    assert _titles(suppressed, "Perpetual confidential.", "Confidential.") == \
+        [("1", "Strong", "Check."), ("2", "Weak", "Check.")]
+
+    document = _pack(_rule(scope="document", description="{count} vs {versus_count}",
+                           ratio={"count": ["you shall"], "versus": ["we shall"], "count_over": 2, "ratio_over": 1}))
+    assert _titles(document, "You shall. You shall.", "You shall. We shall.") == [(None, "Check", "3 vs 1")]
+
+    broken = {
+        "unknown key": _pack(_rule(triger="x")),
+        "empty phrase": _pack(_rule(trigger={"any": ["x", " "]})),
+        "bad operator": _pack(_rule(trigger={"either": ["x", "y"]})),
+        "bad risk": _pack(_rule(risk="Severe")),
+        "unknown field": _pack(_rule(description="{word_count} words")),
+        "pattern groups": _pack(_rule(numbers={"pattern": r"\d+", "min": 1, "max": 2})),
+        "late suppressor": _pack(_rule(title="Weak", suppressed_by=["Strong"]), _rule(title="Strong")),
+        "clause ratio": _pack(_rule(ratio={})),
+    }
+    for name, pack in broken.items():
+        try:
+            compile_rule_pack(pack)
+        except RulePackError as e:
+            assert "layer 9 rule" in str(e), (name, e)
+        else:
+            raise AssertionError(f"{name}: pack compiled")
+    print(f"format: near / numbers / suppressed_by / document rules pass, {len(broken)} broken packs rejected")
+
+def _write_atomic(path: str, text: str):
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(path + ".tmp", path)
+
+def check_hot_reload(threads: int, rewrites: int):
+    with open(RULE_PACK_PATH, encoding="utf-8") as f:
+        base = json.load(f)
+    text = generate_contract(4, seed=19)
+    prepared = PreparedDocument(text)
+    clauses = segment_clauses(prepared, workers=1)
+
+    def version(n: int) -> str:
+        # Every title carries the version, so a result mixing packs is visible
+        pack = copy.deepcopy(base)
+        pack["version"] = n
+        for layer in pack["layers"]:
+            for rule in layer["rules"]:
+                rule["title"] = f"{rule['title']} #{n}"
+                if "suppressed_by" in rule:
+                    rule["suppressed_by"] = [f"{title} #{n}" for title in rule["suppressed_by"]]
+        return json.dumps(pack)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "pack.json")
+        _write_atomic(path, version(0))
+        store = RulePackStore(path, hot_reload=True, reload_seconds=0)
+        stop = threading.Event()
+        seen, errors = set(), []
+
+        def worker():
+            while not stop.is_set():
+                try:
+                    result = run_risk_engine(clauses, prepared, store.current())
+                    versions = {flag.title.rsplit("#", 1)[1] for layer in result.layer_results for flag in layer.flags}
+                    assert len(versions) == 1 and result.rule_pack.startswith(f"{base['name']} v{versions.pop()} ")
+                    seen.add(result.rule_pack)
+                except Exception as e:  # Collected and re-raised on the main thread
+                    errors.append(e)
+
+        runners = [threading.Thread(target=worker) for _ in range(threads)]
+        for runner in runners:
+            runner.start()
+        latencies = []
+        try:
+            for n in range(1, rewrites + 1):
+                time.sleep(0.02)
+                if n == rewrites // 2:
+                    _write_atomic(path, version(n)[:-40])  # Truncated JSON
+                    time.sleep(0.05)
+                    store.current()
+                    assert store.current().version == str(n - 1), "broken pack replaced the live one"
+                    continue
+                _write_atomic(path, version(n))
+                started = time.perf_counter()
+                while store.current().version != str(n):
+                    time.sleep(0.001)
+                latencies.append(time.perf_counter() - started)
+        finally:
+            stop.set()
+            for runner in runners:
+                runner.join()
+        if errors:
+            raise errors[0]
+    print(f"hot reload: {len(seen)} pack versions served to {threads} threads, none mixed; "
+          f"{store.reloads} reloads, {store.failed_reloads} broken file kept out; "
+          f"reload latency max {max(latencies) * 1000:.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--rewrites", type=int, default=20)
+    args = parser.parse_args()
+
+    check_parity()
+    check_format()
+    check_hot_reload(args.threads, args.rewrites)
+
+    with open(RULE_PACK_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    started = time.perf_counter()
+    pack = compile_rule_pack(data)
+    elapsed = time.perf_counter() - started
+    print(f"compile: {len(pack.rules)} rules, {len(pack.phrases.phrases)} phrases in {elapsed * 1000:.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Rule engine phrase matching: golden flags and timing on 500-clause contracts.
+
+1. Golden check: run_risk_engine() on a fixed corpus must return exactly the
+   flags recorded in golden/rule_flags.json (written from the engine as it was
+   before the layers moved to phrase hit sets). The corpus is the synthetic
+   contracts plus random clauses stitched from every trigger and guard phrase,
+   with stray case, punctuation, line breaks and "N days notice" variants.
+2. Timing: the risk engine on contracts of about 500 and 2000 clauses, both
+   synthetic ones (a risky library clause in every section: the worst case,
+   most phrases present) and plain ones (boilerplate sections only). Run the
+   script on the commit before the phrase matcher for the "before" numbers.
+
+Usage (from backend/):
+    python -m benchmarks.bench_rule_phrases [--clauses 500 2000] [--repeat 20]
+    python -m benchmarks.bench_rule_phrases --write-golden   # only when flags are meant to change
+"""
+import argparse
+import json
+import os
+import random
+import textwrap
+import time
+
+from app.analysis.clause_segmenter import segment_clauses
+from app.analysis.prepared_document import PreparedDocument
+from app.analysis.rules.engine import run_risk_engine
+from app.analysis.schemas import Clause
+from benchmarks.synthetic import CLAUSE_LIBRARY, FILLER, generate_contract
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "golden", "rule_flags.json")
+
+# Every phrase the seven layers test for, as of the golden file
+CORPUS_PHRASES = [
+    "after termination", "amend", "appointed by the company", "arbitration", "assessment", "assignment",
+    "assignment of tasks", "bear all costs", "belong to the company", "bond", "claims under law", "company",
+    "company may terminate", "company shall", "company shall indemnify", "company shall not be liable",
+    "confidential", "consequential damages", "dispute", "dubai", "duties", "employee", "employee may terminate",
+    "employee shall", "employee shall indemnify", "employment", "evaluation", "exceptions", "excluded",
+    "excluding", "exclusions", "exclusive services", "exit", "force majeure", "forever", "future",
+    "hold the company harmless", "immediate termination", "including without limitation", "indefinite",
+    "indemnify the company", "indemnify the employee", "indirect damages", "intellectual property", "invention",
+    "irrevocably", "jurisdiction", "legal rights", "liability", "liquidated damages", "london", "modify",
+    "mutual indemnity", "mutually indemnify", "neither party shall be liable", "new york", "no cap on liability",
+    "non compete", "non-compete", "non-disclosure", "not", "not be liable", "notice", "on own time", "paris",
+    "past", "pay all costs", "payment", "penalty", "period of", "perpetual", "personal project",
+    "post termination", "post-termination", "prior to employment", "private work", "property of the company",
+    "public domain", "publicly available", "restraint of trade", "rights", "salary", "selected by the company",
+    "service bond", "service provider", "shall not engage", "singapore", "sole arbitrator", "sole discretion",
+    "solely", "special damages", "statutory rights", "term of this agreement", "terminat",
+    "terminate for convenience", "termination", "termination for convenience", "unilaterally", "unlimited",
+    "unlimited liability", "usa", "waive", "waiver of", "without notice", "years after", "years from",
+    "you shall"
+]
+# Near misses: substrings and superstrings of the phrases above
+NEAR_MISSES = ["usage", "bonded", "cannot", "nothing", "determination", "amendment", "company's", "employees",
+               "confidentiality", "inventions", "non-competition", "waiver", "exited", "termination-free"]
+SEPARATORS = [" ", " ", ", ", ". ", "; ", "\n", " and ", " or "]
+
+def random_clause(rng: random.Random) -> str:
+    sentences = [s for _, variants in CLAUSE_LIBRARY for s in variants] + FILLER
+    parts = []
+    for _ in range(rng.randint(1, 8)):
+        choice = rng.random()
+        if choice < 0.55:
+            part = rng.choice(CORPUS_PHRASES)
+        elif choice < 0.7:
+            part = rng.choice(NEAR_MISSES)
+        elif choice < 0.8:
+            part = f"{rng.randint(0, 40)}{rng.choice(['', ' ', '  '])}{rng.choice(['day', 'days'])} notice"
+        else:
+            part = rng.choice(sentences)
+        if rng.random() < 0.2:
+            part = part.upper()
+        parts.append(part)
+        parts.append(rng.choice(SEPARATORS))
+    text = "".join(parts).strip()
+    if rng.random() < 0.05:
+        text = " ".join([text] * 60)  # Over 300 words
+    return text
+
+def golden_cases():
+    """(name, clauses, prepared) for every case of the golden corpus."""
+    for seed in range(3):
+        text = generate_contract(4, seed=seed)
+        prepared = PreparedDocument(text)
+        yield f"synthetic-{seed}", segment_clauses(prepared, workers=1), prepared
+    rng = random.Random(18)
+    for doc in range(12):
+        clauses = [Clause(clause_id=str(i + 1), clause_type="Unclassified", text=random_clause(rng))
+                   for i in range(50)]
+        yield f"random-{doc}", clauses, None
+
+def plain_contract(clauses: int, seed: int) -> str:
+    """Boilerplate sections only: few trigger phrases, like most of a real contract."""
+    rng = random.Random(seed)
+    lines = []
+    for n in range(1, clauses + 1):
+        lines.append(f"{n}. GENERAL PROVISIONS")
+        lines.extend(textwrap.wrap(" ".join(rng.sample(FILLER, k=rng.randint(2, 4))), 90))
+    return "\n".join(lines)
+
+def _flags(result):
+    return [[f.layer, f.clause_id, f.title, f.description, f.risk.value]
+            for layer in result.layer_results for f in layer.flags]
+
+def engine_flags():
+    return {name: _flags(run_risk_engine(clauses, prepared)) for name, clauses, prepared in golden_cases()}
+
+def check_golden():
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        golden = json.load(f)
+    current = engine_flags()
+    assert current.keys() == golden.keys(), "golden corpus changed; re-record with --write-golden"
+    for name in golden:
+        assert current[name] == golden[name], f"{name}: flags differ from golden"
+    print(f"golden: {len(golden)} cases, {sum(map(len, golden.values()))} flags identical")
+
+def write_golden():
+    os.makedirs(os.path.dirname(GOLDEN_PATH), exist_ok=True)
+    flags = engine_flags()
+    with open(GOLDEN_PATH, "w", encoding="utf-8") as f:
+        f.write("{\n" + ",\n".join(f"{json.dumps(name)}: {json.dumps(case)}" for name, case in flags.items()) + "\n}\n")
+    print(f"wrote {GOLDEN_PATH}: {len(flags)} cases, {sum(map(len, flags.values()))} flags")
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clauses", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--write-golden", action="store_true")
+    args = parser.parse_args()
+
+    if args.write_golden:
+        write_golden()
+        return
+    check_golden()
+
+    print(f"\n{'corpus':>10} {'clauses':>8} {'engine ms':>10} {'us/clause':>10}")
+    for target in args.clauses:
+        pages = max(1, round(target / 8.5))  # The synthetic contracts run about 8.5 clauses a page
+        for corpus, text in (("synthetic", generate_contract(pages, seed=target)),
+                             ("plain", plain_contract(target, seed=target))):
+            prepared = PreparedDocument(text)
+            clauses = segment_clauses(prepared, workers=1)
+            engine = _best(lambda: run_risk_engine(clauses, prepared), args.repeat)
+            print(f"{corpus:>10} {len(clauses):>8} {engine * 1000:>10.1f} {engine * 1e6 / len(clauses):>10.1f}")
+
+if __name__ == "__main__":
+    main()
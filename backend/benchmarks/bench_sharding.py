@@ -0,0 +1,88 @@
+"""
+Sharded parallel segmentation: correctness property check and scaling.
+
+1. Property check: on randomized documents (headings of every PASS 1 form,
+   keyword lines, blank lines, stray indentation), segment_clauses() in the
+   process pool must return exactly the serial clauses - ids, types, offsets
+   and text - for every worker count.
+2. Scaling: segmentation time for long synthetic bundles across worker counts
+   (pools are warmed up first, so pool start-up is not counted).
+
+Usage (from backend/):
+    python -m benchmarks.bench_sharding [--trials 200] [--pages 1000 3000] [--workers 1 2 4 8]
+"""
+import argparse
+import random
+import time
+
+from app.analysis.clause_segmenter import _shard_bounds, segment_clauses
+from app.analysis.clause_taxonomy import CLAUSE_KEYWORDS
+from benchmarks.synthetic import FILLER, generate_contract
+
+HEADING_FORMS = ["{n}. {title}", "ARTICLE {n} {title}", "Section {n}.{m} {title}", "{title}"]
+
+def random_document(rng: random.Random) -> str:
+    keywords = [kw for kws in CLAUSE_KEYWORDS.values() for kw in kws]
+    lines = []
+    for n in range(1, rng.randint(1, 60)):
+        if rng.random() < 0.8:
+            title = rng.choice(list(CLAUSE_KEYWORDS) + ["GENERAL", "MISCELLANEOUS"]).upper()
+            heading = rng.choice(HEADING_FORMS).format(n=n, m=rng.randint(1, 9), title=title)
+            lines.append(" " * rng.randint(0, 2) + heading)
+        for _ in range(rng.randint(0, 6)):
+            choice = rng.random()
+            if choice < 0.15:
+                lines.append(" " * rng.randint(0, 3))  # Blank / whitespace-only line
+            elif choice < 0.5:
+                lines.append(f"The party shall {rng.choice(keywords)} as agreed. " + rng.choice(FILLER))
+            else:
+                lines.append(rng.choice(FILLER) + " " * rng.randint(0, 1))
+    return "\n".join(lines)
+
+def _snapshot(clauses):
+    return [(c.clause_id, c.clause_type, c.start, c.end, c.text) for c in clauses]
+
+def check_property(trials: int, worker_counts, seed: int = 0):
+    rng = random.Random(seed)
+    sharded = 0
+    for trial in range(trials):
+        text = random_document(rng)
+        serial = _snapshot(segment_clauses(text, workers=1))
+        for workers in worker_counts:
+            sharded += len(_shard_bounds(text, workers)) > 1
+            parallel = _snapshot(segment_clauses(text, workers=workers, min_parallel_chars=0))
+            assert parallel == serial, f"trial {trial}, {workers} workers: sharded output differs"
+    print(f"property check: {trials} random documents x workers {list(worker_counts)}: identical "
+          f"({sharded} runs actually sharded)")
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1000, 3000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    check_property(args.trials, [w for w in args.workers if w > 1])
+
+    print(f"\n{'pages':>6} {'workers':>8} {'ms':>9} {'speedup':>8}")
+    for pages in args.pages:
+        text = generate_contract(pages, seed=pages)
+        serial_ms = None
+        for workers in args.workers:
+            run = lambda: segment_clauses(text, workers=workers, min_parallel_chars=0)
+            run()  # Warm the pool
+            ms = _best(run, args.repeat) * 1000
+            serial_ms = serial_ms or ms
+            print(f"{pages:>6} {workers:>8} {ms:>9.1f} {serial_ms / ms:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Benchmark suite: throughput and memory of each analysis stage over synthetic
+contracts, written as JSON and optionally compared with a stored baseline.
+
+For every contract kind (employment, rental, loan, NDA), size in pages and
+risky-clause density (see synthetic.generate_contract), the stages are:
+  extract_text       PDF (written by synthetic.write_pdf) -> text
+  segment_clauses    text -> clauses (serial)
+  layer_1 .. layer_7 one layer of the rule pack on its own (phrase scan,
+                     match and checks), like the former run_layerN functions
+  run_risk_engine    the whole pack plus aggregation
+  aggregate_results  aggregation alone
+Each stage reports the best of --repeat runs (seconds, pages/s, clauses/s)
+and its tracemalloc peak in a separate run (Python allocations only: the
+PDF backend's own memory is not counted).
+
+With --baseline, stages slower than the baseline by more than --threshold
+(and by at least --min-ms), or with a peak over it by more than --threshold,
+are reported as regressions and the exit status is 1.
+
+Usage (from backend/):
+    python -m benchmarks.suite --output tmp/bench.json
+    python -m benchmarks.suite --pages 10 100 --baseline tmp/bench.json [--threshold 0.25]
+    python -m benchmarks.suite --kinds nda --pages 1000 --stages segment_clauses run_risk_engine
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from app.analysis.clause_segmenter import segment_clauses
+from app.analysis.prepared_document import PreparedDocument
+from app.analysis.rules.engine import evaluate_clauses, run_risk_engine
+from app.analysis.rules.rule_pack import RULE_PACKS, compile_rule_pack
+from app.analysis.rules.scoring import aggregate_results
+from app.analysis.text_extractor import extract_text
+from benchmarks.synthetic import CONTRACT_KINDS, generate_contract_lines, write_pdf
+
+SUITE_VERSION = 1
+
+def layer_packs(pack) -> dict:
+    """One single-layer pack per layer of `pack`, keyed "layer_N"."""
+    return {
+        f"layer_{layer['layer']}": compile_rule_pack({**pack.data, "layers": [layer]}, f"{pack.source}#{layer['layer']}")
+        for layer in pack.data["layers"]
+    }
+
+def _best(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+def _peak_kb(fn) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+def contract_stages(lines, directory: str, pack, layers: dict):
+    """(stage, fn, clauses) for one contract; later stages reuse earlier outputs."""
+    text = "\n".join(lines)
+    path = os.path.join(directory, "contract.pdf")
+    write_pdf(path, lines)
+    yield "extract_text", lambda: extract_text(path, workers=1), None
+
+    clauses = segment_clauses(PreparedDocument(text), workers=1)
+    yield "segment_clauses", lambda: segment_clauses(PreparedDocument(text), workers=1), len(clauses)
+
+    for name, layer_pack in layers.items():
+        # A fresh PreparedDocument per run: lowering the clauses is part of the layer's work
+        yield name, lambda layer_pack=layer_pack: evaluate_clauses(clauses, PreparedDocument(text), layer_pack), len(clauses)
+    yield "run_risk_engine", lambda: run_risk_engine(clauses, PreparedDocument(text), pack), len(clauses)
+
+    layer_records = pack.finalize([evaluate_clauses(clauses, PreparedDocument(text), pack)])
+    yield "aggregate_results", lambda: aggregate_results(layer_records), len(clauses)
+
+def run_suite(args) -> dict:
+    pack = RULE_PACKS.current()
+    layers = layer_packs(pack)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for kind in args.kinds:
+            for pages in args.pages:
+                for density in args.densities:
+                    lines = generate_contract_lines(pages, seed=args.seed, kind=kind, risk_density=density)
+                    flags = sum(len(layer.flags) for layer in run_risk_engine(
+                        segment_clauses(PreparedDocument("\n".join(lines)), workers=1), pack=pack).layer_results)
+                    for stage, fn, clauses in contract_stages(lines, directory, pack, layers):
+                        if args.stages and stage not in args.stages:
+                            continue
+                        seconds, _ = _best(fn, args.repeat)
+                        entry = {
+                            "id": f"{kind}/{pages}p/{density}/{stage}",
+                            "kind": kind,
+                            "pages": pages,
+                            "risk_density": density,
+                            "stage": stage,
+                            "seconds": round(seconds, 6),
+                            "pages_per_s": round(pages / seconds, 1),
+                            "clauses_per_s": round(clauses / seconds, 1) if clauses else None,
+                            "peak_kb": round(_peak_kb(fn), 1) if not args.no_memory else None,
+                            "clauses": clauses,
+                            "flags": flags,
+                        }
+                        results.append(entry)
+                        print(f"{entry['id']:<40} {seconds * 1000:>10.2f}ms {entry['pages_per_s']:>10.1f} p/s "
+                              f"{entry['peak_kb'] if entry['peak_kb'] is not None else '-':>10} KB", flush=True)
+    return {
+        "suite_version": SUITE_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "rule_pack": pack.label,
+        "args": {"repeat": args.repeat, "seed": args.seed},
+        "results": results,
+    }
+
+def compare(current: dict, baseline: dict, threshold: float, min_ms: float) -> list:
+    """Regressions of `current` against `baseline`, matched by result id."""
+    previous = {entry["id"]: entry for entry in baseline["results"]}
+    regressions = []
+    print(f"\n{'stage':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for entry in current["results"]:
+        old = previous.get(entry["id"])
+        if old is None:
+            continue
+        change = entry["seconds"] / old["seconds"] - 1 if old["seconds"] else 0.0
+        slower = change > threshold and (entry["seconds"] - old["seconds"]) * 1000 >= min_ms
+        grew = (entry["peak_kb"] is not None and old.get("peak_kb")
+                and entry["peak_kb"] / old["peak_kb"] - 1 > threshold)
+        mark = "  REGRESSION" if slower or grew else ""
+        print(f"{entry['id']:<40} {old['seconds'] * 1000:>8.2f}ms {entry['seconds'] * 1000:>8.2f}ms {change:>+8.0%}{mark}"
+              + (f" (peak {old['peak_kb']:.0f} -> {entry['peak_kb']:.0f} KB)" if grew else ""))
+        if mark:
+            regressions.append(entry["id"])
+    if baseline.get("machine") != current["machine"]:
+        print("note: the baseline was recorded on a different machine or Python")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--kinds", nargs="+", default=list(CONTRACT_KINDS), choices=list(CONTRACT_KINDS))
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.1, 0.5])
+    parser.add_argument("--stages", nargs="+", default=None, help="default: all")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc runs")
+    parser.add_argument("--output", help="write results as JSON (e.g. to record a baseline)")
+    parser.add_argument("--baseline", help="JSON from an earlier --output run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown / growth (0.25 = 25%%)")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    current = run_suite(args)
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=1)
+        print(f"\nwrote {len(current['results'])} results to {args.output}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold, args.min_ms)
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
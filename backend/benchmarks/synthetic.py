@@ -0,0 +1,273 @@
+"""
+Deterministic synthetic contracts for benchmarks.
+Same (pages, seed) always yields the same document, so numbers are comparable across runs.
+"""
+import random
+import re
+import textwrap
+from typing import List, Optional
+
+LINES_PER_PAGE = 46
+LINE_WIDTH = 90
+
+CLAUSE_LIBRARY = [
+    ("TERMINATION", [
+        "Either party may terminate this Agreement by giving 30 days notice in writing.",
+        "The Company may terminate the employment without notice for any reason whatsoever.",
+        "The Company may terminate this Agreement by giving 7 days notice to the Employee.",
+    ]),
+    ("LIMITATION OF LIABILITY", [
+        "Neither party shall be liable for any indirect or consequential damages arising hereunder.",
+        "The Employee shall have unlimited liability for any loss suffered by the Company.",
+    ]),
+    ("INDEMNIFICATION", [
+        "The Employee shall indemnify the Company against all claims, losses and expenses.",
+        "Each party shall mutually indemnify the other against third party claims.",
+    ]),
+    ("NON-COMPETE", [
+        "The Employee shall not engage in a competing business during the term of employment.",
+        "The non-compete obligation continues for two years after termination of employment.",
+    ]),
+    ("CONFIDENTIALITY", [
+        "Confidential information excludes information in the public domain.",
+        "The confidentiality obligation shall survive in perpetuity and remain binding forever.",
+    ]),
+    ("INTELLECTUAL PROPERTY", [
+        "All intellectual property created during employment shall vest in the Company.",
+        "All inventions, past and future, including personal projects, shall belong to the Company.",
+    ]),
+    ("GOVERNING LAW AND JURISDICTION", [
+        "This Agreement shall be governed by the laws of India and the courts of Mumbai shall have jurisdiction.",
+        "Any dispute shall be referred to arbitration seated in Singapore before a sole arbitrator appointed by the Company.",
+    ]),
+    ("PAYMENT TERMS", [
+        "The Company shall pay the fees within thirty days of receipt of a valid invoice.",
+        "The Company shall pay the salary on the last working day of every month.",
+    ]),
+    ("AMENDMENT", [
+        "This Agreement may be amended only by a written instrument signed by both parties.",
+        "The Company may amend or modify these terms at its sole discretion at any time.",
+    ]),
+    ("FORCE MAJEURE", [
+        "Neither party shall be liable for delay caused by events beyond reasonable control.",
+        "The Company shall not be liable for any failure caused by force majeure events.",
+    ]),
+]
+
+FILLER = [
+    "The parties acknowledge that they have read and understood the terms of this Agreement.",
+    "Notices under this clause shall be delivered to the registered office of the receiving party.",
+    "Any schedule annexed to this Agreement forms an integral part of it.",
+    "The headings used in this Agreement are for convenience only and shall not affect interpretation.",
+    "Each party shall perform its obligations diligently and in accordance with applicable law.",
+]
+
+RENTAL_LIBRARY = [
+    ("RENT", [
+        "The Tenant shall pay the monthly rent on or before the fifth day of each month.",
+        "The Landlord may revise the rent at its sole discretion at any time during the lease.",
+    ]),
+    ("SECURITY DEPOSIT", [
+        "The security deposit shall be refunded within thirty days of the Tenant vacating the premises.",
+        "The security deposit shall be forfeited irrevocably on any breach, however minor.",
+    ]),
+    ("TERMINATION", [
+        "Either party may terminate this lease by giving two months notice in writing.",
+        "The Landlord may terminate this lease without notice and re-enter the premises.",
+        "The Landlord may terminate this lease by giving 7 days notice to the Tenant.",
+    ]),
+    ("MAINTENANCE AND REPAIRS", [
+        "The Landlord shall carry out structural repairs and the Tenant shall carry out minor repairs.",
+        "The Tenant shall have unlimited liability for any damage to the premises from any cause.",
+    ]),
+    ("USE OF PREMISES", [
+        "The premises shall be used for residential purposes only.",
+        "The Tenant waives all statutory rights of a tenant under the applicable rent control law.",
+    ]),
+    ("DISPUTE RESOLUTION", [
+        "Any dispute shall be subject to the jurisdiction of the courts at Bengaluru.",
+        "Any dispute shall be referred to arbitration seated in Dubai under the rules of the Landlord's choice.",
+    ]),
+]
+
+LOAN_LIBRARY = [
+    ("REPAYMENT", [
+        "The Borrower shall repay the loan in sixty equal monthly instalments.",
+        "The Lender may recall the entire loan without notice at any time.",
+    ]),
+    ("INTEREST", [
+        "Interest shall accrue at the rate stated in the schedule, calculated on the reducing balance.",
+        "The Lender may modify the rate of interest unilaterally and such change binds the Borrower.",
+    ]),
+    ("EVENTS OF DEFAULT", [
+        "An event of default occurs if any instalment remains unpaid for ninety days.",
+        "The Borrower shall be liable for all consequential damages suffered by the Lender on any default.",
+    ]),
+    ("SECURITY", [
+        "The loan is secured by a first charge over the assets listed in the schedule.",
+        "The Borrower irrevocably authorises the Lender to sell the secured assets without further consent.",
+    ]),
+    ("CONFIDENTIALITY", [
+        "Confidential information excludes information in the public domain.",
+        "The Borrower shall keep the terms of this loan confidential.",
+    ]),
+    ("GOVERNING LAW", [
+        "This Agreement shall be governed by the laws of India and the courts of Chennai shall have jurisdiction.",
+        "Any dispute shall be referred to arbitration seated in London before a sole arbitrator.",
+    ]),
+]
+
+NDA_LIBRARY = [
+    ("DEFINITION OF CONFIDENTIAL INFORMATION", [
+        "Confidential information excludes information that is publicly available or already known to the recipient.",
+        "Confidential information means all information disclosed by the Disclosing Party in any form.",
+    ]),
+    ("OBLIGATIONS OF THE RECEIVING PARTY", [
+        "The Receiving Party shall protect confidential information, other than publicly available information, for three years.",
+        "The Receiving Party shall keep the confidential information secret in perpetuity and forever.",
+    ]),
+    ("REMEDIES", [
+        "The Disclosing Party may seek injunctive relief for any breach of this Agreement.",
+        "The Receiving Party shall have unlimited liability for any disclosure, whatever its cause.",
+    ]),
+    ("TERM AND TERMINATION", [
+        "Either party may terminate this Agreement by giving 30 days notice in writing.",
+        "The Disclosing Party may terminate this Agreement without notice.",
+    ]),
+    ("AMENDMENT", [
+        "This Agreement may be amended only by a written instrument signed by both parties.",
+        "The Disclosing Party may amend these terms at its sole discretion.",
+    ]),
+    ("JURISDICTION", [
+        "This Agreement shall be governed by the laws of India and the courts of Pune shall have jurisdiction.",
+        "Any dispute shall be referred to arbitration seated in New York.",
+    ]),
+]
+
+# kind -> (title, opening line, sections)
+CONTRACT_KINDS = {
+    "employment": ("EMPLOYMENT AGREEMENT", "This Agreement is made at New Delhi between the Company and the Employee.",
+                   CLAUSE_LIBRARY),
+    "rental": ("RENTAL AGREEMENT", "This Agreement is made at Bengaluru between the Landlord and the Tenant.",
+               RENTAL_LIBRARY),
+    "loan": ("LOAN AGREEMENT", "This Agreement is made at Chennai between the Lender and the Borrower.", LOAN_LIBRARY),
+    "nda": ("NON-DISCLOSURE AGREEMENT",
+            "This Agreement is made at Pune between the Disclosing Party and the Receiving Party.", NDA_LIBRARY),
+}
+
+# Clause variants the default rule pack flags; the others raise no flag of their own
+RISKY_CLAUSES = frozenset([
+    "The Company may terminate the employment without notice for any reason whatsoever.",
+    "The Company may terminate this Agreement by giving 7 days notice to the Employee.",
+    "The Employee shall have unlimited liability for any loss suffered by the Company.",
+    "The Employee shall indemnify the Company against all claims, losses and expenses.",
+    "The non-compete obligation continues for two years after termination of employment.",
+    "The confidentiality obligation shall survive in perpetuity and remain binding forever.",
+    "All inventions, past and future, including personal projects, shall belong to the Company.",
+    "Any dispute shall be referred to arbitration seated in Singapore before a sole arbitrator appointed by the Company.",
+    "The Company may amend or modify these terms at its sole discretion at any time.",
+    "The Company shall not be liable for any failure caused by force majeure events.",
+    "The Landlord may revise the rent at its sole discretion at any time during the lease.",
+    "The security deposit shall be forfeited irrevocably on any breach, however minor.",
+    "The Landlord may terminate this lease without notice and re-enter the premises.",
+    "The Landlord may terminate this lease by giving 7 days notice to the Tenant.",
+    "The Tenant shall have unlimited liability for any damage to the premises from any cause.",
+    "The Tenant waives all statutory rights of a tenant under the applicable rent control law.",
+    "Any dispute shall be referred to arbitration seated in Dubai under the rules of the Landlord's choice.",
+    "The Lender may recall the entire loan without notice at any time.",
+    "The Lender may modify the rate of interest unilaterally and such change binds the Borrower.",
+    "The Borrower shall be liable for all consequential damages suffered by the Lender on any default.",
+    "The Borrower irrevocably authorises the Lender to sell the secured assets without further consent.",
+    "The Borrower shall keep the terms of this loan confidential.",
+    "Any dispute shall be referred to arbitration seated in London before a sole arbitrator.",
+    "Confidential information means all information disclosed by the Disclosing Party in any form.",
+    "The Receiving Party shall keep the confidential information secret in perpetuity and forever.",
+    "The Receiving Party shall have unlimited liability for any disclosure, whatever its cause.",
+    "The Disclosing Party may terminate this Agreement without notice.",
+    "The Disclosing Party may amend these terms at its sole discretion.",
+    "Any dispute shall be referred to arbitration seated in New York.",
+])
+
+def generate_contract_lines(pages: int, seed: int = 7, kind: str = "employment",
+                            risk_density: Optional[float] = None) -> List[str]:
+    """
+    Returns the contract as wrapped lines, LINES_PER_PAGE lines per page.
+    `kind` is a key of CONTRACT_KINDS. With `risk_density` (0.0 - 1.0), each
+    section's clause is a risky variant (RISKY_CLAUSES) with that probability;
+    without it, variants are picked uniformly.
+    """
+    title, opening, library = CONTRACT_KINDS[kind]
+    rng = random.Random(seed)
+    target = pages * LINES_PER_PAGE
+    lines = [title, opening]
+    section = 1
+    while len(lines) < target:
+        heading, variants = library[(section - 1) % len(library)]
+        if risk_density is not None:
+            risky = rng.random() < risk_density
+            variants = [variant for variant in variants if (variant in RISKY_CLAUSES) == risky] or variants
+        lines.append(f"{section}. {heading}")
+        body = " ".join([rng.choice(variants)] + rng.sample(FILLER, k=rng.randint(2, 4)))
+        lines.extend(textwrap.wrap(body, LINE_WIDTH))
+        section += 1
+    return lines[:target]
+
+def generate_contract(pages: int, seed: int = 7, kind: str = "employment",
+                      risk_density: Optional[float] = None) -> str:
+    return "\n".join(generate_contract_lines(pages, seed, kind, risk_density))
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+SECTION_HEADING = re.compile(r"^\d+\. [A-Z]")
+
+def write_pdf(
+    path: str,
+    lines: List[str],
+    lines_per_page: int = LINES_PER_PAGE,
+    heading_size: Optional[int] = None
+) -> None:
+    """
+    Writes a minimal text-only PDF (Helvetica, one text object per page).
+    With heading_size, section headings ("3. TERMINATION") are set in
+    Helvetica-Bold at that size, like a real word-processor export.
+    """
+    page_chunks = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    page_count = len(page_chunks)
+
+    # Object layout: 1 catalog, 2 pages, 3 font, then (page, content) pairs
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        ("<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            " ".join(f"{5 + 2 * i} 0 R" for i in range(page_count)), page_count)).encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold >>",
+    ]
+    for i, chunk in enumerate(page_chunks):
+        ops = ["BT", "/F1 10 Tf", "14 TL", "50 800 Td"]
+        for line in chunk:
+            if heading_size and SECTION_HEADING.match(line):
+                ops.append(f"/F2 {heading_size} Tf ({_pdf_escape(line)}) Tj T* /F1 10 Tf")
+            else:
+                ops.append(f"({_pdf_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", "replace")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {6 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_at)
+
+    with open(path, "wb") as f:
+        f.write(out)
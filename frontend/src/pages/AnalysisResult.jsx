@@ -166,7 +166,7 @@ const getRiskStyles = (type) => {
     }
 };
 
-const BlockchainProofActions = ({ text, fileName }) => {
+const BlockchainProofActions = ({ text, fileName, fileHash }) => {
     const [loading, setLoading] = useState(false);
     const [proof, setProof] = useState(null);
     const [verification, setVerification] = useState(null);
@@ -179,7 +179,7 @@ const BlockchainProofActions = ({ text, fileName }) => {
         setError(null);
         setVerifyMsg(null);
         try {
-            const result = await api.storeBlockchainProof(text, fileName);
+            const result = await api.storeBlockchainProof(text, fileName, fileHash);
             setProof(result);
             // Auto-verify to populate the view immediately
             const verifyResult = await api.verifyBlockchainProof(text);
@@ -308,7 +308,7 @@ const BlockchainProofActions = ({ text, fileName }) => {
 
 const AnalysisResult = () => {
     const location = useLocation();
-    const { fileName, fileSize, extractedText } = location.state || {};
+    const { fileName, fileSize, extractedText, fileHash } = location.state || {};
     const [showRawText, setShowRawText] = useState(false);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
@@ -572,7 +572,7 @@ const AnalysisResult = () => {
                                     Immutable proof without exposing content.
                                 </p>
 
-                                <BlockchainProofActions text={extractedText} fileName={displayName} />
+                                <BlockchainProofActions text={extractedText} fileName={displayName} fileHash={fileHash} />
                             </div>
                         </div>
 
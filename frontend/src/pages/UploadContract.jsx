@@ -35,7 +35,8 @@ const UploadContract = () => {
                 state: {
                     fileName: file.name,
                     fileSize: file.size,
-                    extractedText: result.extracted_text
+                    extractedText: result.extracted_text,
+                    fileHash: result.file_hash
                 }
             });
         } catch (error) {
@@ -199,13 +199,13 @@ export const api = {
         return response.json();
     },
 
-    storeBlockchainProof: async (text, filename) => {
+    storeBlockchainProof: async (text, filename, fileHash) => {
         if (isDemoMode) throw new Error("Blockchain unavailable in Demo Mode (Backend Offline)");
         const headers = await getHeaders();
         const response = await fetch(`${API_URL}/blockchain/store-proof`, {
             method: "POST",
             headers,
-            body: JSON.stringify({ text, filename })
+            body: JSON.stringify({ text, filename, file_hash: fileHash })
         });
         if (!response.ok) {
             const err = await response.json();